@@ -1,11 +1,9 @@
 from flask_restx import Namespace, Resource, fields
-import pandas as pd
-import numpy as np
-from sklearn.cluster import KMeans
-from collections import Counter
-from utils import split_by_comma_and_and
 import os
 import logging
+import threading
+from flask import request
+from offload import OverloadedError, ai_offloader
 
 # Configuração de log
 logging.basicConfig(level=logging.INFO)
@@ -17,6 +15,50 @@ csv_path = os.getenv(
     os.path.join(os.path.dirname(__file__), "data/movielist.csv"),
 )
 
+# Caminho do artefato do modelo de recomendação
+model_path = os.getenv(
+    "MODEL_PATH",
+    os.path.join(os.path.dirname(csv_path), "recommendation_model.joblib"),
+)
+
+# Dados do CSV e modelo de recomendação compartilhados por todas as rotas de IA.
+# São criados no primeiro uso, de modo que importar este módulo não carrega
+# pandas, NumPy e scikit-learn.
+_dataset_store = None
+_model_store = None
+_stores_lock = threading.Lock()
+
+
+def get_dataset_store():
+    """Retorna o armazenamento em memória do CSV, criando-o no primeiro uso."""
+    global _dataset_store
+    if _dataset_store is None:
+        with _stores_lock:
+            if _dataset_store is None:
+                from store import DatasetStore
+
+                _dataset_store = DatasetStore(csv_path)
+    return _dataset_store
+
+
+def get_model_store():
+    """Retorna o armazenamento do modelo de recomendação, criando-o no primeiro uso."""
+    global _model_store
+    if _model_store is None:
+        with _stores_lock:
+            if _model_store is None:
+                from ai_services import RecommendationModelStore
+
+                _model_store = RecommendationModelStore(model_path)
+    return _model_store
+
+
+def get_cooccurrence_index():
+    """Retorna o índice de coocorrência produtor-estúdio, importando os serviços de IA no primeiro uso."""
+    from ai_services import cooccurrence_index
+
+    return cooccurrence_index
+
 # Namespace para rotas de IA
 api = Namespace("Rotas IA", description="Operações relacionadas ao processo de IA")
 
@@ -24,15 +66,16 @@ api = Namespace("Rotas IA", description="Operações relacionadas ao processo de
 # Carrega o arquivo CSV e formata os dados
 def load_csv_data():
     """
-    Carrega os dados do arquivo CSV e formata a coluna 'winner'.
+    Obtém os dados do arquivo CSV a partir do armazenamento em memória.
+
+    O arquivo só é relido quando é alterado; a coluna 'winner' já vem
+    formatada e as colunas 'producers' e 'studios' já vêm normalizadas.
 
     Returns:
-        pd.DataFrame: DataFrame contendo os dados carregados.
+        pd.DataFrame: DataFrame compartilhado (somente leitura) contendo os dados carregados.
     """
     try:
-        df = pd.read_csv(csv_path, delimiter=';')
-        df['winner'] = df['winner'].apply(lambda x: 1 if x == 'yes' else 0)
-        return df
+        return get_dataset_store().get()
     except Exception as e:
         logger.error(f"Erro ao carregar CSV: {e}")
         return None
@@ -41,11 +84,17 @@ def load_csv_data():
 # Inicialização dos modelos e codificadores
 recommendation_model = None
 
+# Paginação do endpoint /recommendations (opcional: sem 'limit', o cluster é retornado completo)
+MAX_RECOMMENDATIONS_LIMIT = 1000
+
 
 # Treina o modelo de recomendação
 def train_recommendation_model():
     """
-    Treina o modelo de recomendação baseado em clustering KMeans.
+    Obtém o modelo de recomendação baseado em clustering KMeans.
+
+    O modelo é carregado do disco quando o artefato corresponde ao dataset
+    atual e só é treinado novamente quando o dataset muda.
 
     Returns:
         None
@@ -54,9 +103,134 @@ def train_recommendation_model():
     df = load_csv_data()
     if df is None:
         return None
-    features = df[['year', 'winner']].values
-    recommendation_model = KMeans(n_clusters=2, random_state=42, n_init=10)
-    recommendation_model.fit(features)
+    recommendation_model = get_model_store().get(df)
+
+
+def warm_up():
+    """
+    Pré-carrega o dataset, o índice de coocorrência e o modelo de recomendação usados pelas rotas de IA.
+
+    Returns:
+        None
+    """
+    df = load_csv_data()
+    if df is not None:
+        get_cooccurrence_index().sync(df)
+        train_recommendation_model()
+
+
+def init_worker(worker_csv_path, worker_model_path):
+    """
+    Prepara um processo do pool de IA: aponta para os arquivos do processo
+    principal e pré-carrega o dataset, o índice e o modelo.
+
+    Args:
+        worker_csv_path (str): Caminho do arquivo CSV.
+        worker_model_path (str): Caminho do artefato do modelo de recomendação.
+    """
+    global csv_path, model_path
+    csv_path = worker_csv_path
+    model_path = worker_model_path
+    warm_up()
+
+
+def configure_offload(workers, max_queue, timeout):
+    """
+    Configura o pool de processos que executa as computações das rotas de IA (ver `offload.py`).
+
+    Args:
+        workers (int): Quantidade de processos (0 executa na thread da requisição).
+        max_queue (int): Quantidade máxima de computações em andamento.
+        timeout (float): Tempo máximo de espera por uma computação, em segundos.
+    """
+    ai_offloader.configure(workers, max_queue, timeout, initializer=init_worker, initargs=(csv_path, model_path))
+
+
+def offload_error_response(error):
+    """
+    Resposta das rotas de IA quando o pool de processos está sobrecarregado (503)
+    ou a computação excede o tempo máximo de espera (504).
+
+    Args:
+        error (OverloadedError | TimeoutError): Erro do pool.
+
+    Returns:
+        tuple: Corpo, status e cabeçalhos da resposta.
+    """
+    if isinstance(error, OverloadedError):
+        logger.warning(f"Pool de IA sobrecarregado: {error}")
+        return {"error": "Serviço de IA sobrecarregado. Tente novamente em instantes."}, 503, {"Retry-After": "1"}
+    logger.warning("Computação de IA excedeu o tempo máximo de espera.")
+    return {"error": "Tempo máximo de processamento excedido."}, 504
+
+
+def recommend(page, limit):
+    """
+    Calcula uma página de recomendações (executada no pool de processos de IA).
+
+    Args:
+        page (int): Página (a partir de 1).
+        limit (int | None): Quantidade de filmes por página (None retorna o cluster completo).
+
+    Returns:
+        dict | None: Cluster e página da lista de filmes recomendados, ou None se o CSV não pôde ser carregado.
+    """
+    global recommendation_model
+    df = load_csv_data()
+    if df is None:
+        return None
+
+    # Modelo carregado do disco ou treinado apenas quando o dataset muda
+    model_store = get_model_store()
+    recommendation_model = model_store.get(df)
+
+    user_input = [[2023, 8]]  # Exemplo: ano atual e número de prêmios
+    cluster = int(recommendation_model.predict(user_input)[0])
+    members = model_store.members(cluster)
+    selected = members
+    if limit is not None:
+        start = (page - 1) * limit
+        selected = members[start:start + limit]
+    return {
+        "cluster": cluster,
+        "movies_in_cluster": df['title'].values[selected].tolist(),
+        "total": int(len(members)),
+    }
+
+
+def predict_bad_movies(pairs):
+    """
+    Prevê se os filmes são ruins para as combinações produtor-estúdio (executada no pool de processos de IA).
+
+    Args:
+        pairs (tuple): Tuplas (produtor, estúdio).
+
+    Returns:
+        list | None: Mensagens de predição na ordem recebida, ou None se o CSV não pôde ser carregado.
+    """
+    df = load_csv_data()
+    if df is None:
+        return None
+
+    # Índice de coocorrência produtor-estúdio, reconstruído apenas quando o dataset muda
+    get_cooccurrence_index().sync(df)
+    return [predict_bad_movie(producer, studio) for producer, studio in pairs]
+
+
+def predict_bad_movie(producer, studio):
+    """
+    Prevê se um filme é ruim a partir da coocorrência histórica entre produtor e estúdio.
+
+    Args:
+        producer (str): Nome do produtor.
+        studio (str): Nome do estúdio.
+
+    Returns:
+        str: Mensagem com a predição.
+    """
+    if get_cooccurrence_index().count(producer.strip().lower(), studio.strip().lower()) > 1:
+        return "Probabilidade de ser ruim"
+    return "Não é provável ser ruim"
 
 
 # Modelo para entrada no endpoint /predict-bad-movie
@@ -65,43 +239,87 @@ bad_movie_model = api.model("BadMoviePrediction", {
     "studio": fields.String(required=True, description="Nome do estúdio"),
 })
 
+# Modelo para entrada no endpoint /predict-bad-movie/batch
+bad_movie_batch_model = api.model("BadMovieBatchPrediction", {
+    "pairs": fields.List(fields.Nested(bad_movie_model), required=True, description="Combinações produtor-estúdio"),
+})
+
 
 # Rota para recomendação de filmes
 @api.route("/recommendations")
 class Recommendations(Resource):
     """Recomendações baseadas em padrões de premiações"""
 
+    @api.expect(api.parser().add_argument("page", type=int, help="Página (a partir de 1)")
+                               .add_argument("limit", type=int, help="Quantidade de filmes por página"))
     def get(self):
         """
         Retorna recomendações de filmes com base em padrões de premiações.
 
+        Sem o parâmetro 'limit', a lista completa de filmes do cluster é
+        retornada. Com ele, a lista é paginada e o custo da resposta depende
+        apenas do tamanho da página, pois os membros de cada cluster são
+        materializados uma única vez por versão do modelo.
+
         Returns:
-            dict: Cluster e lista de filmes recomendados.
+            dict: Cluster e lista (ou página da lista) de filmes recomendados.
         """
+        invalid = {
+            "error": f"Parâmetros inválidos: 'page' deve ser >= 1 e 'limit' entre 1 e {MAX_RECOMMENDATIONS_LIMIT}."
+        }, 400
         try:
-            global recommendation_model
-            df = load_csv_data()
-            if df is None:
-                return {"error": "Erro ao carregar os dados CSV."}, 500
+            try:
+                page = int(request.args.get("page", 1))
+                limit = request.args.get("limit")
+                limit = None if limit is None else int(limit)
+            except ValueError:
+                return invalid
+            if page < 1 or (limit is not None and not 1 <= limit <= MAX_RECOMMENDATIONS_LIMIT):
+                return invalid
+            if limit is None and page > 1:
+                return {"error": "Parâmetro 'page' requer o parâmetro 'limit'."}, 400
 
-            features = df[['year', 'winner']].values
-            if recommendation_model is None:
-                train_recommendation_model()
-
-            user_input = np.array([[2023, 8]])  # Exemplo: ano atual e número de prêmios
-            cluster = recommendation_model.predict(user_input)
-            movies_in_cluster = df[recommendation_model.labels_ == cluster[0]]['title'].tolist()
+            result = ai_offloader.run(("recommendations", page, limit), recommend, page, limit)
+            if result is None:
+                return {"error": "Erro ao carregar os dados CSV."}, 500
 
-            return {
-                "cluster": int(cluster[0]),
-                "movies_in_cluster": movies_in_cluster,
+            response = {
+                "cluster": result["cluster"],
+                "movies_in_cluster": result["movies_in_cluster"],
+                "total": result["total"],
                 "message": "Recomendação gerada"
-            }, 200
+            }
+            if limit is None:
+                return response, 200
+
+            response.update(page=page, limit=limit)
+            if page * limit < result["total"]:
+                response["_links"] = {
+                    "next": {"href": f"/ai/recommendations?page={page + 1}&limit={limit}", "method": "GET"}
+                }
+            return response, 200
+        except (OverloadedError, TimeoutError) as e:
+            return offload_error_response(e)
         except Exception as e:
             logger.error(f"Erro na recomendação de filmes: {e}")
             return {"error": str(e)}, 500
 
 
+# Rota com as informações do modelo de recomendação
+@api.route("/model")
+class ModelInfo(Resource):
+    """Informações do modelo de recomendação"""
+
+    def get(self):
+        """
+        Retorna a impressão digital do dataset e os tempos de treinamento e carregamento do modelo.
+
+        Returns:
+            dict: Informações do modelo em uso.
+        """
+        return get_model_store().info(), 200
+
+
 # Rota para prever se um filme é ruim
 @api.route("/predict-bad-movie")
 class PredictBadMovie(Resource):
@@ -123,31 +341,57 @@ class PredictBadMovie(Resource):
             if not producer or not studio:
                 return {"error": "Parâmetros 'producer' e 'studio' são obrigatórios."}, 400
 
-            df = load_csv_data()
-            if df is None:
+            pairs = ((producer, studio),)
+            predictions = ai_offloader.run(("predict-bad-movie", pairs), predict_bad_movies, pairs)
+            if predictions is None:
                 return {"error": "Erro ao carregar dados para verificação."}, 500
+            return {"prediction": predictions[0]}, 200
 
-            # Normaliza os dados para comparação
-            df['producers'] = df['producers'].str.strip().str.lower()
-            df['studios'] = df['studios'].str.strip().str.lower()
-            producer = producer.strip().lower()
-            studio = studio.strip().lower()
-
-            # Conta combinações produtor-estúdio
-            combination_counts = Counter()
-            for _, row in df.iterrows():
-                producers = split_by_comma_and_and(row['producers'])
-                studios = split_by_comma_and_and(row['studios'])
-                for producer_item in producers:
-                    for studio_item in studios:
-                        combination_counts[(producer_item, studio_item)] += 1
-
-            combination = (producer, studio)
-            if combination_counts[combination] > 1:
-                return {"prediction": "Probabilidade de ser ruim"}, 200
-            else:
-                return {"prediction": "Não é provável ser ruim"}, 200
-
+        except (OverloadedError, TimeoutError) as e:
+            return offload_error_response(e)
         except Exception as e:
             logger.error(f"Erro ao prever filme ruim: {e}")
             return {"error": str(e)}, 500
+
+
+# Rota para prever, em lote, se filmes são ruins
+@api.route("/predict-bad-movie/batch")
+class PredictBadMovieBatch(Resource):
+    """Predição em lote de filmes ruins baseada em produtor e estúdio"""
+
+    @api.expect(bad_movie_batch_model)
+    def post(self):
+        """
+        Prever se os filmes são ruins para uma lista de combinações produtor-estúdio.
+
+        Returns:
+            dict: Resultado da predição para cada combinação, na ordem recebida.
+        """
+        try:
+            pairs = (api.payload or {}).get("pairs")
+            if not isinstance(pairs, list) or not pairs:
+                return {"error": "Parâmetro 'pairs' é obrigatório."}, 400
+            if any(not isinstance(pair, dict) or not pair.get("producer") or not pair.get("studio") for pair in pairs):
+                return {"error": "Parâmetros 'producer' e 'studio' são obrigatórios em cada combinação."}, 400
+
+            pairs = tuple((pair["producer"], pair["studio"]) for pair in pairs)
+            predictions = ai_offloader.run(("predict-bad-movie", pairs), predict_bad_movies, pairs)
+            if predictions is None:
+                return {"error": "Erro ao carregar dados para verificação."}, 500
+            return {
+                "predictions": [
+                    {"producer": producer, "studio": studio, "prediction": prediction}
+                    for (producer, studio), prediction in zip(pairs, predictions)
+                ]
+            }, 200
+
+        except (OverloadedError, TimeoutError) as e:
+            return offload_error_response(e)
+        except Exception as e:
+            logger.error(f"Erro ao prever filmes ruins em lote: {e}")
+            return {"error": str(e)}, 500
+
+
+# Treinamento offline do modelo: python ai_routes.py
+if __name__ == "__main__":
+    warm_up()
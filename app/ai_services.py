@@ -0,0 +1,269 @@
+import os
+import time
+import hashlib
+import logging
+import threading
+import joblib
+import numpy as np
+from sklearn.cluster import KMeans
+from metrics import observe_model_load, observe_model_training
+from utils import split_by_comma_and_and
+
+# Configuração de log
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Colunas usadas como atributos do modelo de recomendação
+RECOMMENDATION_FEATURES = ['year', 'winner']
+
+# Parâmetros do modelo de recomendação (fazem parte da impressão digital)
+RECOMMENDATION_PARAMS = {"n_clusters": 2, "random_state": 42, "n_init": 10}
+
+
+class CooccurrenceIndex:
+    """
+    Índice de coocorrência entre produtores e estúdios.
+
+    Os nomes são internados em tabelas de identificadores inteiros e as
+    contagens ficam em um dicionário indexado por (id do produtor, id do
+    estúdio). O índice é construído uma única vez a partir do DataFrame do
+    dataset e, quando o arquivo apenas recebe novas linhas, somente elas são
+    processadas.
+
+    As tabelas e as contagens formam uma única tupla, que nunca é alterada
+    depois de publicada: cada sincronização monta novas estruturas e as
+    publica com uma única atribuição. Assim, `count` lê sem bloqueio um
+    estado completo, anterior ou posterior à sincronização.
+
+    Espera colunas 'producers' e 'studios' já normalizadas (ver `DatasetStore`).
+    """
+
+    def __init__(self):
+        # (ids dos produtores, ids dos estúdios, contagens)
+        self._state = ({}, {}, {})
+        self._source = None
+        self._lock = threading.Lock()
+
+    def sync(self, df):
+        """
+        Sincroniza o índice com o DataFrame informado.
+
+        Se o DataFrame for o mesmo já indexado, nada é feito; se contiver as
+        linhas já indexadas seguidas de novas linhas, apenas as novas são
+        adicionadas (a uma cópia do estado atual); caso contrário o índice é
+        reconstruído.
+
+        Args:
+            df (pd.DataFrame): Dados com as colunas 'producers' e 'studios'.
+        """
+        if df is self._source:
+            return
+
+        with self._lock:
+            if df is self._source:
+                return
+            if self._is_append_of_source(df):
+                state = tuple(dict(table) for table in self._state)
+                self._add_rows(state, df.iloc[len(self._source):])
+            else:
+                state = ({}, {}, {})
+                self._add_rows(state, df)
+            self._state = state
+            self._source = df
+
+    def _is_append_of_source(self, df):
+        """Verifica se o DataFrame é o anterior acrescido de novas linhas."""
+        if self._source is None or len(df) < len(self._source):
+            return False
+
+        size = len(self._source)
+        for column in ("producers", "studios"):
+            previous = self._source[column].astype(str).values
+            current = df[column].iloc[:size].astype(str).values
+            if not (previous == current).all():
+                return False
+        return True
+
+    def _add_rows(self, state, df):
+        """Contabiliza, no estado ainda não publicado, as combinações produtor-estúdio das linhas informadas."""
+        producer_table, studio_table, counts = state
+        # Os textos repetidos são atendidos pela memorização do separador
+        for producers_text, studios_text in zip(df['producers'], df['studios']):
+            studio_ids = [self._intern(studio_table, studio) for studio in split_by_comma_and_and(str(studios_text))]
+            for producer in split_by_comma_and_and(str(producers_text)):
+                producer_id = self._intern(producer_table, producer)
+                for studio_id in studio_ids:
+                    key = (producer_id, studio_id)
+                    counts[key] = counts.get(key, 0) + 1
+
+    @staticmethod
+    def _intern(table, name):
+        """Retorna o identificador inteiro do nome, registrando-o se necessário."""
+        identifier = table.get(name)
+        if identifier is None:
+            identifier = table[name] = len(table)
+        return identifier
+
+    def count(self, producer, studio):
+        """
+        Retorna quantas vezes o produtor e o estúdio aparecem juntos.
+
+        Args:
+            producer (str): Nome normalizado do produtor.
+            studio (str): Nome normalizado do estúdio.
+
+        Returns:
+            int: Quantidade de ocorrências da combinação.
+        """
+        producer_ids, studio_ids, counts = self._state
+        producer_id = producer_ids.get(producer)
+        studio_id = studio_ids.get(studio)
+        if producer_id is None or studio_id is None:
+            return 0
+        return counts.get((producer_id, studio_id), 0)
+
+
+# Índice compartilhado pelas rotas de IA
+cooccurrence_index = CooccurrenceIndex()
+
+
+def dataset_fingerprint(df):
+    """
+    Calcula a impressão digital dos dados usados no treinamento do modelo de recomendação.
+
+    Args:
+        df (pd.DataFrame): Dados com as colunas de `RECOMMENDATION_FEATURES`.
+
+    Returns:
+        str: Hash SHA-256 dos atributos e dos parâmetros do modelo.
+    """
+    features = np.ascontiguousarray(df[RECOMMENDATION_FEATURES].values, dtype=np.int64)
+    digest = hashlib.sha256(features.tobytes())
+    digest.update(repr(sorted(RECOMMENDATION_PARAMS.items())).encode())
+    return digest.hexdigest()
+
+
+class RecommendationModelStore:
+    """
+    Armazena em disco o modelo KMeans de recomendação junto com a impressão digital do dataset.
+
+    O modelo é carregado do disco (com os arrays mapeados em memória, de modo
+    que vários processos compartilham as mesmas páginas) e só é treinado
+    novamente quando a impressão digital do dataset muda. O arquivo é gravado
+    de forma atômica para que outros processos nunca leiam um artefato parcial.
+
+    Atributos:
+        path (str): Caminho do artefato do modelo.
+        model (KMeans | None): Modelo atualmente em uso.
+        fingerprint (str | None): Impressão digital do dataset usado no treinamento.
+        train_seconds (float | None): Duração do último treinamento.
+        load_seconds (float | None): Duração do último carregamento do disco.
+        clusters (dict): Posições (int32) das linhas do dataset de cada cluster, materializadas
+            uma vez por versão do modelo.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.model = None
+        self.clusters = {}
+        self.fingerprint = None
+        self.train_seconds = None
+        self.load_seconds = None
+        self._source = None
+        self._lock = threading.Lock()
+
+    def get(self, df):
+        """
+        Retorna o modelo correspondente ao DataFrame, carregando-o ou treinando-o se necessário.
+
+        Args:
+            df (pd.DataFrame): Dados usados no treinamento.
+
+        Returns:
+            KMeans: Modelo de recomendação treinado.
+        """
+        if df is self._source:
+            return self.model
+
+        with self._lock:
+            if df is not self._source:
+                fingerprint = dataset_fingerprint(df)
+                if fingerprint != self.fingerprint:
+                    if not self._load(fingerprint):
+                        self._train(df, fingerprint)
+                    self._materialize_clusters()
+                self._source = df
+            return self.model
+
+    def _load(self, fingerprint):
+        """Carrega o artefato do disco, caso exista e corresponda à impressão digital."""
+        if not os.path.exists(self.path):
+            return False
+
+        started = time.perf_counter()
+        try:
+            artifact = joblib.load(self.path, mmap_mode='r')
+        except Exception as e:
+            logger.warning(f"Erro ao carregar o modelo de recomendação: {e}")
+            return False
+        if artifact.get("fingerprint") != fingerprint:
+            return False
+
+        self.model = artifact["model"]
+        self.fingerprint = fingerprint
+        self.load_seconds = time.perf_counter() - started
+        observe_model_load(self.load_seconds)
+        logger.info(f"Modelo de recomendação carregado em {self.load_seconds:.3f}s.")
+        return True
+
+    def _train(self, df, fingerprint):
+        """Treina o modelo e grava o artefato no disco."""
+        started = time.perf_counter()
+        model = KMeans(**RECOMMENDATION_PARAMS)
+        model.fit(df[RECOMMENDATION_FEATURES].values)
+        self.train_seconds = time.perf_counter() - started
+        observe_model_training(self.train_seconds)
+
+        self.model = model
+        self.fingerprint = fingerprint
+        logger.info(f"Modelo de recomendação treinado em {self.train_seconds:.3f}s.")
+
+        try:
+            temporary_path = f"{self.path}.{os.getpid()}.tmp"
+            joblib.dump({"fingerprint": fingerprint, "model": model}, temporary_path)
+            os.replace(temporary_path, self.path)
+        except Exception as e:
+            logger.warning(f"Erro ao gravar o modelo de recomendação: {e}")
+
+    def _materialize_clusters(self):
+        """Agrupa as posições das linhas do dataset por cluster a partir dos rótulos do modelo."""
+        labels = np.asarray(self.model.labels_)
+        self.clusters = {
+            int(label): np.flatnonzero(labels == label).astype(np.int32)
+            for label in range(self.model.n_clusters)
+        }
+
+    def members(self, cluster):
+        """
+        Retorna as posições das linhas do dataset pertencentes ao cluster.
+
+        Args:
+            cluster (int): Identificador do cluster.
+
+        Returns:
+            np.ndarray: Posições (int32) em ordem crescente.
+        """
+        return self.clusters.get(int(cluster), np.empty(0, dtype=np.int32))
+
+    def info(self):
+        """
+        Retorna as informações do modelo em uso.
+
+        Returns:
+            dict: Impressão digital e tempos de treinamento e carregamento.
+        """
+        return {
+            "fingerprint": self.fingerprint,
+            "train_seconds": self.train_seconds,
+            "load_seconds": self.load_seconds,
+        }
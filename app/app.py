@@ -1,31 +1,113 @@
+import os
 import logging
 from flask import Flask
 from flask_restx import Api
 from config import Config, TestConfig
-from ai_routes import api as ai_namespace
-from routes import api as app_namespace, init_db
+from ai_routes import api as ai_namespace, configure_offload as configure_ai_offload, warm_up as warm_up_ai
+from routes import api as app_namespace, init_db, load_data
+from readiness import readiness
+from cache import response_cache
+from services import set_awards_engine
+from metrics import instrument_app, register_cache_metrics
+from profiling import install_profiler
+from snapshot import snapshot_uri
 
 # Configuração de log
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Inicializa o Flask
-app = Flask(__name__)
+# Métricas do cache de respostas, compartilhado por todas as aplicações do processo
+register_cache_metrics(response_cache)
 
-# Configurações
-env = app.config.get("FLASK_ENV", "development")
-app.config.from_object(TestConfig if env == "testing" else Config)
 
-# Inicializa o banco de dados
-init_db(app.config["SQLALCHEMY_DATABASE_URI"])
+def warm_up():
+    """
+    Aquecimento da aplicação: popula o banco com o CSV, constrói o índice de
+    intervalos e pré-carrega os dados, índices e modelos das rotas de IA.
+    """
+    load_data()
+    warm_up_ai()
 
-# Configura o objeto Api
-api = Api(app, title="API de Filmes", description="API para manipular informações de filmes e prêmios")
 
-# Adiciona os namespaces
-api.add_namespace(app_namespace, path="/app")
-api.add_namespace(ai_namespace, path="/ai")
+def create_app(config=None, start_warm_up=True):
+    """
+    Cria e configura a aplicação Flask.
 
-# Inicializa a aplicação
+    A criação apenas prepara o banco (tabelas e índices) e registra as rotas;
+    a ingestão do CSV e a carga dos dados e modelos de IA ficam na fase de
+    aquecimento (`warm_up`), executada em segundo plano quando `DEFERRED_INIT`
+    está habilitado. O estado do aquecimento é informado em `/app/health` e
+    `/app/health/ready`.
+
+    Args:
+        config (type | None): Classe de configuração; por padrão, escolhida pelo ambiente.
+        start_warm_up (bool): Inicia o aquecimento; o servidor de produção (gunicorn)
+            passa False e executa o aquecimento no processo mestre.
+
+    Returns:
+        Flask: Aplicação configurada.
+    """
+    app = Flask(__name__)
+
+    # Configurações
+    if config is None:
+        env = app.config.get("FLASK_ENV", "development")
+        config = TestConfig if env == "testing" else Config
+    app.config.from_object(config)
+
+    # Orçamento de memória do cache de respostas
+    response_cache.max_bytes = app.config["RESPONSE_CACHE_MAX_BYTES"]
+
+    # Motor de cálculo dos intervalos entre prêmios
+    set_awards_engine(app.config["AWARDS_ENGINE"])
+
+    # Pool de processos das computações das rotas de IA
+    configure_ai_offload(
+        app.config["AI_OFFLOAD_WORKERS"],
+        app.config["AI_OFFLOAD_MAX_QUEUE"],
+        app.config["AI_OFFLOAD_TIMEOUT_SECONDS"],
+    )
+
+    # Inicializa o banco de dados: snapshot somente leitura ou banco configurado
+    database_uri = app.config["SQLALCHEMY_DATABASE_URI"]
+    if app.config["SNAPSHOT_PATH"]:
+        if not os.path.exists(app.config["SNAPSHOT_PATH"]):
+            raise FileNotFoundError(f"Snapshot não encontrado: {app.config['SNAPSHOT_PATH']}")
+        database_uri = snapshot_uri(app.config["SNAPSHOT_PATH"])
+    init_db(database_uri, app.config["SLOW_QUERY_THRESHOLD_MS"])
+
+    # Configura o objeto Api
+    api = Api(app, title="API de Filmes", description="API para manipular informações de filmes e prêmios")
+
+    # Adiciona os namespaces
+    api.add_namespace(app_namespace, path="/app")
+    api.add_namespace(ai_namespace, path="/ai")
+
+    # Métricas das requisições e endpoint /metrics
+    instrument_app(app)
+
+    # Profiling por requisição, apenas quando habilitado
+    if app.config["PROFILING_ENABLED"]:
+        install_profiler(app, app.config["PROFILE_DIR"])
+
+    # Aquecimento: em segundo plano ou antes de retornar a aplicação
+    if start_warm_up:
+        if app.config["DEFERRED_INIT"]:
+            readiness.start(warm_up)
+        else:
+            readiness.run(warm_up)
+
+    return app
+
+
+def __getattr__(name):
+    """Cria a aplicação padrão no primeiro acesso a `app` (ex.: `from app import app`)."""
+    if name == "app":
+        application = globals()["app"] = create_app()
+        return application
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Inicializa a aplicação com o servidor de desenvolvimento
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=5000)
+    create_app().run(host="0.0.0.0", port=5000)
@@ -0,0 +1,197 @@
+"""
+Servidor ASGI da aplicação.
+
+Uso:
+    uvicorn --factory asgi:create_asgi_app --host 0.0.0.0 --port 5000
+
+As conexões são mantidas no loop de eventos, sem uma thread por cliente. Os
+endpoints de leitura que consultam o banco (`/app/movies`,
+`/app/producers/<producer>` e `/app/winners`) são atendidos de forma
+assíncrona, com o engine aiosqlite e o mesmo cache de respostas e ETags da
+aplicação Flask. As demais requisições (intervalos, rotas de IA, saúde,
+métricas, documentação e exportações em streaming) são encaminhadas à
+aplicação Flask, executada em um pool limitado de threads, de modo que o
+processamento de CPU (pandas, scikit-learn) não bloqueia o loop de eventos.
+"""
+import json
+import time
+import logging
+from urllib.parse import parse_qsl
+from a2wsgi import WSGIMiddleware
+from werkzeug.datastructures import MIMEAccept, MultiDict
+from werkzeug.exceptions import HTTPException
+from werkzeug.http import parse_accept_header, parse_etags
+import routes
+from app import create_app
+from cache import cache_key, is_cacheable, response_cache, serialize_response
+from database import create_async_db_engine
+from metrics import http_request_duration, http_requests, watch_engine
+from profiling import watch_slow_queries
+from streaming import stream_format
+
+logger = logging.getLogger(__name__)
+
+
+async def _read_body(receive):
+    """Lê o corpo completo da requisição."""
+    chunks = []
+    while True:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            return b"".join(chunks)
+
+
+def _json_payload(headers, body):
+    """Corpo JSON da requisição ou None, como `request.get_json(silent=True)`."""
+    if not headers.get("content-type", "").startswith("application/json"):
+        return None
+    try:
+        return json.loads(body)
+    except ValueError:
+        return None
+
+
+class AsyncApplication:
+    """
+    Aplicação ASGI que atende os endpoints de leitura do banco de forma assíncrona
+    e encaminha as demais requisições à aplicação Flask.
+
+    Atributos:
+        flask_app (Flask): Aplicação Flask.
+        engine (AsyncEngine | None): Engine assíncrono; sem ele, todas as
+            requisições são encaminhadas à aplicação Flask.
+    """
+
+    def __init__(self, flask_app, engine, threads):
+        self.flask_app = flask_app
+        self.engine = engine
+        self._wsgi = WSGIMiddleware(flask_app, workers=threads)
+        self._handlers = {
+            ("/app/movies", "GET"): self._movies,
+            ("/app/producers/<string:producer>", "GET"): self._producer,
+            ("/app/winners", "POST"): self._winners,
+        }
+
+    async def __call__(self, scope, receive, send):
+        handler = self._match(scope) if scope["type"] == "http" and self.engine is not None else None
+        if handler is None:
+            return await self._wsgi(scope, receive, send)
+
+        started = time.perf_counter()
+        function, rule, view_args, headers = handler
+        body = await _read_body(receive)
+        args = MultiDict(parse_qsl(scope["query_string"].decode("latin-1"), keep_blank_values=True))
+        payload = _json_payload(headers, body)
+
+        key = cache_key(rule.endpoint, scope["method"], args, view_args, payload)
+        entry = response_cache.get(key)
+        if entry is None:
+            try:
+                data, status, response_headers = await function(args, payload, scope["path"], **view_args)
+            except Exception as e:
+                data, status, response_headers = {"error": str(e)}, 500, {}
+            with self.flask_app.app_context():
+                entry = serialize_response(data, status, response_headers)
+            if is_cacheable(entry):
+                response_cache.put(key, entry, version=key[-1])
+
+        await self._send(send, entry, headers)
+        http_requests.labels(rule.rule, scope["method"], str(entry.status)).inc()
+        http_request_duration.labels(rule.rule, scope["method"]).observe(time.perf_counter() - started)
+
+    def _match(self, scope):
+        """Retorna o handler assíncrono da requisição ou None quando ela deve ir para o Flask."""
+        try:
+            rule, view_args = self.flask_app.url_map.bind("localhost").match(
+                scope["path"], scope["method"], return_rule=True
+            )
+        except HTTPException:
+            return None
+
+        function = self._handlers.get((rule.rule, scope["method"]))
+        if function is None:
+            return None
+
+        headers = {name.decode("latin-1").lower(): value.decode("latin-1") for name, value in scope["headers"]}
+        # Exportações em streaming e parâmetros de profiling ficam com a aplicação Flask
+        if stream_format(parse_accept_header(headers.get("accept"), MIMEAccept)):
+            return None
+        if self.flask_app.config.get("PROFILING_ENABLED") and (
+            "x-profile" in headers or "profile" in dict(parse_qsl(scope["query_string"].decode("latin-1")))
+        ):
+            return None
+        return function, rule, view_args, headers
+
+    async def _send(self, send, entry, request_headers):
+        """Envia a resposta armazenada, com ETag e 304 para `If-None-Match` correspondente."""
+        status, body = entry.status, entry.body
+        if status == 200 and parse_etags(request_headers.get("if-none-match")).contains(entry.etag):
+            status, body = 304, b""
+
+        headers = [(b"content-type", b"application/json"), (b"etag", f'"{entry.etag}"'.encode())]
+        headers += [(name.encode("latin-1"), str(value).encode("latin-1")) for name, value in entry.headers.items()]
+        headers.append((b"content-length", str(len(body)).encode()))
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+    async def _movies(self, args, payload, path):
+        """Versão assíncrona de GET /app/movies."""
+        try:
+            fields, limit, query = routes.movies_query(args)
+        except ValueError as e:
+            return {"error": str(e)}, 400, {}
+
+        async with self.engine.connect() as connection:
+            rows = (await connection.execute(query.limit(limit + 1))).mappings().all()
+        movies, headers = routes.movies_page(rows, fields, limit, args, path)
+        return movies, 200, headers
+
+    async def _producer(self, args, payload, path, producer):
+        """Versão assíncrona de GET /app/producers/<producer>."""
+        async with self.engine.connect() as connection:
+            movies = (await connection.execute(routes.producer_movies_query(producer))).mappings().all()
+        if not movies:
+            return {"error": f"Produtor '{producer}' não encontrado."}, 404, {}
+        return {"producer": producer, "movies": [dict(movie) for movie in movies]}, 200, {}
+
+    async def _winners(self, args, payload, path):
+        """Versão assíncrona de POST /app/winners."""
+        year = payload.get("year") if isinstance(payload, dict) else None
+        if not year:
+            return {"error": "Parâmetro 'year' é obrigatório."}, 400, {}
+
+        async with self.engine.connect() as connection:
+            winners = (await connection.execute(routes.winners_query(year))).scalars().all()
+        if not winners:
+            return {"message": f"Não há vencedores registrados para o ano {year}."}, 404, {}
+        return {"year": year, "winners": winners}, 200, {}
+
+
+def create_asgi_app(config=None, start_warm_up=True):
+    """
+    Cria a aplicação ASGI a partir da aplicação Flask.
+
+    Args:
+        config (type | None): Classe de configuração; por padrão, escolhida pelo ambiente.
+        start_warm_up (bool): Inicia o aquecimento (ver `app.create_app`).
+
+    Returns:
+        AsyncApplication: Aplicação ASGI.
+    """
+    flask_app = create_app(config, start_warm_up=start_warm_up)
+    engine = create_async_db_engine(routes.engine.url)
+    if engine is None:
+        logger.info("Banco sem suporte ao engine assíncrono: todas as requisições serão atendidas pelo Flask.")
+    else:
+        # Mesmas métricas e log de consultas lentas do engine síncrono (ver `routes.init_db`)
+        watch_engine(engine.sync_engine)
+        watch_slow_queries(engine.sync_engine, flask_app.config["SLOW_QUERY_THRESHOLD_MS"])
+    return AsyncApplication(flask_app, engine, flask_app.config["ASGI_WSGI_THREADS"])
+
+
+# Inicializa a aplicação com o uvicorn
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(create_asgi_app(), host="0.0.0.0", port=5000)
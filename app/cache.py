@@ -0,0 +1,203 @@
+import json
+import hashlib
+import threading
+from collections import OrderedDict, namedtuple
+from functools import wraps
+from flask import current_app, request
+from flask_restx.representations import output_json
+from flask_restx.utils import unpack
+from dataset import dataset_tracker
+from streaming import requested_stream_format
+
+# Resposta serializada armazenada no cache
+CachedResponse = namedtuple("CachedResponse", ["body", "status", "etag", "headers"])
+
+# Orçamento padrão de memória do cache (em bytes)
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+
+class ResponseCache:
+    """
+    Cache LRU de respostas serializadas, limitado por um orçamento de bytes.
+
+    As entradas são indexadas pelo endpoint, argumentos normalizados da
+    requisição e versão do dataset, de modo que qualquer alteração nos dados
+    torna as respostas anteriores inacessíveis. O cache também é esvaziado a
+    cada alteração confirmada no dataset.
+
+    Atributos:
+        max_bytes (int): Tamanho máximo somado dos corpos armazenados.
+        hits (int): Quantidade de leituras atendidas pelo cache.
+        misses (int): Quantidade de leituras que precisaram recalcular a resposta.
+        listener (callable | None): Chamada após cada operação, com True (acerto), False (falha)
+            ou None (alteração das entradas); usada pelas métricas (ver `metrics.register_cache_metrics`).
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.listener = None
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Retorna a entrada associada à chave, marcando-a como usada recentemente.
+
+        Args:
+            key (tuple): Chave da resposta.
+
+        Returns:
+            CachedResponse | None: Entrada armazenada ou None.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        self._notify(entry is not None)
+        return entry
+
+    def put(self, key, entry, version=None):
+        """
+        Armazena uma entrada, removendo as menos usadas até respeitar o orçamento de bytes.
+
+        Uma resposta calculada enquanto o dataset mudava teria uma chave
+        inacessível e apenas ocuparia o orçamento; por isso a entrada é
+        descartada quando `version` já não é a versão atual do dataset.
+
+        Args:
+            key (tuple): Chave da resposta.
+            entry (CachedResponse): Resposta serializada.
+            version (int | None): Versão do dataset usada na chave (ver `cache_key`).
+        """
+        size = len(entry.body)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if version is not None and version != dataset_tracker.version:
+                return
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous.body)
+
+            self._entries[key] = entry
+            self._size += size
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted.body)
+        self._notify(None)
+
+    def clear(self, *args):
+        """Remove todas as entradas do cache (aceita os argumentos de um ouvinte do dataset)."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+        self._notify(None)
+
+    def _notify(self, hit):
+        """Informa a operação ao `listener`, quando definido."""
+        if self.listener is not None:
+            self.listener(hit)
+
+    @property
+    def size(self):
+        """Tamanho somado, em bytes, dos corpos armazenados."""
+        return self._size
+
+
+# Instância compartilhada pela aplicação
+response_cache = ResponseCache()
+
+# Respostas de versões anteriores do dataset deixam de ser úteis
+dataset_tracker.subscribe(response_cache.clear)
+
+
+def cache_key(endpoint, method, args, view_kwargs, payload):
+    """
+    Monta a chave do cache a partir do endpoint, argumentos normalizados e versão do dataset.
+
+    Args:
+        endpoint (str): Nome do endpoint.
+        method (str): Método HTTP.
+        args (MultiDict): Parâmetros de consulta.
+        view_kwargs (dict): Parâmetros da rota.
+        payload (object): Corpo JSON (ignorado em GET e HEAD).
+
+    Returns:
+        tuple: Chave do cache, com a versão do dataset no último elemento.
+    """
+    body = ""
+    if method not in ("GET", "HEAD"):
+        body = json.dumps(payload, sort_keys=True)
+
+    return (
+        endpoint,
+        method,
+        tuple(sorted(args.items(multi=True))),
+        tuple(sorted(view_kwargs.items())),
+        body,
+        dataset_tracker.version,
+    )
+
+
+def _request_key(view_kwargs):
+    """Monta a chave do cache da requisição atual."""
+    payload = request.get_json(silent=True) if request.method not in ("GET", "HEAD") else None
+    return cache_key(request.endpoint, request.method, request.args, view_kwargs, payload)
+
+
+def serialize_response(data, status, headers):
+    """
+    Serializa a resposta de um endpoint para armazenamento no cache.
+
+    Deve ser chamada dentro do contexto da aplicação Flask.
+
+    Returns:
+        CachedResponse: Corpo em JSON, status, ETag e cabeçalhos.
+    """
+    body = output_json(data, status).get_data()
+    return CachedResponse(body, status, hashlib.sha256(body).hexdigest(), dict(headers or {}))
+
+
+def is_cacheable(entry):
+    """Indica se a resposta pode ser armazenada (sem status 5xx e sem `Cache-Control: no-store`)."""
+    return entry.status < 500 and "no-store" not in entry.headers.get("Cache-Control", "")
+
+
+def cached_response(method):
+    """
+    Decorador para métodos de leitura de um `Resource` que armazena a resposta serializada.
+
+    A resposta é emitida com um ETag forte derivado do corpo e requisições GET
+    bem-sucedidas com `If-None-Match` correspondente são respondidas com 304.
+    Respostas com status 5xx, com `Cache-Control: no-store` e exportações em
+    streaming não são armazenadas.
+    """
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        if requested_stream_format():
+            return method(*args, **kwargs)
+
+        key = _request_key(kwargs)
+        entry = response_cache.get(key)
+
+        if entry is None:
+            entry = serialize_response(*unpack(method(*args, **kwargs)))
+            if is_cacheable(entry):
+                response_cache.put(key, entry, version=key[-1])
+
+        response = current_app.response_class(
+            entry.body, status=entry.status, headers=entry.headers, mimetype="application/json"
+        )
+        response.set_etag(entry.etag)
+        if entry.status == 200:
+            response.make_conditional(request)
+        return response
+
+    return wrapper
@@ -8,10 +8,42 @@ class Config:
         SQLALCHEMY_DATABASE_URI (str): URI do banco de dados, configurada pelo ambiente ou com valor padrão.
         FLASK_ENV (str): Ambiente de execução do Flask, podendo ser 'development', 'production', etc.
         SQLALCHEMY_TRACK_MODIFICATIONS (bool): Desabilita o rastreamento de modificações do SQLAlchemy para melhorar desempenho.
+        RESPONSE_CACHE_MAX_BYTES (int): Orçamento de memória, em bytes, do cache de respostas dos endpoints de leitura.
+        AWARDS_ENGINE (str): Motor de cálculo dos intervalos entre prêmios: 'index' (índice incremental em memória),
+            'python' (agrupamento em Python), 'sql' (funções de janela no banco) ou 'numpy' (vetorizado).
+        DEFERRED_INIT (bool): Executa o aquecimento (ingestão do CSV e carga dos modelos) em segundo plano,
+            após a aplicação começar a responder.
+        PROFILING_ENABLED (bool): Permite o profiling por requisição com o parâmetro `profile`
+            ou o cabeçalho `X-Profile`.
+        PROFILE_DIR (str): Diretório onde os arquivos de profile (pstats) são gravados.
+        SNAPSHOT_PATH (str | None): Snapshot somente leitura (ver `snapshot.py`) usado no lugar de
+            `SQLALCHEMY_DATABASE_URI`, sem a ingestão do CSV na inicialização.
+        SLOW_QUERY_THRESHOLD_MS (float): Duração, em milissegundos, a partir da qual os comandos
+            executados no banco são registrados no log de consultas lentas (0 desabilita).
+        ASGI_WSGI_THREADS (int): Threads do servidor ASGI (ver `asgi.py`) que executam as
+            requisições encaminhadas à aplicação Flask.
+        AI_OFFLOAD_WORKERS (int): Processos do pool que executa as computações das rotas de IA
+            (ver `offload.py`); 0 (padrão) as executa na thread da requisição. Cada worker do
+            gunicorn cria o próprio pool.
+        AI_OFFLOAD_MAX_QUEUE (int): Quantidade máxima de computações de IA em andamento em cada
+            pool; acima dela, as rotas de IA respondem 503.
+        AI_OFFLOAD_TIMEOUT_SECONDS (float): Tempo máximo de espera por uma computação de IA; acima
+            dele, as rotas de IA respondem 504.
     """
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL", "sqlite:///data/database.db")
     FLASK_ENV = os.getenv("FLASK_ENV", "development")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", 32 * 1024 * 1024))
+    AWARDS_ENGINE = os.getenv("AWARDS_ENGINE", "index")
+    DEFERRED_INIT = os.getenv("DEFERRED_INIT", "false").lower() == "true"
+    PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+    PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+    SNAPSHOT_PATH = os.getenv("SNAPSHOT_PATH")
+    SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", 200))
+    ASGI_WSGI_THREADS = int(os.getenv("ASGI_WSGI_THREADS", 10))
+    AI_OFFLOAD_WORKERS = int(os.getenv("AI_OFFLOAD_WORKERS", 0))
+    AI_OFFLOAD_MAX_QUEUE = int(os.getenv("AI_OFFLOAD_MAX_QUEUE", 32))
+    AI_OFFLOAD_TIMEOUT_SECONDS = float(os.getenv("AI_OFFLOAD_TIMEOUT_SECONDS", 10))
 
 
 class TestConfig(Config):
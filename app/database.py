@@ -0,0 +1,147 @@
+import logging
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool, StaticPool
+
+logger = logging.getLogger(__name__)
+
+# Tamanho do pool de conexões dos bancos em arquivo: conexões mantidas abertas
+# e conexões extras abertas sob demanda nos picos
+POOL_SIZE = 5
+POOL_MAX_OVERFLOW = 10
+
+# PRAGMAs aplicados a cada nova conexão com um banco SQLite em arquivo:
+# - journal_mode=WAL: leitores não bloqueiam o escritor nem uns aos outros.
+# - synchronous=NORMAL: em WAL, sincroniza o disco apenas nos checkpoints.
+# - mmap_size: lê as páginas pelo mapeamento em memória do sistema operacional,
+#   compartilhado por todas as conexões (256 MiB).
+# - cache_size: cache de páginas de cada conexão (valor negativo em KiB: 16 MiB).
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "mmap_size": 256 * 1024 * 1024,
+    "cache_size": -16 * 1024,
+}
+
+# PRAGMAs que alteram o arquivo, omitidos nas conexões somente leitura
+SQLITE_WRITE_PRAGMAS = ("journal_mode", "synchronous")
+
+
+def is_memory_database(url):
+    """
+    Indica se a URL aponta para um banco SQLite em memória.
+
+    Args:
+        url (str | URL): URL do banco de dados.
+
+    Returns:
+        bool: True para bancos SQLite em memória.
+    """
+    url = make_url(url)
+    return url.get_backend_name() == "sqlite" and (
+        url.database in (None, "", ":memory:") or url.query.get("mode") == "memory"
+    )
+
+
+def is_read_only_database(url):
+    """
+    Indica se a URL abre um banco SQLite somente leitura (`mode=ro`), como os snapshots.
+
+    Args:
+        url (str | URL): URL do banco de dados.
+
+    Returns:
+        bool: True para bancos SQLite somente leitura.
+    """
+    url = make_url(url)
+    return url.get_backend_name() == "sqlite" and url.query.get("mode") == "ro"
+
+
+def _pragmas_listener(pragmas):
+    """Cria o listener que aplica os PRAGMAs a cada nova conexão."""
+    def apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+    return apply_pragmas
+
+
+def _sqlite_pragmas(url):
+    """PRAGMAs aplicados às conexões do banco em arquivo (sem os de escrita em bancos somente leitura)."""
+    if is_read_only_database(url):
+        return {name: value for name, value in SQLITE_PRAGMAS.items() if name not in SQLITE_WRITE_PRAGMAS}
+    return SQLITE_PRAGMAS
+
+
+def create_db_engine(database_uri):
+    """
+    Cria o engine do banco de dados com o pool adequado ao tipo de banco.
+
+    - SQLite em memória: uma única conexão compartilhada (StaticPool), pois o
+      banco só existe nessa conexão.
+    - SQLite em arquivo: pool de conexões (QueuePool), com WAL e os demais
+      `SQLITE_PRAGMAS` aplicados a cada conexão, de modo que leituras
+      concorrentes usam conexões distintas. Em bancos somente leitura
+      (`mode=ro`), apenas os PRAGMAs de leitura são aplicados.
+    - Outros bancos: pool padrão do SQLAlchemy.
+
+    Args:
+        database_uri (str): URI do banco de dados.
+
+    Returns:
+        Engine: Engine configurado.
+    """
+    url = make_url(database_uri)
+    if url.get_backend_name() != "sqlite":
+        return create_engine(url)
+
+    # As conexões do pool podem ser usadas por threads diferentes das que as criaram
+    connect_args = {"check_same_thread": False}
+    if is_memory_database(url):
+        return create_engine(url, connect_args=connect_args, poolclass=StaticPool)
+
+    engine = create_engine(
+        url,
+        connect_args=connect_args,
+        poolclass=QueuePool,
+        pool_size=POOL_SIZE,
+        max_overflow=POOL_MAX_OVERFLOW,
+    )
+    pragmas = _sqlite_pragmas(url)
+    event.listen(engine, "connect", _pragmas_listener(pragmas))
+    logger.info(f"Banco SQLite em arquivo com pool de {POOL_SIZE} conexões e PRAGMAs {pragmas}")
+    return engine
+
+
+def create_async_db_engine(database_uri):
+    """
+    Cria o engine assíncrono usado pelo servidor ASGI (ver `asgi.py`).
+
+    Apenas bancos SQLite em arquivo são suportados, com o driver aiosqlite e o
+    mesmo pool e PRAGMAs do engine síncrono. Bancos em memória existem apenas
+    na conexão do engine síncrono e não podem ser abertos por outro engine.
+
+    Args:
+        database_uri (str): URI do banco de dados.
+
+    Returns:
+        AsyncEngine | None: Engine assíncrono ou None quando o banco não é suportado.
+    """
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    url = make_url(database_uri)
+    if url.get_backend_name() != "sqlite" or is_memory_database(url):
+        return None
+
+    engine = create_async_engine(
+        url.set(drivername="sqlite+aiosqlite"),
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=POOL_SIZE,
+        max_overflow=POOL_MAX_OVERFLOW,
+    )
+    event.listen(engine.sync_engine, "connect", _pragmas_listener(_sqlite_pragmas(url)))
+    return engine
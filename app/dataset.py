@@ -0,0 +1,134 @@
+import threading
+from sqlalchemy import event
+from sqlalchemy.sql.dml import Delete, Insert, Update
+
+# View acompanhada e tabelas normalizadas que a compõem
+MOVIES_TABLE = "movies"
+TRACKED_TABLES = {MOVIES_TABLE, "films", "producers", "studios", "film_producers", "film_studios"}
+
+# Tabelas cujas inserções, isoladamente, não alteram os registros da view
+LOOKUP_TABLES = {"films", "producers", "studios", "film_studios"}
+
+# Opção de execução com as linhas da view representadas por um INSERT nas tabelas normalizadas
+DATASET_ROWS_OPTION = "dataset_rows"
+
+# Chave usada em Connection.info para acumular as alterações da transação corrente
+_PENDING_KEY = "dataset_pending_changes"
+
+# Marcador de alteração que não pode ser aplicada de forma incremental
+FULL_CHANGE = object()
+
+
+class DatasetTracker:
+    """
+    Acompanha as escritas na view 'movies' e nas tabelas normalizadas e notifica
+    os interessados após cada commit.
+
+    Inserções são repassadas aos ouvintes com as linhas inseridas (no formato
+    da view), permitindo atualizações incrementais. Inserções nas tabelas
+    normalizadas informam essas linhas pela opção de execução
+    `DATASET_ROWS_OPTION`; as demais são tratadas pelos seus parâmetros.
+    Atualizações, remoções ou inserções parcialmente ignoradas (ON CONFLICT
+    DO NOTHING) são repassadas como None, indicando que os dados derivados
+    devem ser reconstruídos.
+
+    Os ouvintes são notificados somente depois que o commit é efetivado no
+    banco (`do_commit` do dialeto), de modo que as novas linhas já estão
+    visíveis às demais conexões; a versão é incrementada depois dos ouvintes,
+    de modo que leitores que observam a nova versão encontram os dados
+    derivados (ex.: índice de intervalos) já atualizados. Alterações de
+    transações desfeitas ou cujo commit falha são descartadas.
+
+    Atributos:
+        version (int): Versão do dataset, incrementada a cada commit que altera o dataset.
+    """
+
+    def __init__(self):
+        self.version = 0
+        self._listeners = []
+        self._committing = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, listener):
+        """
+        Registra uma função chamada após cada commit que altera o dataset.
+
+        Args:
+            listener (callable): Recebe a lista de linhas inseridas ou None.
+        """
+        self._listeners.append(listener)
+
+    def watch(self, engine):
+        """
+        Registra os eventos necessários no engine do SQLAlchemy.
+
+        Args:
+            engine (Engine): Engine cujas escritas serão acompanhadas.
+        """
+        event.listen(engine, "after_execute", self._after_execute)
+        event.listen(engine, "commit", self._on_commit)
+        event.listen(engine, "rollback", self._on_rollback)
+
+        # O evento 'commit' é emitido antes do commit no banco: a notificação
+        # fica para depois do `do_commit` do dialeto (exclusivo deste engine)
+        do_commit = engine.dialect.do_commit
+
+        def do_commit_and_notify(dbapi_connection):
+            with self._lock:
+                pending = self._committing.pop(dbapi_connection, None)
+            do_commit(dbapi_connection)
+            if pending is not None:
+                self._notify(pending)
+
+        engine.dialect.do_commit = do_commit_and_notify
+
+    def _after_execute(self, conn, clauseelement, multiparams, params, execution_options, result):
+        """Acumula as alterações do dataset feitas na transação corrente."""
+        if not isinstance(clauseelement, (Insert, Update, Delete)):
+            return
+        table = getattr(clauseelement.table, "name", None)
+        if table not in TRACKED_TABLES:
+            return
+
+        rows = execution_options.get(DATASET_ROWS_OPTION)
+        if rows is None and isinstance(clauseelement, Insert) and table in LOOKUP_TABLES:
+            return
+
+        pending = conn.info.get(_PENDING_KEY)
+        if pending is FULL_CHANGE:
+            return
+
+        if rows is None:
+            rows = list(multiparams) or ([params] if params else [])
+        # Inserções na view via gatilhos não informam o rowcount e também recaem neste caso
+        partial = 0 <= result.rowcount != len(rows)
+        if not isinstance(clauseelement, Insert) or not rows or partial:
+            conn.info[_PENDING_KEY] = FULL_CHANGE
+            return
+
+        conn.info.setdefault(_PENDING_KEY, []).extend(dict(row) for row in rows)
+
+    def _on_commit(self, conn):
+        """Separa as alterações da transação para a notificação após o commit no banco."""
+        pending = conn.info.pop(_PENDING_KEY, None)
+        if pending is None:
+            return
+        with self._lock:
+            self._committing[conn.connection] = pending
+
+    def _notify(self, pending):
+        """Notifica os ouvintes e incrementa a versão após um commit que alterou o dataset."""
+        changes = None if pending is FULL_CHANGE else pending
+        for listener in self._listeners:
+            listener(changes)
+
+        with self._lock:
+            self.version += 1
+
+    def _on_rollback(self, conn):
+        """Descarta as alterações acumuladas na transação desfeita."""
+        conn.info.pop(_PENDING_KEY, None)
+
+
+# Instância compartilhada pela aplicação
+dataset_tracker = DatasetTracker()
@@ -0,0 +1,129 @@
+"""
+Configuração do gunicorn para o ambiente de produção.
+
+Uso:
+    gunicorn --config gunicorn.conf.py "app:create_app(start_warm_up=False)"
+
+A aplicação é criada no processo mestre antes do fork (`preload_app`), sem a
+fase de aquecimento, de modo que os workers respondem às verificações de
+saúde imediatamente. O aquecimento (ingestão do CSV e carga dos dados e
+modelos de IA) é executado em segundo plano no mestre; ao final, os workers
+são reiniciados de forma graciosa (SIGHUP) e os novos workers, criados a
+partir do mestre, compartilham esses dados em memória (copy-on-write). O
+mesmo ocorre sempre que o arquivo CSV ou o snapshot (`SNAPSHOT_PATH`) muda.
+"""
+import os
+import time
+import shutil
+import signal
+import tempfile
+import threading
+
+
+def _cpu_count():
+    """Quantidade de CPUs disponíveis para o processo (respeita a afinidade do container)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def _prepare_metrics_dir():
+    """
+    Define o diretório das métricas compartilhadas entre os processos (ver
+    `metrics.py`) e remove os arquivos de execuções anteriores.
+
+    Executado ao carregar esta configuração, antes da criação das métricas; as
+    releituras da configuração no mesmo mestre (SIGHUP) não limpam o diretório.
+    """
+    directory = os.environ.setdefault(
+        "PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "prometheus-multiproc")
+    )
+    if os.environ.get("PROMETHEUS_MULTIPROC_OWNER") != str(os.getpid()):
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory, exist_ok=True)
+        os.environ["PROMETHEUS_MULTIPROC_OWNER"] = str(os.getpid())
+
+
+_prepare_metrics_dir()
+
+# Endereço de escuta
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+
+# Workers com threads: as requisições passam a maior parte do tempo em E/S e
+# em bibliotecas nativas (SQLite, NumPy), que liberam o GIL
+worker_class = "gthread"
+workers = int(os.getenv("GUNICORN_WORKERS", _cpu_count() * 2 + 1))
+threads = int(os.getenv("GUNICORN_THREADS", 4))
+
+# Carrega a aplicação antes do fork para compartilhar a memória entre os workers
+preload_app = True
+
+# Tempos limite (em segundos)
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 60))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", 30))
+keepalive = 5
+
+# Logs de acesso e de erro na saída padrão
+accesslog = "-"
+errorlog = "-"
+
+# Intervalo, em segundos, da verificação de alterações no CSV e no snapshot (0 desabilita)
+dataset_poll_interval = float(os.getenv("DATASET_POLL_INTERVAL", 5))
+
+
+def _signature(paths):
+    """Metadados usados para detectar alterações nos arquivos."""
+    return [(stat.st_mtime_ns, stat.st_size, stat.st_ino) for stat in map(os.stat, paths)]
+
+
+def _warm_up_and_watch(server):
+    """
+    Executa o aquecimento no mestre e, depois, recarrega os dados sempre que o
+    arquivo CSV ou o snapshot muda; em ambos os casos os workers são reiniciados
+    com os dados atualizados.
+    """
+    from ai_routes import csv_path
+    from app import warm_up
+    from config import Config
+    from readiness import readiness
+
+    paths = [csv_path] + ([Config.SNAPSHOT_PATH] if Config.SNAPSHOT_PATH else [])
+    signature = _signature(paths)
+    if readiness.run(warm_up):
+        # Novos workers são criados a partir do mestre, já com os dados carregados
+        os.kill(server.pid, signal.SIGHUP)
+
+    while dataset_poll_interval > 0:
+        time.sleep(dataset_poll_interval)
+        try:
+            current = _signature(paths)
+        except OSError as e:
+            server.log.error(f"Erro ao verificar os arquivos de dados: {e}")
+            continue
+        if current == signature:
+            continue
+
+        signature = current
+        server.log.info("Arquivos de dados alterados: recarregando os dados e reiniciando os workers.")
+        if readiness.run(warm_up):
+            os.kill(server.pid, signal.SIGHUP)
+
+
+def when_ready(server):
+    """Inicia, no processo mestre, o aquecimento e a verificação periódica do arquivo CSV."""
+    threading.Thread(target=_warm_up_and_watch, args=(server,), name="warm-up", daemon=True).start()
+
+
+def post_fork(server, worker):
+    """Descarta as conexões com o banco herdadas do processo mestre."""
+    from routes import after_fork
+
+    after_fork()
+
+
+def child_exit(server, worker):
+    """Descarta as métricas "live" (ex.: tamanho do cache) do worker encerrado."""
+    from metrics import mark_process_dead
+
+    mark_process_dead(worker.pid)
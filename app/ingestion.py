@@ -0,0 +1,215 @@
+import os
+import time
+import logging
+import pandas as pd
+from sqlalchemy import insert, select, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from utils import split_many
+from dataset import DATASET_ROWS_OPTION
+from metrics import observe_ingestion
+from models import Film, FilmProducer, FilmStudio, MOVIE_KEY_COLUMNS, Movie, Producer, Studio, create_movies_view
+
+# Configuração de log
+logger = logging.getLogger(__name__)
+
+# Quantidade de registros enviados por lote em cada executemany
+INSERT_CHUNK_SIZE = 5000
+
+
+def _explode_producers(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Converte o DataFrame do CSV em um DataFrame com um registro por produtor.
+
+    A separação dos produtores é feita uma única vez por texto distinto e a
+    explosão, normalização do campo 'winner' e remoção de duplicados são vetorizadas.
+    """
+    empty = pd.Series("", index=df.index)
+    winner = df.get("winner", empty).fillna("").astype(str).str.strip().str.lower()
+
+    frame = pd.DataFrame({
+        "year": df["year"].astype(int),
+        "title": df["title"],
+        "studios": df.get("studios", empty),
+        "winner": winner.where(winner == "yes", "no"),
+    })
+    producers = split_many(df.get("producers", empty)).rename("producer")
+    frame = frame.join(producers, how="inner")
+    return frame.drop_duplicates(subset=MOVIE_KEY_COLUMNS)
+
+
+def _anti_join_existing(db_session: Session, frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Remove do DataFrame os registros que já existem no banco, com uma única consulta.
+    """
+    existing = pd.DataFrame(
+        db_session.execute(select(*(getattr(Movie, column) for column in MOVIE_KEY_COLUMNS))).all(),
+        columns=MOVIE_KEY_COLUMNS,
+    )
+    if existing.empty:
+        return frame
+
+    merged = frame.merge(existing, on=MOVIE_KEY_COLUMNS, how="left", indicator=True)
+    return merged[merged["_merge"] == "left_only"].drop(columns="_merge")
+
+
+def _insert_ignore_statement(dialect, table):
+    """
+    Retorna um INSERT que ignora conflitos com a chave única, conforme o dialeto do banco.
+    """
+    if dialect == "sqlite":
+        return sqlite.insert(table).on_conflict_do_nothing()
+    if dialect == "postgresql":
+        return postgresql.insert(table).on_conflict_do_nothing()
+    # Demais bancos dependem apenas do anti-join realizado antes da inserção
+    return insert(table)
+
+
+def _execute_chunks(executor, statement, records):
+    """
+    Executa o INSERT em blocos via executemany.
+
+    Returns:
+        int: Quantidade de registros inseridos.
+    """
+    inserted = 0
+    for start in range(0, len(records), INSERT_CHUNK_SIZE):
+        chunk = records[start:start + INSERT_CHUNK_SIZE]
+        result = executor.execute(statement, chunk)
+        inserted += result.rowcount if result.rowcount >= 0 else len(chunk)
+    return inserted
+
+
+def _lookup_ids(executor, table, key_columns):
+    """Retorna um DataFrame com o id e as colunas de chave de todos os registros da tabela."""
+    rows = executor.execute(select(table.c.id, *(table.c[column] for column in key_columns))).all()
+    return pd.DataFrame(rows, columns=["id"] + key_columns)
+
+
+def _insert_normalized(executor, dialect, frame):
+    """
+    Insere registros no formato da view 'movies' (um por filme/produtor) nas tabelas normalizadas.
+
+    Filmes, produtores e estúdios são inseridos uma única vez e seus ids
+    resolvidos com uma consulta por tabela; as associações filme/produtor
+    carregam as linhas correspondentes da view para o acompanhamento do dataset.
+
+    Args:
+        executor (Session | Connection): Objeto usado para executar os comandos.
+        dialect (str): Nome do dialeto do banco.
+        frame (pd.DataFrame): Registros com as colunas year, title, studios, producer e winner.
+
+    Returns:
+        int: Quantidade de registros filme/produtor inseridos.
+    """
+    if frame.empty:
+        return 0
+
+    film_key = ["year", "title", "winner"]
+    frame = frame.astype(object).where(frame.notna(), None)
+
+    # Filmes
+    films = frame.drop_duplicates(subset=film_key)[film_key + ["studios"]]
+    _execute_chunks(executor, _insert_ignore_statement(dialect, Film.__table__), films.to_dict("records"))
+    film_ids = _lookup_ids(executor, Film.__table__, film_key).rename(columns={"id": "film_id"})
+    films = films.merge(film_ids, on=film_key)
+
+    # Produtores
+    producers = pd.DataFrame({"name": frame["producer"].unique()})
+    _execute_chunks(executor, _insert_ignore_statement(dialect, Producer.__table__), producers.to_dict("records"))
+    producer_ids = _lookup_ids(executor, Producer.__table__, ["name"])
+    producer_ids = producer_ids.rename(columns={"id": "producer_id", "name": "producer"})
+
+    # Estúdios, separados a partir do texto original de cada filme
+    names = split_many(films["studios"].reset_index(drop=True))
+    if not names.empty:
+        studios = pd.DataFrame({"name": names.unique()})
+        _execute_chunks(executor, _insert_ignore_statement(dialect, Studio.__table__), studios.to_dict("records"))
+        studio_ids = _lookup_ids(executor, Studio.__table__, ["name"]).set_index("name")["id"]
+        film_studios = pd.DataFrame({
+            "film_id": films["film_id"].to_numpy()[names.index],
+            "studio_id": studio_ids.loc[names.to_numpy()].to_numpy(),
+        }).drop_duplicates()
+        _execute_chunks(
+            executor,
+            _insert_ignore_statement(dialect, FilmStudio.__table__),
+            film_studios.astype(int).to_dict("records"),
+        )
+
+    # Associações filme/produtor: cada bloco informa as linhas da view que representa
+    links = frame.merge(films[film_key + ["film_id"]], on=film_key).merge(producer_ids, on="producer")
+    statement = _insert_ignore_statement(dialect, FilmProducer.__table__)
+    inserted = 0
+    for start in range(0, len(links), INSERT_CHUNK_SIZE):
+        chunk = links.iloc[start:start + INSERT_CHUNK_SIZE]
+        rows = chunk[["year", "title", "studios", "producer", "winner"]].to_dict("records")
+        result = executor.execute(
+            statement.execution_options(**{DATASET_ROWS_OPTION: rows}),
+            chunk[["film_id", "producer_id"]].astype(int).to_dict("records"),
+        )
+        inserted += result.rowcount if result.rowcount >= 0 else len(chunk)
+    return inserted
+
+
+def populate_data(db_session: Session):
+    """
+    Popula as tabelas normalizadas com os dados do arquivo CSV.
+
+    A ingestão é feita em lote: os produtores são explodidos de forma vetorizada,
+    os registros já existentes na view 'movies' são descartados com um anti-join
+    e os novos são inseridos em blocos via executemany com 'ON CONFLICT DO NOTHING'.
+
+    Returns:
+        int: Quantidade de novos registros inseridos.
+    """
+    # Caminho do arquivo CSV
+    csv_path = os.getenv(
+        "CSV_PATH",
+        os.path.join(os.path.dirname(__file__), "data/movielist.csv"),
+    )
+    if not os.path.exists(csv_path):
+        raise FileNotFoundError(f"Arquivo CSV não encontrado: {csv_path}")
+
+    # Carrega os dados do CSV em um DataFrame do pandas
+    try:
+        df = pd.read_csv(csv_path, sep=";")
+    except Exception as e:
+        raise ValueError(f"Erro ao ler o arquivo CSV: {e}")
+
+    started = time.perf_counter()
+
+    # Um registro por produtor, sem os que já estão no banco
+    frame = _anti_join_existing(db_session, _explode_producers(df))
+
+    # Insere os registros nas tabelas normalizadas
+    new_records = _insert_normalized(db_session, db_session.get_bind().dialect.name, frame)
+
+    # Confirma as alterações no banco
+    db_session.commit()
+
+    elapsed = time.perf_counter() - started
+    observe_ingestion(len(frame), elapsed)
+    logger.info(
+        "%d novos registros adicionados ao banco de dados em %.3fs (%.0f registros/s).",
+        new_records, elapsed, len(frame) / elapsed if elapsed > 0 else 0.0,
+    )
+    return new_records
+
+
+def migrate_legacy_movies(connection):
+    """
+    Converte a antiga tabela 'movies' (um registro por produtor) para as tabelas normalizadas.
+
+    A tabela é substituída pela view 'movies'.
+
+    Returns:
+        int: Quantidade de registros migrados.
+    """
+    rows = connection.execute(text("SELECT year, title, studios, producer, winner FROM movies")).all()
+    frame = pd.DataFrame(rows, columns=["year", "title", "studios", "producer", "winner"])
+    frame["winner"] = frame["winner"].where(frame["winner"] == "yes", "no")
+    frame = frame.drop_duplicates(subset=MOVIE_KEY_COLUMNS)
+
+    connection.exec_driver_sql("DROP TABLE movies")
+    create_movies_view(connection)
+    return _insert_normalized(connection, connection.dialect.name, frame)
@@ -0,0 +1,249 @@
+"""
+Métricas da aplicação no formato texto do Prometheus (`/metrics`).
+
+As métricas usam o prometheus_client. Com a variável `PROMETHEUS_MULTIPROC_DIR`
+definida antes da importação deste módulo (o `gunicorn.conf.py` a define), os
+valores de cada processo são gravados em arquivos mapeados em memória nesse
+diretório e o `/metrics` de qualquer worker expõe a soma de todos os
+processos: os contadores não regridem entre coletas atendidas por workers
+diferentes. Sem a variável, os valores são mantidos apenas no processo.
+"""
+import os
+import time
+from flask import Response, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    disable_created_metrics,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import GaugeMetricFamily
+from sqlalchemy import event
+
+# Tipo de conteúdo do formato texto do Prometheus
+PROMETHEUS_MIMETYPE = CONTENT_TYPE_LATEST
+
+# Variável de ambiente do diretório das métricas compartilhadas entre processos
+MULTIPROC_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+# Limites superiores (em segundos) dos buckets dos histogramas de latência
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Séries `*_created` não são exibidas (também não existem no modo multiprocesso)
+disable_created_metrics()
+
+# Registro das métricas do processo
+registry = CollectorRegistry()
+
+# Requisições HTTP
+http_requests = Counter(
+    "http_requests", "Quantidade de requisições HTTP.", ("endpoint", "method", "status"), registry=registry
+)
+http_request_duration = Histogram(
+    "http_request_duration_seconds", "Latência das requisições HTTP, em segundos.", ("endpoint", "method"),
+    buckets=DEFAULT_BUCKETS, registry=registry,
+)
+
+# Consultas ao banco de dados
+db_queries = Counter(
+    "db_queries", "Quantidade de comandos executados no banco de dados.", ("operation",), registry=registry
+)
+db_query_duration = Histogram(
+    "db_query_duration_seconds", "Duração dos comandos executados no banco de dados, em segundos.", ("operation",),
+    buckets=DEFAULT_BUCKETS, registry=registry,
+)
+
+# Ingestão do CSV
+ingestion_rows = Counter(
+    "ingestion_rows", "Quantidade de registros inseridos pela ingestão do CSV.", registry=registry
+)
+ingestion_rows_per_second = Gauge(
+    "ingestion_rows_per_second", "Vazão da última ingestão do CSV, em registros por segundo.",
+    multiprocess_mode="mostrecent", registry=registry,
+)
+ingestion_duration = Gauge(
+    "ingestion_duration_seconds", "Duração da última ingestão do CSV, em segundos.",
+    multiprocess_mode="mostrecent", registry=registry,
+)
+
+# Modelo de recomendação
+recommendation_model_train_seconds = Gauge(
+    "recommendation_model_train_seconds", "Duração do último treinamento do modelo de recomendação, em segundos.",
+    multiprocess_mode="mostrecent", registry=registry,
+)
+recommendation_model_load_seconds = Gauge(
+    "recommendation_model_load_seconds",
+    "Duração do último carregamento do modelo de recomendação do disco, em segundos.",
+    multiprocess_mode="mostrecent", registry=registry,
+)
+
+# Cache de respostas (a taxa de acertos é calculada na coleta, ver `_CollectorWithCacheRatio`)
+response_cache_hits = Counter(
+    "response_cache_hits", "Quantidade de leituras atendidas pelo cache de respostas.", registry=registry
+)
+response_cache_misses = Counter(
+    "response_cache_misses", "Quantidade de leituras que não foram atendidas pelo cache de respostas.",
+    registry=registry,
+)
+response_cache_size = Gauge(
+    "response_cache_size_bytes", "Tamanho somado das respostas armazenadas no cache, em bytes.",
+    multiprocess_mode="livesum", registry=registry,
+)
+
+
+class _CollectorWithCacheRatio:
+    """Repassa as métricas coletadas e acrescenta a taxa de acertos do cache, calculada a partir dos totais."""
+
+    def __init__(self, source):
+        self.source = source
+
+    def collect(self):
+        totals = {"response_cache_hits_total": 0.0, "response_cache_misses_total": 0.0}
+        for family in self.source.collect():
+            for sample in family.samples:
+                if sample.name in totals:
+                    totals[sample.name] += sample.value
+            yield family
+
+        hits, misses = totals["response_cache_hits_total"], totals["response_cache_misses_total"]
+        yield GaugeMetricFamily(
+            "response_cache_hit_ratio", "Proporção de leituras atendidas pelo cache de respostas.",
+            value=hits / (hits + misses) if hits + misses else 0.0,
+        )
+
+
+def render():
+    """
+    Retorna as métricas no formato texto do Prometheus.
+
+    No modo multiprocesso, agrega os arquivos de todos os processos.
+
+    Returns:
+        bytes: Métricas serializadas.
+    """
+    directory = os.environ.get(MULTIPROC_DIR_ENV)
+    if directory:
+        source = CollectorRegistry()
+        multiprocess.MultiProcessCollector(source, path=directory)
+    else:
+        source = registry
+    return generate_latest(_CollectorWithCacheRatio(source))
+
+
+def mark_process_dead(pid):
+    """
+    Descarta os medidores "live" de um processo encerrado (ex.: worker do gunicorn).
+
+    Args:
+        pid (int): Identificador do processo.
+    """
+    if os.environ.get(MULTIPROC_DIR_ENV):
+        multiprocess.mark_process_dead(pid)
+
+
+def observe_ingestion(rows, elapsed):
+    """
+    Registra o resultado de uma ingestão do CSV.
+
+    Args:
+        rows (int): Quantidade de registros processados.
+        elapsed (float): Duração da ingestão, em segundos.
+    """
+    ingestion_rows.inc(rows)
+    ingestion_duration.set(elapsed)
+    ingestion_rows_per_second.set(rows / elapsed if elapsed > 0 else 0.0)
+
+
+def observe_model_training(elapsed):
+    """
+    Registra a duração de um treinamento do modelo de recomendação.
+
+    Args:
+        elapsed (float): Duração do treinamento, em segundos.
+    """
+    recommendation_model_train_seconds.set(elapsed)
+
+
+def observe_model_load(elapsed):
+    """
+    Registra a duração de um carregamento do modelo de recomendação do disco.
+
+    Args:
+        elapsed (float): Duração do carregamento, em segundos.
+    """
+    recommendation_model_load_seconds.set(elapsed)
+
+
+def register_cache_metrics(cache):
+    """
+    Registra os acertos, as falhas e o tamanho do cache de respostas a cada operação.
+
+    Args:
+        cache (ResponseCache): Cache de respostas.
+    """
+    def record(hit):
+        if hit is True:
+            response_cache_hits.inc()
+        elif hit is False:
+            response_cache_misses.inc()
+        response_cache_size.set(cache.size)
+
+    cache.listener = record
+
+
+def watch_engine(engine):
+    """
+    Registra a contagem e a duração dos comandos executados no engine.
+
+    Args:
+        engine (Engine): Engine do banco de dados.
+    """
+    # O início é guardado no contexto de execução, que é exclusivo de cada comando
+    # (a conexão pode ser compartilhada entre threads com StaticPool)
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context.metrics_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "metrics_started", None)
+        if started is None:
+            return
+        words = statement.split(None, 1)
+        operation = words[0].upper() if words else "UNKNOWN"
+        db_queries.labels(operation).inc()
+        db_query_duration.labels(operation).observe(time.perf_counter() - started)
+
+
+def instrument_app(app):
+    """
+    Registra a medição das requisições e o endpoint `/metrics` na aplicação.
+
+    O endpoint é identificado pela regra de rota (ex.: '/app/producers/<string:producer>'),
+    mantendo a cardinalidade dos rótulos limitada.
+
+    Args:
+        app (Flask): Aplicação Flask.
+    """
+    @app.before_request
+    def _start_timer():
+        request.environ["metrics.started"] = time.perf_counter()
+
+    @app.after_request
+    def _record_request(response):
+        started = request.environ.get("metrics.started")
+        if started is not None:
+            endpoint = request.url_rule.rule if request.url_rule is not None else "unmatched"
+            http_requests.labels(endpoint, request.method, str(response.status_code)).inc()
+            http_request_duration.labels(endpoint, request.method).observe(time.perf_counter() - started)
+        return response
+
+    @app.route("/metrics")
+    def metrics():
+        """Métricas da aplicação no formato texto do Prometheus."""
+        return Response(render(), content_type=PROMETHEUS_MIMETYPE)
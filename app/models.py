@@ -1,77 +1,238 @@
-import os
-import pandas as pd
+import logging
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy import Column, Integer, String, Text
+from sqlalchemy import Column, ForeignKey, Index, Integer, MetaData, String, Table, Text, event, inspect
 from sqlalchemy.orm import Session
-from utils import split_by_comma_and_and
+
+# Configuração de log
+logger = logging.getLogger(__name__)
 
 # Base para os modelos SQLAlchemy
 Base = declarative_base()
 
-class Movie(Base):
+# Colunas que identificam unicamente um registro de filme/produtor
+MOVIE_KEY_COLUMNS = ["year", "title", "producer", "winner"]
+
+class Film(Base):
     """
-    Representa a tabela 'movies' no banco de dados.
+    Representa a tabela 'films': um registro por filme, com o texto original dos estúdios.
     """
-    __tablename__ = "movies"
+    __tablename__ = "films"
+    __table_args__ = (
+        # Chave única usada pela ingestão (ON CONFLICT DO NOTHING); atende também filtros por ano
+        Index("uq_films_year_title_winner", "year", "title", "winner", unique=True),
+        # Paginação por cursor de /movies: percorre os filmes em ordem de (year, id)
+        Index("ix_films_year_id", "year", "id"),
+        # Filtro por título em /movies
+        Index("ix_films_title", "title"),
+        # Consulta de vencedores em /winners e no cálculo dos intervalos
+        Index("ix_films_winner_year", "winner", "year"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     year = Column(Integer, nullable=False)
     title = Column(String, nullable=False)
     studios = Column(Text)
-    producer = Column(String, nullable=False)
     winner = Column(String)
 
 
-def populate_data(db_session: Session):
+class Producer(Base):
+    """
+    Representa a tabela 'producers': um registro por produtor.
+    """
+    __tablename__ = "producers"
+    __table_args__ = (
+        Index("uq_producers_name", "name", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String, nullable=False)
+
+
+class Studio(Base):
+    """
+    Representa a tabela 'studios': um registro por estúdio.
+    """
+    __tablename__ = "studios"
+    __table_args__ = (
+        Index("uq_studios_name", "name", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String, nullable=False)
+
+
+class FilmProducer(Base):
     """
-    Popula a tabela 'movies' com os dados do arquivo CSV.
+    Associação entre filmes e produtores. O id identifica o registro exposto na view 'movies'.
     """
-    # Caminho do arquivo CSV
-    csv_path = os.getenv(
-        "CSV_PATH",
-        os.path.join(os.path.dirname(__file__), "data/movielist.csv"),
+    __tablename__ = "film_producers"
+    __table_args__ = (
+        Index("uq_film_producers_film_producer", "film_id", "producer_id", unique=True),
+        # Filtro por produtor em /movies, /producers/<producer> e agrupamento dos intervalos
+        Index("ix_film_producers_producer_film", "producer_id", "film_id"),
     )
-    if not os.path.exists(csv_path):
-        raise FileNotFoundError(f"Arquivo CSV não encontrado: {csv_path}")
-
-    # Carrega os dados do CSV em um DataFrame do pandas
-    try:
-        df = pd.read_csv(csv_path, sep=";")
-    except Exception as e:
-        raise ValueError(f"Erro ao ler o arquivo CSV: {e}")
-
-    # Contador para novos registros
-    new_records = 0
-
-    # Itera sobre cada linha do CSV
-    for _, row in df.iterrows():
-        # Normaliza os produtores
-        producers = split_by_comma_and_and(str(row.get("producers", "")))
-
-        # Normaliza o campo 'winner' (padrão: 'yes' ou 'no')
-        winner = "yes" if str(row.get("winner", "")).strip().lower() == "yes" else "no"
-
-        for producer in producers:
-            # Verifica se o registro já existe no banco
-            exists = db_session.query(Movie).filter_by(
-                year=int(row["year"]),
-                title=row["title"],
-                producer=producer,
-                winner=winner,
-            ).first()
-
-            # Adiciona o registro se ele ainda não existir
-            if not exists:
-                movie = Movie(
-                    year=int(row["year"]),
-                    title=row["title"],
-                    studios=row.get("studios", ""),
-                    producer=producer,
-                    winner=winner,
-                )
-                db_session.add(movie)
-                new_records += 1
-
-    # Confirma as alterações no banco
-    db_session.commit()
-    print(f"{new_records} novos registros adicionados ao banco de dados.")
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    film_id = Column(Integer, ForeignKey("films.id"), nullable=False)
+    producer_id = Column(Integer, ForeignKey("producers.id"), nullable=False)
+
+
+class FilmStudio(Base):
+    """
+    Associação entre filmes e estúdios.
+    """
+    __tablename__ = "film_studios"
+    __table_args__ = (
+        Index("ix_film_studios_studio_film", "studio_id", "film_id"),
+    )
+
+    film_id = Column(Integer, ForeignKey("films.id"), primary_key=True)
+    studio_id = Column(Integer, ForeignKey("studios.id"), primary_key=True)
+
+
+# View 'movies': um registro por filme/produtor, no formato da antiga tabela.
+# Fica fora de Base.metadata para que create_all não a crie como tabela.
+movies_view = Table(
+    "movies", MetaData(),
+    Column("id", Integer),
+    Column("film_id", Integer),
+    Column("producer_id", Integer),
+    Column("year", Integer),
+    Column("title", String),
+    Column("studios", Text),
+    Column("producer", String),
+    Column("winner", String),
+    implicit_returning=False,
+)
+
+MOVIES_VIEW_SELECT = """
+    SELECT fp.id AS id, fp.film_id AS film_id, fp.producer_id AS producer_id,
+           f.year AS year, f.title AS title, f.studios AS studios,
+           p.name AS producer, f.winner AS winner
+    FROM film_producers fp
+    JOIN films f ON f.id = fp.film_id
+    JOIN producers p ON p.id = fp.producer_id
+"""
+
+# Nomes dos estúdios de NEW.studios como array JSON, lido com json_each nos
+# gatilhos (que não aceitam CTEs). Equivale à separação da ingestão
+# (`utils.split_by_comma_and_and`): vírgulas e 'and' isolado separam os nomes,
+# e os itens são aparados e descartados quando vazios.
+_STUDIO_NAMES_JSON = (
+    """'["' || replace(replace(replace(replace("""
+    """' ' || replace(replace(replace(replace(NEW.studios, char(9), ' '), char(10), ' '), char(13), ' '), ',', ' , ')"""
+    """ || ' ', ' and ', ','), '\\', '\\\\'), '"', '\\"'), ',', '","') || '"]'"""
+)
+
+# Gatilhos (SQLite) que traduzem escritas na view para as tabelas normalizadas,
+# por nome; valem para todas as formas de escrita (ORM, Core ou SQL)
+MOVIES_VIEW_TRIGGERS = {
+    "movies_insert": f"""
+    CREATE TRIGGER movies_insert INSTEAD OF INSERT ON movies
+    BEGIN
+        INSERT OR IGNORE INTO producers (name) VALUES (NEW.producer);
+        INSERT OR IGNORE INTO films (year, title, studios, winner)
+        VALUES (NEW.year, NEW.title, NEW.studios, NEW.winner);
+        INSERT OR IGNORE INTO film_producers (film_id, producer_id) VALUES (
+            (SELECT id FROM films WHERE year = NEW.year AND title = NEW.title AND winner IS NEW.winner),
+            (SELECT id FROM producers WHERE name = NEW.producer)
+        );
+        INSERT OR IGNORE INTO studios (name)
+            SELECT trim(value) FROM json_each({_STUDIO_NAMES_JSON}) WHERE trim(value) <> '';
+        INSERT OR IGNORE INTO film_studios (film_id, studio_id)
+            SELECT f.id, s.id
+            FROM films f, json_each({_STUDIO_NAMES_JSON}) j
+            JOIN studios s ON s.name = trim(j.value)
+            WHERE f.year = NEW.year AND f.title = NEW.title AND f.winner IS NEW.winner;
+    END
+    """,
+    "movies_delete": """
+    CREATE TRIGGER movies_delete INSTEAD OF DELETE ON movies
+    BEGIN
+        DELETE FROM film_producers WHERE id = OLD.id;
+        DELETE FROM film_studios WHERE film_id = OLD.film_id
+            AND NOT EXISTS (SELECT 1 FROM film_producers WHERE film_id = OLD.film_id);
+        DELETE FROM films WHERE id = OLD.film_id
+            AND NOT EXISTS (SELECT 1 FROM film_producers WHERE film_id = OLD.film_id);
+        DELETE FROM producers WHERE id = OLD.producer_id
+            AND NOT EXISTS (SELECT 1 FROM film_producers WHERE producer_id = OLD.producer_id);
+    END
+    """,
+}
+
+
+class Movie(Base):
+    """
+    Representa a view 'movies': um registro por filme/produtor, montado a partir
+    das tabelas normalizadas.
+
+    Mantém o formato da antiga tabela para os endpoints e para a escrita via
+    ORM (inserções e remoções são traduzidas por gatilhos no SQLite); a chave
+    primária do mapeamento é a chave natural do registro.
+    """
+    __table__ = movies_view
+    __mapper_args__ = {"primary_key": [movies_view.c[column] for column in MOVIE_KEY_COLUMNS]}
+
+
+def create_movies_view(connection):
+    """Cria, de forma idempotente, a view 'movies' e recria seus gatilhos de escrita na versão atual."""
+    if connection.dialect.name != "sqlite":
+        connection.exec_driver_sql(f"CREATE OR REPLACE VIEW movies AS {MOVIES_VIEW_SELECT}")
+        return
+
+    connection.exec_driver_sql(f"CREATE VIEW IF NOT EXISTS movies AS {MOVIES_VIEW_SELECT}")
+    for name, trigger in MOVIES_VIEW_TRIGGERS.items():
+        connection.exec_driver_sql(f"DROP TRIGGER IF EXISTS {name}")
+        connection.exec_driver_sql(trigger)
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _after_create(target, connection, **kw):
+    """Cria a view 'movies' junto com as tabelas, exceto quando ainda existe a tabela legada."""
+    if "movies" not in inspect(connection).get_table_names():
+        create_movies_view(connection)
+
+
+def migrate_schema(engine):
+    """
+    Atualiza, de forma idempotente, o esquema de bancos já existentes.
+
+    - Cria as tabelas normalizadas ausentes.
+    - Converte a antiga tabela 'movies' para as tabelas normalizadas, substituindo-a pela view.
+    - Cria a view 'movies', caso esteja ausente, e recria seus gatilhos.
+    - Cria os índices das tabelas normalizadas, caso estejam ausentes.
+
+    Args:
+        engine (Engine): Engine do banco de dados.
+    """
+    with engine.begin() as connection:
+        Base.metadata.create_all(bind=connection)
+        inspector = inspect(connection)
+        if "movies" in inspector.get_table_names():
+            from ingestion import migrate_legacy_movies
+
+            migrated = migrate_legacy_movies(connection)
+            logger.info("%d registros migrados da tabela legada 'movies'.", migrated)
+        else:
+            create_movies_view(connection)
+
+        for table in Base.metadata.sorted_tables:
+            existing = {index["name"] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in existing:
+                    index.create(connection)
+                    logger.info("Índice '%s' criado.", index.name)
+
+
+def populate_data(db_session: Session):
+    """
+    Popula as tabelas normalizadas com os dados do arquivo CSV.
+
+    A ingestão (pandas) fica no módulo `ingestion`, importado apenas no primeiro uso.
+
+    Returns:
+        int: Quantidade de novos registros inseridos.
+    """
+    from ingestion import populate_data as populate
+
+    return populate(db_session)
@@ -0,0 +1,141 @@
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+logger = logging.getLogger(__name__)
+
+
+class OverloadedError(Exception):
+    """Fila de tarefas do pool de processos cheia."""
+
+
+class ProcessOffloader:
+    """
+    Executa computações de CPU em um pool limitado de processos.
+
+    Os processos do pool são iniciados com `spawn` no primeiro uso (depois do
+    fork dos workers do gunicorn) e mantêm o próprio estado entre as tarefas,
+    preparado pelo `initializer`. Com isso, as requisições apenas enviam os
+    parâmetros e recebem o resultado, sem disputar o GIL com as demais
+    requisições do worker.
+
+    - Tarefas idênticas em andamento (mesma chave) são compartilhadas: as
+      requisições concorrentes aguardam a mesma computação.
+    - Com `max_queue` tarefas em andamento, novas tarefas são recusadas com
+      `OverloadedError`.
+    - Cada requisição aguarda no máximo `timeout` segundos (`TimeoutError`); a
+      tarefa continua em execução e ocupa a fila até terminar.
+
+    Com `workers` igual a 0, as funções são executadas diretamente na thread
+    da requisição.
+
+    Atributos:
+        workers (int): Quantidade de processos do pool (0 desabilita o pool).
+        max_queue (int): Quantidade máxima de tarefas em andamento.
+        timeout (float): Tempo máximo de espera de cada requisição, em segundos.
+    """
+
+    def __init__(self):
+        self.workers = 0
+        self.max_queue = 0
+        self.timeout = None
+        self._initializer = None
+        self._initargs = ()
+        self._executor = None
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def configure(self, workers, max_queue, timeout, initializer=None, initargs=()):
+        """
+        Configura o pool, encerrando os processos do pool anterior.
+
+        Args:
+            workers (int): Quantidade de processos (0 desabilita o pool).
+            max_queue (int): Quantidade máxima de tarefas em andamento.
+            timeout (float): Tempo máximo de espera de cada requisição, em segundos.
+            initializer (callable | None): Função executada no início de cada processo.
+            initargs (tuple): Argumentos do `initializer`.
+        """
+        self.shutdown()
+        self.workers = workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._initializer = initializer
+        self._initargs = initargs
+
+    def run(self, key, function, *args):
+        """
+        Executa a função no pool e aguarda o resultado.
+
+        Args:
+            key (hashable): Identifica a computação; chamadas concorrentes com a
+                mesma chave compartilham o resultado.
+            function (callable): Função de nível de módulo (serializável com pickle).
+            *args: Argumentos da função.
+
+        Returns:
+            Any: Resultado da função.
+
+        Raises:
+            OverloadedError: Fila de tarefas cheia.
+            TimeoutError: O resultado não ficou pronto dentro de `timeout`.
+        """
+        if self.workers <= 0:
+            return function(*args)
+        future = self._submit(key, function, args)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            # Antes do Python 3.11, o timeout de um Future não é um TimeoutError
+            raise TimeoutError(f"Tarefa sem resultado após {self.timeout}s.") from None
+
+    def inflight(self):
+        """Quantidade de tarefas em andamento."""
+        return len(self._inflight)
+
+    def _submit(self, key, function, args):
+        """Envia a tarefa ao pool ou retorna a tarefa idêntica já em andamento."""
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                return future
+            if len(self._inflight) >= self.max_queue:
+                raise OverloadedError(f"{len(self._inflight)} tarefas em andamento.")
+
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=self._initializer,
+                    initargs=self._initargs,
+                )
+            executor = self._executor
+            future = executor.submit(function, *args)
+            self._inflight[key] = future
+
+        future.add_done_callback(lambda done: self._finish(key, done, executor))
+        return future
+
+    def _finish(self, key, future, executor):
+        """Remove a tarefa concluída e descarta o pool se um processo morreu."""
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+            if not future.cancelled() and isinstance(future.exception(), BrokenProcessPool):
+                if self._executor is executor:
+                    logger.error("Pool de processos interrompido; um novo pool será criado na próxima tarefa.")
+                    self._executor = None
+
+    def shutdown(self):
+        """Encerra os processos do pool, sem aguardar as tarefas em andamento."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self._inflight.clear()
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Pool compartilhado pelas rotas de IA
+ai_offloader = ProcessOffloader()
@@ -0,0 +1,132 @@
+import io
+import os
+import time
+import logging
+import cProfile
+import pstats
+from datetime import datetime
+from flask import Response, request
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+# Log dedicado às consultas lentas, para que possa ser direcionado separadamente
+slow_query_logger = logging.getLogger("slow_queries")
+
+# Parâmetro de consulta e cabeçalho que ativam o profiling de uma requisição
+PROFILE_PARAM = "profile"
+PROFILE_HEADER = "X-Profile"
+
+# Valor do parâmetro/cabeçalho que devolve as estatísticas no lugar da resposta
+PROFILE_TEXT = "text"
+
+# Cabeçalho com o caminho do arquivo de profile gravado
+PROFILE_FILE_HEADER = "X-Profile-File"
+
+# Quantidade de funções listadas nas estatísticas em texto
+PROFILE_STATS_LIMIT = 50
+
+# Tamanho máximo dos parâmetros exibidos no log de consultas lentas
+SLOW_QUERY_PARAMS_LIMIT = 500
+
+
+def _profile_filename():
+    """Nome do arquivo de profile da requisição atual (data, método e caminho)."""
+    path = request.path.strip("/").replace("/", "_") or "root"
+    return f"{datetime.now():%Y%m%d-%H%M%S-%f}-{request.method}-{path}.prof"
+
+
+def _format_stats(profiler):
+    """Estatísticas do profile em texto, ordenadas pelo tempo acumulado."""
+    buffer = io.StringIO()
+    stats = pstats.Stats(profiler, stream=buffer)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(PROFILE_STATS_LIMIT)
+    return buffer.getvalue()
+
+
+def install_profiler(app, profile_dir):
+    """
+    Habilita o profiling por requisição com cProfile.
+
+    O profiling é ativado pelo parâmetro de consulta `profile` ou pelo cabeçalho
+    `X-Profile`:
+    - `text`: a resposta é substituída pelas estatísticas em texto (pstats),
+      ordenadas pelo tempo acumulado.
+    - Qualquer outro valor: a resposta é mantida e o profile é gravado em
+      `profile_dir` no formato do pstats (ex.: `python -m pstats arquivo.prof`
+      ou snakeviz); o caminho do arquivo é informado no cabeçalho `X-Profile-File`.
+
+    O profile cobre o processamento da requisição até a criação da resposta;
+    o envio de respostas em streaming não é incluído.
+
+    Args:
+        app (Flask): Aplicação Flask.
+        profile_dir (str): Diretório onde os arquivos de profile são gravados.
+    """
+    @app.before_request
+    def _start_profile():
+        mode = request.args.get(PROFILE_PARAM) or request.headers.get(PROFILE_HEADER)
+        if not mode:
+            return
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError as e:
+            # Outro profiler já está ativo nesta thread
+            logger.warning(f"Profiling indisponível para {request.path}: {e}")
+            return
+        request.environ["profiling.state"] = (profiler, mode)
+
+    @app.after_request
+    def _stop_profile(response):
+        state = request.environ.pop("profiling.state", None)
+        if state is None:
+            return response
+
+        profiler, mode = state
+        profiler.disable()
+        if mode == PROFILE_TEXT:
+            return Response(_format_stats(profiler), content_type="text/plain; charset=utf-8")
+
+        os.makedirs(profile_dir, exist_ok=True)
+        path = os.path.join(profile_dir, _profile_filename())
+        profiler.dump_stats(path)
+        response.headers[PROFILE_FILE_HEADER] = path
+        logger.info(f"Profile de {request.method} {request.path} gravado em {path}")
+        return response
+
+
+def watch_slow_queries(engine, threshold_ms):
+    """
+    Registra no log `slow_queries` os comandos cuja execução excede o limite.
+
+    Args:
+        engine (Engine): Engine do banco de dados.
+        threshold_ms (float): Duração mínima, em milissegundos; 0 desabilita o log.
+    """
+    if threshold_ms <= 0:
+        return
+    threshold = threshold_ms / 1000
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context.slow_query_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "slow_query_started", None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        if elapsed < threshold:
+            return
+
+        params = repr(parameters)
+        if len(params) > SLOW_QUERY_PARAMS_LIMIT:
+            params = params[:SLOW_QUERY_PARAMS_LIMIT] + "..."
+        slow_query_logger.warning(
+            "Consulta lenta (%.1f ms%s): %s | parâmetros: %s",
+            elapsed * 1000, ", executemany" if executemany else "", " ".join(statement.split()), params,
+        )
@@ -0,0 +1,79 @@
+import time
+import logging
+import threading
+
+# Configuração de log
+logger = logging.getLogger(__name__)
+
+
+class Readiness:
+    """
+    Acompanha a fase de aquecimento (warm-up) da aplicação: ingestão do CSV,
+    construção do índice de intervalos e carga dos dados e modelos de IA.
+
+    Enquanto o aquecimento não termina, o processo está vivo (liveness), mas
+    ainda não pronto (readiness) para receber tráfego.
+
+    Atributos:
+        error (str | None): Erro da última execução do aquecimento.
+        elapsed (float | None): Duração, em segundos, da última execução do aquecimento.
+    """
+
+    def __init__(self):
+        self.error = None
+        self.elapsed = None
+        self._ready = threading.Event()
+
+    @property
+    def ready(self):
+        """Indica se o aquecimento foi concluído com sucesso."""
+        return self._ready.is_set()
+
+    def run(self, warm_up):
+        """
+        Executa o aquecimento no thread corrente.
+
+        Args:
+            warm_up (callable): Função que carrega os dados e modelos.
+
+        Returns:
+            bool: True se o aquecimento foi concluído com sucesso.
+        """
+        started = time.perf_counter()
+        try:
+            warm_up()
+            self.error = None
+            self._ready.set()
+        except Exception as e:
+            self.error = str(e)
+            logger.error(f"Erro no aquecimento da aplicação: {e}")
+        finally:
+            self.elapsed = time.perf_counter() - started
+        logger.info(f"Aquecimento concluído em {self.elapsed:.3f}s (pronto: {self.ready}).")
+        return self.ready
+
+    def start(self, warm_up):
+        """
+        Executa o aquecimento em segundo plano.
+
+        Args:
+            warm_up (callable): Função que carrega os dados e modelos.
+
+        Returns:
+            threading.Thread: Thread do aquecimento.
+        """
+        thread = threading.Thread(target=self.run, args=(warm_up,), name="warm-up", daemon=True)
+        thread.start()
+        return thread
+
+    def wait(self, timeout=None):
+        """Aguarda o fim do aquecimento; retorna True se a aplicação estiver pronta."""
+        return self._ready.wait(timeout)
+
+    def status(self):
+        """Retorna o estado do aquecimento para os endpoints de saúde."""
+        return {"ready": self.ready, "warmUpSeconds": self.elapsed, "error": self.error}
+
+
+# Estado compartilhado pela aplicação
+readiness = Readiness()
@@ -1,11 +1,21 @@
+import json
+import base64
 import logging
+from urllib.parse import urlencode
 from flask import request
 from flask_restx import Resource, Namespace, fields
-from services import calculate_awards
-from models import Base, Movie, populate_data
-from sqlalchemy import create_engine
+from services import awards_index, shared_awards
+from models import Base, Film, FilmProducer, Movie, Producer, migrate_schema, populate_data
+from dataset import dataset_tracker
+from database import create_db_engine, is_memory_database, is_read_only_database
+from metrics import watch_engine
+from profiling import watch_slow_queries
+from readiness import readiness
+from snapshot import read_info, read_intervals
+from cache import cached_response
+from streaming import requested_stream_format, stream_rows
+from sqlalchemy import or_, select, tuple_
 from sqlalchemy.orm import sessionmaker, scoped_session
-from sqlalchemy.pool import StaticPool
 
 # Configuração de log
 logging.basicConfig(level=logging.INFO)
@@ -14,67 +24,347 @@ logger = logging.getLogger(__name__)
 # Namespace
 api = Namespace("Rotas Default", description="Operações relacionadas ao processo principal")
 
+# Campos disponíveis na listagem de filmes
+MOVIE_FIELDS = ["title", "year", "studios", "producer", "winner"]
+
+# Quantidade máxima de intervalos por lista no endpoint /awards
+MAX_AWARDS_K = 1000
+
+# Cabeçalho das respostas calculadas com dados de uma versão anterior do dataset
+# (stale-while-revalidate), que não devem ser armazenadas em cache
+STALE_HEADERS = {"Cache-Control": "no-store"}
+
+# Paginação do endpoint /movies
+DEFAULT_MOVIES_LIMIT = 100
+MAX_MOVIES_LIMIT = 1000
+
+# Posição (year, film_id, producer_id) anterior a todos os registros, usada
+# como cursor da primeira página: com um limite inferior explícito, o SQLite
+# percorre o índice (year, id) de films em ordem também na primeira página
+FIRST_MOVIES_CURSOR = (-(2 ** 63), 0, 0)
+
 # Variáveis globais para o banco de dados
 engine = None
 Session = None
 
-def init_db(database_uri):
+# Mantém o índice de intervalos atualizado a cada alteração do dataset
+dataset_tracker.subscribe(awards_index.apply)
+
+def init_db(database_uri, slow_query_threshold_ms=0):
     """
     Inicializa o banco de dados:
+    - Cria o engine com o pool adequado ao banco (ver `database.create_db_engine`).
     - Cria as tabelas no banco, caso ainda não existam.
-    - Popula os dados do arquivo CSV no banco, evitando duplicação de registros.
+    - Cria os índices ausentes em bancos já existentes.
+    - Registra as métricas dos comandos executados no banco e o log de consultas lentas.
+
+    Bancos somente leitura (snapshots, ver `snapshot.py`) são usados como estão,
+    sem a criação de tabelas e índices.
+
+    A população dos dados e a construção do índice de intervalos ficam em
+    `load_data`, executada na fase de aquecimento da aplicação.
 
     Args:
         database_uri (str): URI do banco de dados.
+        slow_query_threshold_ms (float): Limite, em milissegundos, do log de consultas lentas (0 desabilita).
 
     Exibe mensagens de sucesso ou erro durante a inicialização.
     """
     global engine, Session
-    engine = create_engine(
-        database_uri,
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool  # Garante que o banco em memória seja compartilhado
-    )
+    engine = create_db_engine(database_uri)
     Session = scoped_session(sessionmaker(bind=engine))
+    dataset_tracker.watch(engine)
+    watch_engine(engine)
+    watch_slow_queries(engine, slow_query_threshold_ms)
+
+    if is_read_only_database(engine.url):
+        logger.info("Banco somente leitura: tabelas e índices do snapshot usados como estão.")
+        return
 
     # Criação das tabelas
     Base.metadata.create_all(bind=engine)
+    migrate_schema(engine)
     logger.info("Tabelas criadas com sucesso!")
 
-    # População dos dados
+
+def load_data():
+    """
+    Popula o banco com os registros novos do arquivo CSV e reconstrói o índice de intervalos.
+
+    Usada no aquecimento da aplicação e, no servidor de produção, antes da
+    recarga dos workers quando o arquivo CSV muda. Com um snapshot somente
+    leitura, apenas carrega os intervalos pré-computados no índice.
+    """
+    if is_read_only_database(engine.url):
+        load_snapshot()
+        return
+
     session = Session()
     try:
         populate_data(session)  # Chama a função para popular os dados
         logger.info("Dados populados com sucesso!")
     except Exception as e:
         logger.error(f"Erro ao popular dados: {e}")
+
+    # Construção do índice de intervalos
+    try:
+        awards_index.rebuild(session)
+        logger.info("Índice de intervalos construído com sucesso!")
+    except Exception as e:
+        logger.error(f"Erro ao construir índice de intervalos: {e}")
     finally:
         session.close()
 
 
+def load_snapshot():
+    """
+    Carrega no índice os intervalos pré-computados do snapshot somente leitura.
+
+    As conexões abertas são descartadas antes da leitura, de modo que um
+    snapshot substituído no disco (novo arquivo no mesmo caminho) seja reaberto.
+    """
+    engine.dispose()
+    session = Session()
+    try:
+        awards_index.load(read_intervals(session))
+        logger.info(f"Snapshot carregado: {read_info(session)}")
+    except Exception as e:
+        logger.error(f"Erro ao carregar o snapshot: {e}")
+    finally:
+        session.close()
+
+
+def after_fork():
+    """
+    Descarta, no processo filho, as conexões herdadas do processo pai.
+
+    Bancos em arquivo abrem novas conexões no filho; o banco em memória só
+    existe na conexão herdada, que é mantida (o processo pai não atende requisições).
+    """
+    if engine is not None and not is_memory_database(engine.url):
+        engine.dispose(close=False)
+
+
+def _encode_cursor(year, film_id, producer_id):
+    """Codifica a posição (year, film_id, producer_id) do último filme da página em um cursor opaco."""
+    return base64.urlsafe_b64encode(json.dumps([year, film_id, producer_id]).encode()).decode()
+
+
+def _decode_cursor(cursor):
+    """
+    Decodifica um cursor gerado por `_encode_cursor`.
+
+    Raises:
+        ValueError: Se o cursor for inválido.
+    """
+    try:
+        year, film_id, producer_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return int(year), int(film_id), int(producer_id)
+    except Exception as e:
+        raise ValueError(f"Cursor inválido: {cursor}") from e
+
+
+def int_arg(args, name, default=None):
+    """
+    Lê um parâmetro inteiro da requisição, sem descartar valores inválidos.
+
+    Args:
+        args (MultiDict): Parâmetros de consulta.
+        name (str): Nome do parâmetro.
+        default (int | None): Valor usado quando o parâmetro não é informado.
+
+    Returns:
+        int | None: Valor do parâmetro.
+
+    Raises:
+        ValueError: Se o valor não for um número inteiro.
+    """
+    value = args.get(name)
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"Parâmetro '{name}' deve ser um número inteiro.") from None
+
+
+def movies_query(args):
+    """
+    Monta a consulta da listagem de filmes a partir dos parâmetros da requisição.
+
+    Seleciona apenas as colunas necessárias, sem hidratar objetos do ORM,
+    diretamente das tabelas normalizadas, em ordem de (year, film_id,
+    producer_id) para a paginação por cursor: o SQLite percorre o índice
+    (year, id) de films e busca as associações de cada filme pelo índice
+    (film_id, producer_id), sem ordenar o catálogo a cada página.
+
+    Args:
+        args (MultiDict): Parâmetros de consulta (year, producer, title, fields, limit e cursor).
+
+    Returns:
+        tuple: Campos retornados, limite da página e consulta (Select).
+
+    Raises:
+        ValueError: Se algum parâmetro for inválido.
+    """
+    fields = args.get("fields", ",".join(MOVIE_FIELDS)).split(",")
+    if not fields or any(field not in MOVIE_FIELDS for field in fields):
+        raise ValueError(f"Campos inválidos. Campos disponíveis: {', '.join(MOVIE_FIELDS)}.")
+
+    limit = int_arg(args, "limit", DEFAULT_MOVIES_LIMIT)
+    if not 1 <= limit <= MAX_MOVIES_LIMIT:
+        raise ValueError(f"Parâmetro 'limit' deve estar entre 1 e {MAX_MOVIES_LIMIT}.")
+
+    films, film_producers, producers = Film.__table__, FilmProducer.__table__, Producer.__table__
+    columns = {
+        "film_id": films.c.id,
+        "producer_id": film_producers.c.producer_id,
+        "year": films.c.year,
+        "title": films.c.title,
+        "studios": films.c.studios,
+        "producer": producers.c.name,
+        "winner": films.c.winner,
+    }
+    selected = ["film_id", "producer_id", "year"] + [field for field in fields if field != "year"]
+    query = select(*(columns[name].label(name) for name in selected)).select_from(
+        films
+        .join(film_producers, film_producers.c.film_id == films.c.id)
+        .join(producers, producers.c.id == film_producers.c.producer_id)
+    )
+
+    if "year" in args:
+        query = query.where(films.c.year == int_arg(args, "year"))
+    if "producer" in args:
+        query = query.where(producers.c.name == args.get("producer"))
+    if "title" in args:
+        query = query.where(films.c.title == args.get("title"))
+
+    year, film_id, producer_id = FIRST_MOVIES_CURSOR
+    if "cursor" in args:
+        try:
+            year, film_id, producer_id = _decode_cursor(args.get("cursor"))
+        except ValueError:
+            raise ValueError("Parâmetro 'cursor' inválido.")
+    position = tuple_(films.c.year, films.c.id)
+    query = query.where(
+        position >= (year, film_id),
+        or_(position > (year, film_id), film_producers.c.producer_id > producer_id),
+    )
+
+    return fields, limit, query.order_by(films.c.year, films.c.id, film_producers.c.producer_id)
+
+
+def movies_page(rows, fields, limit, args, path):
+    """
+    Monta a página da listagem de filmes e os cabeçalhos da próxima página.
+
+    Args:
+        rows (list): Até `limit + 1` registros lidos com `movies_query`.
+        fields (list): Campos retornados.
+        limit (int): Limite da página.
+        args (MultiDict): Parâmetros de consulta da requisição.
+        path (str): Caminho da requisição.
+
+    Returns:
+        tuple: Lista de filmes e cabeçalhos (`X-Next-Cursor` e `Link`).
+    """
+    headers = {}
+    if len(rows) > limit:
+        rows = rows[:limit]
+        cursor = _encode_cursor(rows[-1]["year"], rows[-1]["film_id"], rows[-1]["producer_id"])
+        next_args = [(key, value) for key, value in args.items(multi=True) if key != "cursor"]
+        next_url = f"{path}?{urlencode(next_args + [('cursor', cursor)])}"
+        headers = {"X-Next-Cursor": cursor, "Link": f'<{next_url}>; rel="next"'}
+
+    return [{field: row[field] for field in fields} for row in rows], headers
+
+
+# Campos dos filmes no endpoint /producers/<producer>
+PRODUCER_MOVIE_FIELDS = ["title", "year", "studios", "winner"]
+
+
+def producer_movies_query(producer):
+    """Consulta dos filmes de um produtor, em ordem de (year, id)."""
+    table = Movie.__table__
+    query = select(*(table.c[field] for field in PRODUCER_MOVIE_FIELDS)).where(table.c.producer == producer)
+    return query.order_by(table.c.year, table.c.id)
+
+
+def winners_query(year):
+    """Consulta dos títulos vencedores de um ano."""
+    table = Movie.__table__
+    return select(table.c.title).where(table.c.year == year, table.c.winner == "yes").order_by(table.c.id)
+
+
 @api.route("/health")
 class HealthCheck(Resource):
     """Endpoint de verificação de saúde"""
 
     def get(self):
-        """Verifica se o serviço está operacional"""
-        return {"status": "healthy"}, 200
+        """
+        Verifica se o serviço está operacional (liveness).
+
+        Responde assim que o processo aceita requisições, sem depender do
+        aquecimento; o estado do aquecimento é informado no corpo da resposta.
+        """
+        return {"status": "healthy", **readiness.status()}, 200
+
+
+@api.route("/health/ready")
+class ReadinessCheck(Resource):
+    """Endpoint de verificação de prontidão"""
+
+    def get(self):
+        """Verifica se os dados e modelos já foram carregados (readiness)"""
+        status = readiness.status()
+        if not status["ready"]:
+            return {"status": "warming_up", **status}, 503
+        return {"status": "ready", **status}, 200
 
 
 @api.route("/awards")
 class Awards(Resource):
     """Endpoint para calcular e obter os intervalos entre prêmios consecutivos"""
 
+    @api.expect(api.parser().add_argument("k", type=int, help="Quantidade de menores e maiores intervalos")
+                               .add_argument("year_from", type=int, help="Ano inicial do período")
+                               .add_argument("year_to", type=int, help="Ano final do período")
+                               .add_argument("producer", type=str, help="Prefixo do nome do produtor"))
+    @cached_response
     def get(self):
-        """Calcula os intervalos mínimos e máximos entre prêmios consecutivos"""
+        """
+        Calcula os intervalos mínimos e máximos entre prêmios consecutivos.
+
+        Sem parâmetros, retorna os empates de menor e maior intervalo. Com `k`,
+        retorna os k menores e os k maiores intervalos; `year_from`/`year_to`
+        restringem aos intervalos contidos no período e `producer` aos produtores
+        cujo nome começa com o prefixo informado. As consultas com parâmetros
+        são atendidas pelo índice ordenado de intervalos.
+
+        Sem parâmetros, requisições concorrentes compartilham um único cálculo
+        por versão do dataset; durante o recálculo após uma alteração, recebem
+        o resultado anterior com `Cache-Control: no-store`.
+        """
         session = Session()
         try:
-            movie_count = session.query(Movie).count()
-            if movie_count == 0:
-                return {"min": [], "max": []}, 200
-
-            awards = calculate_awards(session)
-            return awards, 200
+            args = request.args
+            try:
+                k = int_arg(args, "k")
+                year_from = int_arg(args, "year_from")
+                year_to = int_arg(args, "year_to")
+            except ValueError as e:
+                return {"error": str(e)}, 400
+            producer = args.get("producer")
+
+            if k is not None and not 1 <= k <= MAX_AWARDS_K:
+                return {"error": f"Parâmetro 'k' deve estar entre 1 e {MAX_AWARDS_K}."}, 400
+            if year_from is not None and year_to is not None and year_from > year_to:
+                return {"error": "Parâmetro 'year_from' deve ser menor ou igual a 'year_to'."}, 400
+
+            if k is None and year_from is None and year_to is None and producer is None:
+                awards, fresh = shared_awards(session)
+                return awards, 200, ({} if fresh else STALE_HEADERS)
+            return awards_index.query(session, k=k, year_from=year_from, year_to=year_to, producer=producer), 200
         except Exception as e:
             return {"error": str(e)}, 500
         finally:
@@ -85,21 +375,12 @@ class Awards(Resource):
 class Details(Resource):
     """Endpoint para obter os intervalos entre prêmios consecutivos, com HATEOAS"""
 
+    @cached_response
     def get(self):
         """Retorna os intervalos entre prêmios consecutivos, com suporte a HATEOAS"""
         session = Session()
         try:
-            movie_count = session.query(Movie).count()
-            if movie_count == 0:
-                return {
-                    "min": [],
-                    "max": [],
-                    "_links": {
-                        "all_movies": {"href": "/movies", "method": "GET"}
-                    }
-                }, 200
-
-            awards = calculate_awards(session)
+            awards, fresh = shared_awards(session)
 
             # Adiciona HATEOAS
             for award_type in ["min", "max"]:
@@ -113,7 +394,7 @@ class Details(Resource):
                     }
 
             awards["_links"] = {"all_movies": {"href": "/movies", "method": "GET"}}
-            return awards, 200
+            return awards, 200, ({} if fresh else STALE_HEADERS)
         except Exception as e:
             return {"error": str(e)}, 500
         finally:
@@ -126,32 +407,35 @@ class MovieList(Resource):
 
     @api.expect(api.parser().add_argument("year", type=int, help="Filtrar por ano")
                                .add_argument("producer", type=str, help="Filtrar por produtor")
-                               .add_argument("title", type=str, help="Filtrar por título"))
+                               .add_argument("title", type=str, help="Filtrar por título")
+                               .add_argument("fields", type=str, help="Campos retornados, separados por vírgula")
+                               .add_argument("limit", type=int, help="Quantidade máxima de filmes por página")
+                               .add_argument("cursor", type=str, help="Cursor da próxima página"))
+    @cached_response
     def get(self):
-        """Lista filmes com filtros opcionais"""
+        """
+        Lista filmes com filtros opcionais.
+
+        A listagem é paginada por cursor (keyset) sobre (year, film_id,
+        producer_id): o cursor da próxima página é retornado nos cabeçalhos
+        `X-Next-Cursor` e `Link`.
+        Com `Accept: application/x-ndjson` ou `Accept: text/csv`, todos os
+        filmes a partir do cursor são exportados em streaming, sem o limite.
+        """
         session = Session()
         try:
-            args = request.args
-            query = session.query(Movie)
-
-            if "year" in args:
-                query = query.filter_by(year=int(args.get("year")))
-            if "producer" in args:
-                query = query.filter_by(producer=args.get("producer"))
-            if "title" in args:
-                query = query.filter_by(title=args.get("title"))
-
-            movies = query.all()
-            return [
-                {
-                    "title": movie.title,
-                    "year": movie.year,
-                    "studios": movie.studios,
-                    "producer": movie.producer,
-                    "winner": movie.winner,
-                }
-                for movie in movies
-            ], 200
+            try:
+                fields, limit, query = movies_query(request.args)
+            except ValueError as e:
+                return {"error": str(e)}, 400
+
+            stream_format = requested_stream_format()
+            if stream_format:
+                return stream_rows(engine, query, fields, stream_format)
+
+            rows = session.execute(query.limit(limit + 1)).mappings().all()
+            movies, headers = movies_page(rows, fields, limit, request.args, request.path)
+            return movies, 200, headers
         except Exception as e:
             return {"error": str(e)}, 500
         finally:
@@ -162,26 +446,29 @@ class MovieList(Resource):
 class ProducerDetails(Resource):
     """Endpoint para retornar informações detalhadas sobre um produtor"""
 
+    @cached_response
     def get(self, producer):
-        """Retorna detalhes dos filmes de um produtor"""
+        """
+        Retorna detalhes dos filmes de um produtor.
+
+        Com `Accept: application/x-ndjson` ou `Accept: text/csv`, os filmes são
+        exportados em streaming.
+        """
         session = Session()
         try:
-            movies = session.query(Movie).filter_by(producer=producer).all()
+            query = producer_movies_query(producer)
+            stream_format = requested_stream_format()
+            if stream_format:
+                exists = session.query(Movie.id).filter_by(producer=producer).first()
+                if not exists:
+                    return {"error": f"Produtor '{producer}' não encontrado."}, 404
+                return stream_rows(engine, query, PRODUCER_MOVIE_FIELDS, stream_format)
+
+            movies = session.execute(query).mappings().all()
             if not movies:
                 return {"error": f"Produtor '{producer}' não encontrado."}, 404
 
-            return {
-                "producer": producer,
-                "movies": [
-                    {
-                        "title": movie.title,
-                        "year": movie.year,
-                        "studios": movie.studios,
-                        "winner": movie.winner,
-                    }
-                    for movie in movies
-                ],
-            }, 200
+            return {"producer": producer, "movies": [dict(movie) for movie in movies]}, 200
         except Exception as e:
             return {"error": str(e)}, 500
         finally:
@@ -197,6 +484,7 @@ class Winners(Resource):
     })
 
     @api.expect(winners_request)
+    @cached_response
     def post(self):
         """
         Retorna os filmes vencedores de um determinado ano.
@@ -211,15 +499,12 @@ class Winners(Resource):
 
         session = Session()
         try:
-            winners = session.query(Movie).filter_by(year=year, winner="yes").all()
+            winners = session.execute(winners_query(year)).scalars().all()
 
             if not winners:
                 return {"message": f"Não há vencedores registrados para o ano {year}."}, 404
 
-            return {
-                "year": year,
-                "winners": [movie.title for movie in winners]
-            }, 200
+            return {"year": year, "winners": winners}, 200
         except Exception as e:
             return {"error": str(e)}, 500
         finally:
@@ -1,5 +1,35 @@
-from sqlalchemy.sql import text
-from collections import defaultdict
+import heapq
+import threading
+from bisect import bisect_left, bisect_right, insort
+from itertools import chain, groupby
+from operator import itemgetter
+from sqlalchemy.sql import bindparam, text
+from dataset import dataset_tracker
+
+# Consulta dos produtores vencedores e seus anos de vitória, agrupados pela
+# chave inteira do produtor: as vitórias de cada produtor chegam contíguas
+WINNERS_QUERY = text(
+    """
+    SELECT fp.producer_id AS producer_id, p.name AS producer, f.year AS year
+    FROM films f
+    JOIN film_producers fp ON fp.film_id = f.id
+    JOIN producers p ON p.id = fp.producer_id
+    WHERE f.winner = 'yes'
+    ORDER BY fp.producer_id, f.year
+    """
+)
+
+
+def _years_by_producer(result):
+    """
+    Agrupa os anos de vitória por produtor a partir do resultado de `WINNERS_QUERY`.
+
+    Como as linhas chegam ordenadas pelo id do produtor, o agrupamento é feito
+    em uma única passada sobre blocos contíguos do mesmo id, sem dicionário por nome.
+    """
+    for _, rows in groupby(result.mappings(), key=itemgetter("producer_id")):
+        rows = list(rows)
+        yield rows[0]["producer"], [row["year"] for row in rows]
 
 
 def calculate_awards(session):
@@ -46,25 +76,11 @@ def calculate_awards(session):
         >>> print(result)
     """
     # Consulta para obter os produtores vencedores e os anos de vitória
-    query = session.execute(
-        text(
-            """
-            SELECT producer, year 
-            FROM movies 
-            WHERE winner = 'yes'
-            ORDER BY producer, year
-            """
-        )
-    )
-
-    # Agrupa os anos de vitória por produtor
-    producer_awards = defaultdict(list)
-    for row in query.mappings():
-        producer_awards[row["producer"]].append(row["year"])
+    query = session.execute(WINNERS_QUERY)
 
     # Calcula os intervalos entre prêmios consecutivos para cada produtor
     intervals = []
-    for producer, years in producer_awards.items():
+    for producer, years in _years_by_producer(query):
         for prev, curr in zip(years, years[1:]):
             intervals.append(
                 {
@@ -80,11 +96,584 @@ def calculate_awards(session):
         min_interval_value = min(interval["interval"] for interval in intervals)
         max_interval_value = max(interval["interval"] for interval in intervals)
 
-        min_intervals = [i for i in intervals if i["interval"] == min_interval_value]
-        max_intervals = [i for i in intervals if i["interval"] == max_interval_value]
+        # Empates ordenados por produtor e ano, independentemente da ordem dos ids
+        order = itemgetter("producer", "previousWin")
+        min_intervals = sorted((i for i in intervals if i["interval"] == min_interval_value), key=order)
+        max_intervals = sorted((i for i in intervals if i["interval"] == max_interval_value), key=order)
     else:
         min_intervals = []
         max_intervals = []
 
     # Retorna os resultados formatados
     return {"min": min_intervals, "max": max_intervals}
+
+
+# Cálculo dos intervalos no banco: LAG obtém a vitória anterior de cada
+# produtor e os empates de menor e maior intervalo são selecionados na própria consulta
+INTERVALS_SQL_QUERY = text(
+    """
+    WITH wins AS (
+        SELECT fp.producer_id AS producer_id, f.year AS year
+        FROM films f
+        JOIN film_producers fp ON fp.film_id = f.id
+        WHERE f.winner = 'yes'
+    ),
+    consecutive AS (
+        SELECT producer_id,
+               LAG(year) OVER (PARTITION BY producer_id ORDER BY year) AS previous_win,
+               year AS following_win
+        FROM wins
+    ),
+    intervals AS (
+        SELECT producer_id, following_win - previous_win AS interval, previous_win, following_win
+        FROM consecutive
+        WHERE previous_win IS NOT NULL
+    ),
+    bounds AS (
+        SELECT MIN(interval) AS min_interval, MAX(interval) AS max_interval
+        FROM intervals
+    )
+    SELECT 'min' AS kind, p.name AS producer, i.interval, i.previous_win, i.following_win
+    FROM intervals i
+    JOIN bounds b ON i.interval = b.min_interval
+    JOIN producers p ON p.id = i.producer_id
+    UNION ALL
+    SELECT 'max' AS kind, p.name AS producer, i.interval, i.previous_win, i.following_win
+    FROM intervals i
+    JOIN bounds b ON i.interval = b.max_interval
+    JOIN producers p ON p.id = i.producer_id
+    ORDER BY kind, producer, previous_win
+    """
+)
+
+
+def calculate_awards_sql(session):
+    """
+    Calcula os intervalos mínimos e máximos entre prêmios consecutivos no banco de dados.
+
+    Equivalente a `calculate_awards`, mas com o cálculo dos intervalos feito por
+    funções de janela (LAG) e a seleção dos empates feita na consulta, de modo
+    que apenas os empates são transferidos para o Python.
+
+    Parâmetros:
+        session (Session): Sessão ativa do banco de dados.
+
+    Retorna:
+        dict: Um dicionário contendo os intervalos mínimos e máximos entre prêmios,
+        no mesmo formato de `calculate_awards`.
+    """
+    result = {"min": [], "max": []}
+    for row in session.execute(INTERVALS_SQL_QUERY).mappings():
+        result[row["kind"]].append(
+            {
+                "producer": row["producer"],
+                "interval": row["interval"],
+                "previousWin": row["previous_win"],
+                "followingWin": row["following_win"],
+            }
+        )
+    return result
+
+
+# Pares (id do produtor, ano) dos vencedores, sem ordenação: a ordenação é feita com NumPy
+WINNER_IDS_QUERY = text(
+    """
+    SELECT fp.producer_id AS producer_id, f.year AS year
+    FROM films f
+    JOIN film_producers fp ON fp.film_id = f.id
+    WHERE f.winner = 'yes'
+    """
+)
+
+# Nomes dos produtores presentes nos empates
+PRODUCER_NAMES_QUERY = text("SELECT id, name FROM producers WHERE id IN :ids").bindparams(
+    bindparam("ids", expanding=True)
+)
+
+
+def calculate_awards_numpy(session):
+    """
+    Calcula os intervalos mínimos e máximos entre prêmios consecutivos com NumPy.
+
+    Equivalente a `calculate_awards`: os ids dos produtores e os anos são
+    carregados em arrays, ordenados uma única vez com `lexsort` e os intervalos
+    obtidos com `diff`, descartando as diferenças entre produtores distintos.
+    Dicionários são criados apenas para os empates de menor e maior intervalo.
+
+    Parâmetros:
+        session (Session): Sessão ativa do banco de dados.
+
+    Retorna:
+        dict: Um dicionário contendo os intervalos mínimos e máximos entre prêmios,
+        no mesmo formato de `calculate_awards`.
+    """
+    import numpy as np
+
+    # Leitura direta do resultado em um array plano, sem objetos intermediários por linha
+    result = session.execute(WINNER_IDS_QUERY)
+    winners = np.fromiter(chain.from_iterable(result), dtype=np.int64).reshape(-1, 2)
+    if not len(winners):
+        return {"min": [], "max": []}
+
+    order = np.lexsort((winners[:, 1], winners[:, 0]))
+    producer_ids = winners[order, 0]
+    years = winners[order, 1]
+
+    # Intervalos apenas entre vitórias consecutivas do mesmo produtor
+    same_producer = producer_ids[1:] == producer_ids[:-1]
+    intervals = np.diff(years)[same_producer]
+    if intervals.size == 0:
+        return {"min": [], "max": []}
+
+    owners = producer_ids[1:][same_producer]
+    previous_wins = years[:-1][same_producer]
+    following_wins = years[1:][same_producer]
+    ties = {
+        "min": np.flatnonzero(intervals == intervals.min()),
+        "max": np.flatnonzero(intervals == intervals.max()),
+    }
+
+    tie_owners = np.unique(np.concatenate(list(ties.values())))
+    names = dict(session.execute(PRODUCER_NAMES_QUERY, {"ids": owners[tie_owners].tolist()}).all())
+
+    # Empates ordenados por produtor e ano, como em `calculate_awards`
+    order = itemgetter("producer", "previousWin")
+    return {
+        kind: sorted(
+            (
+                {
+                    "producer": names[owner],
+                    "interval": interval,
+                    "previousWin": previous_win,
+                    "followingWin": following_win,
+                }
+                for owner, interval, previous_win, following_win in zip(
+                    owners[positions].tolist(),
+                    intervals[positions].tolist(),
+                    previous_wins[positions].tolist(),
+                    following_wins[positions].tolist(),
+                )
+            ),
+            key=order,
+        )
+        for kind, positions in ties.items()
+    }
+
+
+def _as_dict(interval):
+    """Converte uma tupla (intervalo, produtor, anterior, seguinte) no formato de resposta."""
+    value, producer, previous_win, following_win = interval
+    return {
+        "producer": producer,
+        "interval": value,
+        "previousWin": previous_win,
+        "followingWin": following_win,
+    }
+
+
+def _longest_first(interval):
+    """Chave de ordenação dos maiores intervalos: decrescente no valor, crescente no produtor e ano."""
+    value, producer, prev, curr = interval
+    return -value, producer, prev, curr
+
+
+def _tie_sets(intervals):
+    """Seleciona, de uma lista de intervalos, os empates de menor e maior valor."""
+    if not intervals:
+        return {"min": [], "max": []}
+    min_value = min(interval[0] for interval in intervals)
+    max_value = max(interval[0] for interval in intervals)
+    return {
+        "min": [_as_dict(interval) for interval in sorted(i for i in intervals if i[0] == min_value)],
+        "max": [_as_dict(interval) for interval in sorted(i for i in intervals if i[0] == max_value)],
+    }
+
+
+class AwardsIndex:
+    """
+    Índice pré-computado dos intervalos entre prêmios consecutivos.
+
+    Mantém, para cada produtor, a lista ordenada dos anos de vitória e um
+    multiconjunto ordenado com todos os intervalos na forma
+    (intervalo, produtor, anterior, seguinte). Os menores e maiores intervalos
+    ficam nas extremidades da lista, de modo que a leitura não depende do
+    tamanho da tabela.
+
+    Para as consultas filtradas, mantém também os intervalos ordenados pelo
+    ano da vitória anterior (filtro por período) e a lista ordenada dos nomes
+    dos produtores (filtro por prefixo), ambas consultadas por busca binária.
+
+    O índice é construído em `init_db` e atualizado incrementalmente a cada
+    inserção de filmes vencedores; alterações que não podem ser aplicadas de
+    forma incremental marcam o índice como desatualizado e ele é reconstruído
+    na próxima leitura.
+    """
+
+    def __init__(self):
+        self._years = {}
+        self._producers = []
+        self._intervals = []
+        self._by_start = []
+        self._result = None
+        self._stale = True
+        self._lock = threading.RLock()
+
+    def rebuild(self, session):
+        """
+        Reconstrói o índice a partir dos vencedores registrados no banco.
+
+        Args:
+            session (Session): Sessão ativa do banco de dados.
+        """
+        years_by_producer = dict(_years_by_producer(session.execute(WINNERS_QUERY)))
+
+        intervals = []
+        for producer, years in years_by_producer.items():
+            for prev, curr in zip(years, years[1:]):
+                intervals.append((curr - prev, producer, prev, curr))
+        intervals.sort()
+
+        with self._lock:
+            self._years = years_by_producer
+            self._producers = sorted(years_by_producer)
+            self._intervals = intervals
+            self._by_start = sorted((prev, curr, producer) for _, producer, prev, curr in intervals)
+            self._result = None
+            self._stale = False
+
+    def load(self, intervals):
+        """
+        Carrega o índice a partir de intervalos pré-computados (ex.: snapshot somente leitura).
+
+        Os anos de vitória de cada produtor são derivados dos intervalos;
+        produtores com uma única vitória não fazem parte do índice carregado.
+
+        Args:
+            intervals (iterable): Tuplas (intervalo, produtor, anterior, seguinte).
+        """
+        intervals = sorted(tuple(interval) for interval in intervals)
+        years_by_producer = {}
+        for _, producer, prev, curr in intervals:
+            years_by_producer.setdefault(producer, set()).update((prev, curr))
+
+        with self._lock:
+            self._years = {producer: sorted(years) for producer, years in years_by_producer.items()}
+            self._producers = sorted(years_by_producer)
+            self._intervals = intervals
+            self._by_start = sorted((prev, curr, producer) for _, producer, prev, curr in intervals)
+            self._result = None
+            self._stale = False
+
+    def intervals(self, session):
+        """
+        Retorna todos os intervalos do índice, reconstruindo-o se necessário.
+
+        Args:
+            session (Session): Sessão usada apenas se o índice precisar ser reconstruído.
+
+        Returns:
+            list: Tuplas (intervalo, produtor, anterior, seguinte), em ordem crescente.
+        """
+        with self._lock:
+            if self._stale:
+                self.rebuild(session)
+            return list(self._intervals)
+
+    def add(self, producer, year):
+        """
+        Adiciona uma vitória ao índice, ajustando apenas os intervalos vizinhos.
+
+        Args:
+            producer (str): Nome do produtor.
+            year (int): Ano da vitória.
+        """
+        with self._lock:
+            if producer not in self._years:
+                insort(self._producers, producer)
+            years = self._years.setdefault(producer, [])
+            position = bisect_right(years, year)
+            prev = years[position - 1] if position > 0 else None
+            following = years[position] if position < len(years) else None
+
+            if prev is not None and following is not None:
+                self._discard((following - prev, producer, prev, following))
+            if prev is not None:
+                self._insert((year - prev, producer, prev, year))
+            if following is not None:
+                self._insert((following - year, producer, year, following))
+
+            years.insert(position, year)
+            self._result = None
+
+    def _insert(self, interval):
+        """Insere o intervalo nas duas ordenações mantidas pelo índice."""
+        _, producer, prev, curr = interval
+        insort(self._intervals, interval)
+        insort(self._by_start, (prev, curr, producer))
+
+    def _discard(self, interval):
+        """Remove uma ocorrência do intervalo das duas ordenações mantidas pelo índice."""
+        _, producer, prev, curr = interval
+        for items, item in ((self._intervals, interval), (self._by_start, (prev, curr, producer))):
+            position = bisect_left(items, item)
+            if position < len(items) and items[position] == item:
+                del items[position]
+
+    def invalidate(self):
+        """Marca o índice como desatualizado, forçando a reconstrução na próxima leitura."""
+        with self._lock:
+            self._stale = True
+            self._result = None
+
+    def apply(self, rows):
+        """
+        Aplica as alterações confirmadas no dataset.
+
+        Args:
+            rows (list | None): Linhas inseridas ou None quando o índice deve ser reconstruído.
+        """
+        with self._lock:
+            if rows is None or self._stale:
+                self.invalidate()
+                return
+            for row in rows:
+                if row.get("winner") == "yes":
+                    self.add(row["producer"], int(row["year"]))
+
+    def snapshot(self, session):
+        """
+        Retorna os intervalos mínimos e máximos no mesmo formato de `calculate_awards`.
+
+        Args:
+            session (Session): Sessão usada apenas se o índice precisar ser reconstruído.
+
+        Returns:
+            dict: Um dicionário contendo os intervalos mínimos e máximos entre prêmios.
+        """
+        with self._lock:
+            if self._stale:
+                self.rebuild(session)
+            if self._result is None:
+                self._result = self._compute_result()
+            result = self._result
+
+        # Cópias para que o chamador possa enriquecer os itens (ex.: HATEOAS)
+        return {key: [dict(item) for item in items] for key, items in result.items()}
+
+    def query(self, session, k=None, year_from=None, year_to=None, producer=None):
+        """
+        Retorna os intervalos mínimos e máximos com filtros e/ou limitados aos k primeiros.
+
+        Sem `k`, retorna os empates de menor e maior intervalo, como `snapshot`;
+        com `k`, retorna os k menores (em ordem crescente) e os k maiores (em
+        ordem decrescente). Os filtros consideram apenas intervalos contidos no
+        período [year_from, year_to] e produtores cujo nome começa com `producer`.
+
+        Args:
+            session (Session): Sessão usada apenas se o índice precisar ser reconstruído.
+            k (int | None): Quantidade de intervalos em cada lista.
+            year_from (int | None): Ano mínimo da vitória anterior.
+            year_to (int | None): Ano máximo da vitória seguinte.
+            producer (str | None): Prefixo do nome do produtor.
+
+        Returns:
+            dict: Um dicionário contendo os intervalos mínimos e máximos entre prêmios.
+        """
+        with self._lock:
+            if self._stale:
+                self.rebuild(session)
+
+            if producer is None and year_from is None and year_to is None:
+                if k is None:
+                    return self.snapshot(session)
+                # Sem filtros, os candidatos estão nas extremidades do multiconjunto
+                min_candidates, max_candidates = self._extremes(k)
+            else:
+                min_candidates = max_candidates = self._candidates(year_from, year_to, producer)
+
+        if k is None:
+            return _tie_sets(min_candidates)
+        return {
+            "min": [_as_dict(interval) for interval in heapq.nsmallest(k, min_candidates)],
+            "max": [_as_dict(interval) for interval in heapq.nsmallest(k, max_candidates, key=_longest_first)],
+        }
+
+    def _extremes(self, k):
+        """Retorna os k menores e k maiores intervalos, incluindo os empates com o k-ésimo valor."""
+        if not self._intervals:
+            return [], []
+        k = min(k, len(self._intervals))
+        min_end = bisect_left(self._intervals, (self._intervals[k - 1][0] + 1,))
+        max_start = bisect_left(self._intervals, (self._intervals[-k][0],))
+        return self._intervals[:min_end], self._intervals[max_start:]
+
+    def _candidates(self, year_from, year_to, producer):
+        """Seleciona, por busca binária, os intervalos que atendem aos filtros."""
+        first = float("-inf") if year_from is None else year_from
+        last = float("inf") if year_to is None else year_to
+
+        if producer is not None:
+            # Produtores com o prefixo formam um bloco contíguo na lista ordenada de nomes
+            start = bisect_left(self._producers, producer)
+            end = bisect_left(self._producers, producer + chr(0x10FFFF))
+            return [
+                (curr - prev, name, prev, curr)
+                for name in self._producers[start:end]
+                for prev, curr in zip(self._years[name], self._years[name][1:])
+                if prev >= first and curr <= last
+            ]
+
+        start = 0 if year_from is None else bisect_left(self._by_start, (year_from,))
+        end = len(self._by_start) if year_to is None else bisect_left(self._by_start, (year_to + 1,))
+        return [
+            (curr - prev, name, prev, curr)
+            for prev, curr, name in self._by_start[start:end]
+            if curr <= last
+        ]
+
+    def _compute_result(self):
+        """Extrai os empates de menor e maior intervalo das extremidades do multiconjunto."""
+        if not self._intervals:
+            return {"min": [], "max": []}
+
+        min_value = self._intervals[0][0]
+        max_value = self._intervals[-1][0]
+        min_end = bisect_left(self._intervals, (min_value + 1,))
+        max_start = bisect_left(self._intervals, (max_value,))
+        return {
+            "min": [_as_dict(interval) for interval in self._intervals[:min_end]],
+            "max": [_as_dict(interval) for interval in self._intervals[max_start:]],
+        }
+
+
+# Índice compartilhado pela aplicação
+awards_index = AwardsIndex()
+
+
+class SingleFlight:
+    """
+    Coalesce as computações concorrentes de um resultado por versão do dataset.
+
+    Apenas uma computação por versão é executada por vez; as chamadas
+    concorrentes para a mesma versão aguardam o seu resultado. Quando já existe
+    um resultado de uma versão anterior, ele é retornado (marcado como
+    desatualizado) às chamadas concorrentes enquanto a primeira chamada da nova
+    versão o recalcula (stale-while-revalidate).
+    """
+
+    def __init__(self):
+        self._version = None
+        self._value = None
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def run(self, version, compute):
+        """
+        Retorna o resultado da versão informada, computando-o no máximo uma vez por versão.
+
+        Args:
+            version (int): Versão do dataset.
+            compute (callable): Função sem argumentos que calcula o resultado.
+
+        Returns:
+            tuple: Resultado e indicador de que ele corresponde à versão informada
+                (False quando é o resultado desatualizado de uma versão anterior).
+        """
+        with self._lock:
+            if self._version == version:
+                return self._value, True
+            flight = self._flights.get(version)
+            if flight is not None and self._version is not None:
+                return self._value, False
+            leader = flight is None
+            if leader:
+                flight = self._flights[version] = {"done": threading.Event(), "value": None, "error": None}
+
+        if not leader:
+            flight["done"].wait()
+            if flight["error"] is not None:
+                raise flight["error"]
+            return flight["value"], True
+
+        try:
+            flight["value"] = compute()
+        except Exception as e:
+            flight["error"] = e
+            raise
+        else:
+            with self._lock:
+                if self._version is None or version > self._version:
+                    self._version, self._value = version, flight["value"]
+        finally:
+            with self._lock:
+                del self._flights[version]
+            flight["done"].set()
+        return flight["value"], True
+
+    def clear(self):
+        """Descarta o resultado armazenado."""
+        with self._lock:
+            self._version = None
+            self._value = None
+
+
+# Computação compartilhada dos intervalos de `compute_awards`
+awards_flight = SingleFlight()
+
+
+# Motores disponíveis para o cálculo dos intervalos nos endpoints
+AWARDS_ENGINES = {
+    "index": awards_index.snapshot,
+    "python": calculate_awards,
+    "sql": calculate_awards_sql,
+    "numpy": calculate_awards_numpy,
+}
+
+# Motor em uso, definido pela configuração AWARDS_ENGINE
+awards_engine = "index"
+
+
+def set_awards_engine(name):
+    """
+    Define o motor usado por `compute_awards`.
+
+    Args:
+        name (str): Um dos nomes de `AWARDS_ENGINES`.
+
+    Raises:
+        ValueError: Se o motor não existir.
+    """
+    global awards_engine
+    if name not in AWARDS_ENGINES:
+        raise ValueError(f"Motor de cálculo inválido: {name}. Motores disponíveis: {', '.join(AWARDS_ENGINES)}.")
+    awards_engine = name
+    awards_flight.clear()
+
+
+def compute_awards(session):
+    """
+    Calcula os intervalos mínimos e máximos com o motor configurado.
+
+    Args:
+        session (Session): Sessão ativa do banco de dados.
+
+    Returns:
+        dict: Um dicionário contendo os intervalos mínimos e máximos entre prêmios.
+    """
+    return AWARDS_ENGINES[awards_engine](session)
+
+
+def shared_awards(session):
+    """
+    Calcula os intervalos mínimos e máximos com `compute_awards`, coalescendo as
+    chamadas concorrentes por versão do dataset (ver `SingleFlight`).
+
+    Args:
+        session (Session): Sessão ativa do banco de dados.
+
+    Returns:
+        tuple: Cópia do resultado (que o chamador pode enriquecer) e indicador de
+            que ele corresponde à versão atual do dataset.
+    """
+    awards, fresh = awards_flight.run(dataset_tracker.version, lambda: compute_awards(session))
+    return {key: [dict(item) for item in items] for key, items in awards.items()}, fresh
@@ -0,0 +1,142 @@
+"""
+Snapshot somente leitura do banco de dados para os nós de serviço.
+
+O snapshot é um arquivo SQLite pré-construído com as tabelas normalizadas, a
+view `movies` e os intervalos entre prêmios pré-computados. Com `SNAPSHOT_PATH`
+definido, a aplicação abre o arquivo com `mode=ro&immutable=1`, sem criar
+tabelas nem executar a ingestão do CSV: o aquecimento apenas carrega os
+intervalos no índice em memória. Como o arquivo nunca muda, o SQLite dispensa
+os bloqueios e os workers compartilham as mesmas páginas do arquivo no cache
+do sistema operacional (mmap).
+
+Construção (lê o CSV de `CSV_PATH`):
+    python snapshot.py data/snapshot.db
+"""
+import os
+import sys
+import logging
+from datetime import datetime, timezone
+from sqlalchemy import Column, Integer, MetaData, String, Table, create_engine, func, insert, select
+from sqlalchemy.orm import Session
+from models import Base, Movie, migrate_schema, populate_data
+from services import AwardsIndex
+
+logger = logging.getLogger(__name__)
+
+# Tabelas exclusivas do snapshot
+snapshot_metadata = MetaData()
+
+award_intervals = Table(
+    "award_intervals",
+    snapshot_metadata,
+    Column("interval", Integer, nullable=False),
+    Column("producer", String, nullable=False),
+    Column("previous_win", Integer, nullable=False),
+    Column("following_win", Integer, nullable=False),
+)
+
+snapshot_info = Table(
+    "snapshot_info",
+    snapshot_metadata,
+    Column("key", String, primary_key=True),
+    Column("value", String, nullable=False),
+)
+
+
+def snapshot_uri(path):
+    """
+    URI de acesso somente leitura e imutável ao snapshot.
+
+    Args:
+        path (str): Caminho do arquivo do snapshot.
+
+    Returns:
+        str: URI do SQLAlchemy.
+    """
+    return f"sqlite:///file:{os.path.abspath(path)}?mode=ro&immutable=1&uri=true"
+
+
+def build_snapshot(path):
+    """
+    Constrói o snapshot a partir do CSV de `CSV_PATH`.
+
+    O arquivo é gerado ao lado do destino e renomeado ao final, de modo que
+    leitores nunca abrem um snapshot incompleto e conexões já abertas
+    continuam lendo o arquivo anterior.
+
+    Args:
+        path (str): Caminho do arquivo do snapshot.
+
+    Returns:
+        dict: Informações do snapshot gravadas na tabela `snapshot_info`.
+    """
+    temporary_path = f"{path}.tmp"
+    if os.path.exists(temporary_path):
+        os.remove(temporary_path)
+
+    engine = create_engine(f"sqlite:///{temporary_path}")
+    try:
+        Base.metadata.create_all(bind=engine)
+        migrate_schema(engine)
+        snapshot_metadata.create_all(bind=engine)
+
+        with Session(bind=engine) as session:
+            populate_data(session)
+            intervals = AwardsIndex().intervals(session)
+            info = {
+                "built_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "movies": str(session.scalar(select(func.count()).select_from(Movie))),
+                "intervals": str(len(intervals)),
+            }
+            session.execute(insert(award_intervals), [
+                {"interval": interval, "producer": producer, "previous_win": prev, "following_win": curr}
+                for interval, producer, prev, curr in intervals
+            ])
+            session.execute(insert(snapshot_info), [{"key": key, "value": value} for key, value in info.items()])
+            session.commit()
+
+        # Estatísticas para o planejador e arquivo compactado, sem journal pendente
+        with engine.connect() as connection:
+            connection.exec_driver_sql("ANALYZE")
+            connection.commit()
+            connection.execution_options(isolation_level="AUTOCOMMIT").exec_driver_sql("VACUUM")
+    finally:
+        engine.dispose()
+
+    os.replace(temporary_path, path)
+    logger.info(f"Snapshot gravado em {path}: {info}")
+    return info
+
+
+def read_intervals(session):
+    """
+    Lê os intervalos pré-computados do snapshot.
+
+    Args:
+        session (Session): Sessão ativa do banco do snapshot.
+
+    Returns:
+        list: Tuplas (intervalo, produtor, anterior, seguinte).
+    """
+    columns = [award_intervals.c.interval, award_intervals.c.producer,
+               award_intervals.c.previous_win, award_intervals.c.following_win]
+    return [tuple(row) for row in session.execute(select(*columns))]
+
+
+def read_info(session):
+    """
+    Lê as informações de construção do snapshot.
+
+    Args:
+        session (Session): Sessão ativa do banco do snapshot.
+
+    Returns:
+        dict: Data de construção e quantidades de registros e intervalos.
+    """
+    return dict(session.execute(select(snapshot_info.c.key, snapshot_info.c.value)).all())
+
+
+# Construção do snapshot: python snapshot.py caminho.db
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    build_snapshot(sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(__file__), "data/snapshot.db"))
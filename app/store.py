@@ -0,0 +1,67 @@
+import os
+import threading
+import logging
+import pandas as pd
+
+# Configuração de log
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Colunas de texto normalizadas (sem espaços nas extremidades e em minúsculas)
+NORMALIZED_COLUMNS = ["producers", "studios"]
+
+
+class DatasetStore:
+    """
+    Mantém em memória o DataFrame do arquivo CSV, compartilhado por todo o processo.
+
+    O arquivo é lido e normalizado uma única vez; a cada acesso apenas os
+    metadados do arquivo (mtime e tamanho) são consultados e o DataFrame é
+    recarregado somente quando o arquivo muda. O DataFrame retornado é
+    compartilhado e deve ser tratado como somente leitura.
+
+    Atributos:
+        path (str): Caminho do arquivo CSV.
+        version (int): Versão dos dados carregados, incrementada a cada recarga.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.version = 0
+        self._df = None
+        self._signature = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        """
+        Retorna o DataFrame normalizado, recarregando-o se o arquivo foi alterado.
+
+        Returns:
+            pd.DataFrame: Dados do CSV com 'winner' como 0/1 e produtores/estúdios normalizados.
+        """
+        stat = os.stat(self.path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if self._df is not None and signature == self._signature:
+            return self._df
+
+        with self._lock:
+            if self._df is None or signature != self._signature:
+                self._df = self._load()
+                self._signature = signature
+                self.version += 1
+                logger.info(f"Dataset carregado em memória: {len(self._df)} registros (versão {self.version}).")
+            return self._df
+
+    def _load(self):
+        """Lê o CSV e aplica as normalizações usadas pelas rotas de IA."""
+        df = pd.read_csv(self.path, delimiter=';')
+        df['winner'] = (df['winner'] == 'yes').astype(int)
+        for column in NORMALIZED_COLUMNS:
+            df[column] = df[column].fillna('').str.strip().str.lower().astype('category')
+        return df
+
+    def invalidate(self):
+        """Descarta os dados em memória, forçando a releitura no próximo acesso."""
+        with self._lock:
+            self._df = None
+            self._signature = None
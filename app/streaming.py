@@ -0,0 +1,79 @@
+import io
+import csv
+import json
+from flask import Response, request, stream_with_context
+
+# Formatos de exportação em streaming aceitos no cabeçalho Accept
+NDJSON_MIMETYPE = "application/x-ndjson"
+CSV_MIMETYPE = "text/csv"
+STREAM_MIMETYPES = (NDJSON_MIMETYPE, CSV_MIMETYPE)
+
+# Quantidade de registros lidos do cursor e codificados por vez
+STREAM_BATCH_SIZE = 1000
+
+
+def stream_format(accept_mimetypes):
+    """
+    Retorna o formato de streaming preferido entre os tipos aceitos.
+
+    Args:
+        accept_mimetypes (MIMEAccept): Tipos do cabeçalho Accept.
+
+    Returns:
+        str | None: Mimetype de streaming ou None quando o cliente prefere JSON.
+    """
+    best = accept_mimetypes.best_match(("application/json",) + STREAM_MIMETYPES, default=None)
+    return best if best in STREAM_MIMETYPES else None
+
+
+def requested_stream_format():
+    """
+    Retorna o formato de streaming solicitado pelo cabeçalho Accept da requisição atual.
+
+    Returns:
+        str | None: Mimetype de streaming ou None quando o cliente prefere JSON.
+    """
+    return stream_format(request.accept_mimetypes)
+
+
+def _encode_csv(lines):
+    """Codifica uma sequência de linhas (listas de valores) em CSV."""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(lines)
+    return buffer.getvalue()
+
+
+def _encode_batch(rows, fields, mimetype):
+    """Codifica um lote de registros em NDJSON ou CSV."""
+    if mimetype == NDJSON_MIMETYPE:
+        return "".join(json.dumps({field: row[field] for field in fields}) + "\n" for row in rows)
+    return _encode_csv([row[field] for field in fields] for row in rows)
+
+
+def stream_rows(engine, query, fields, mimetype):
+    """
+    Cria uma resposta que envia o resultado da consulta à medida que é lido do banco.
+
+    A consulta é executada em uma conexão própria com `yield_per`, de modo que
+    apenas um lote de registros fica em memória por vez e os primeiros bytes
+    são enviados antes do término da consulta.
+
+    Args:
+        engine (Engine): Engine do banco de dados.
+        query (Select): Consulta a ser exportada.
+        fields (list): Colunas exportadas, na ordem desejada.
+        mimetype (str): Um dos formatos de `STREAM_MIMETYPES`.
+
+    Returns:
+        Response: Resposta em streaming.
+    """
+    def generate():
+        if mimetype == CSV_MIMETYPE:
+            yield _encode_csv([fields])
+
+        with engine.connect() as connection:
+            result = connection.execution_options(yield_per=STREAM_BATCH_SIZE).execute(query)
+            for rows in result.mappings().partitions():
+                yield _encode_batch(rows, fields, mimetype)
+
+    return Response(stream_with_context(generate()), mimetype=mimetype)
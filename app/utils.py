@@ -1,16 +1,106 @@
 import re
+import sys
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+
+# Padrões pré-compilados usados na separação de produtores e estúdios.
+# Ambos começam por um literal, o que permite ao mecanismo de regex localizar
+# rapidamente os candidatos. Equivalem a '(?<=\s)and(?=\s)' e
+# '\s*,\s*and\s*|and\s*,\s*': o espaço antes da vírgula que deixa de ser
+# consumido é removido pelo strip de cada item.
+# 'and' isolado entre espaços
+ISOLATED_AND_PATTERN = re.compile(r'and(?<=\sand)(?=\s)')
+# ', and' ou 'and ,'
+COMMA_AND_PATTERN = re.compile(r'and\s*,\s*|,\s*and\s*')
+
+# Separador usado para processar vários textos em uma única chamada de regex;
+# não é considerado espaço por '\s', portanto se comporta como fim de texto
+_TEXT_SEPARATOR = "\x01"
+
+# Quantidade máxima de textos distintos memorizados
+SPLIT_CACHE_SIZE = 65536
+
+
+def _replace_separators(text):
+    """Substitui 'and' isolado e ', and'/'and ,' por vírgulas."""
+    return COMMA_AND_PATTERN.sub(',', ISOLATED_AND_PATTERN.sub(',', text))
+
+
+@lru_cache(maxsize=SPLIT_CACHE_SIZE)
+def _split_cached(text):
+    """
+    Separa o texto e retorna uma tupla imutável com os nomes internados.
+
+    A memorização evita reprocessar textos repetidos e `sys.intern` garante que
+    cada nome exista uma única vez em memória, independentemente de quantas
+    linhas o referenciem.
+    """
+    items = _replace_separators(text).split(',')
+    return tuple(sys.intern(item.strip()) for item in items if item.strip() != '')
+
 
 def split_by_comma_and_and(text):
     """
     Função para separar a string de produtores ou estúdios com base em vírgulas e 'and'.
     O texto é dividido em itens individuais removendo os 'and' e vírgulas associadas.
     """
-    # Substitui 'and' isolado por vírgula, garantindo que 'and' seja isolado e não faça parte de nomes compostos
-    text = re.sub(r'(?<=\s)and(?=\s)', ',', text)  # 'and' isolado entre espaços
+    return list(_split_cached(text))
+
+
+def _split_distinct(values):
+    """
+    Separa uma lista de textos distintos com uma única passada de cada regex.
+
+    Returns:
+        tuple: Array com todos os nomes (internados), na ordem dos textos, e array
+        com a quantidade de nomes de cada texto.
+    """
+    joined = _TEXT_SEPARATOR.join(values)
+    if joined.count(_TEXT_SEPARATOR) != max(len(values) - 1, 0):
+        # Algum texto contém o separador: processa um a um
+        splits = [_split_cached(value) for value in values]
+        names = np.array([name for items in splits for name in items], dtype=object)
+        return names, np.array([len(items) for items in splits], dtype=np.int64)
+
+    joined = _replace_separators(joined).replace(_TEXT_SEPARATOR, f",{_TEXT_SEPARATOR},")
+    items = np.array(list(map(str.strip, joined.split(','))), dtype=object)
+
+    # Cada separador encerra um texto; itens vazios são descartados
+    separators = items == _TEXT_SEPARATOR
+    owners = np.cumsum(separators)
+    keep = ~separators & (items != '')
+    names = np.array(list(map(sys.intern, items[keep])), dtype=object)
+    return names, np.bincount(owners[keep], minlength=len(values)).astype(np.int64)
+
+
+def split_many(texts):
+    """
+    Versão em lote de `split_by_comma_and_and`.
+
+    Aceita uma `pd.Series` ou qualquer iterável de textos. Cada texto distinto
+    é separado uma única vez e valores ausentes são ignorados.
+
+    Args:
+        texts (pd.Series | Iterable[str]): Textos com nomes separados por vírgulas e 'and'.
+
+    Returns:
+        pd.Series: Nomes explodidos (um por linha), mantendo o índice da linha de origem.
+    """
+    series = texts if isinstance(texts, pd.Series) else pd.Series(list(texts), dtype=object)
+
+    # Separa apenas os valores distintos
+    codes, uniques = pd.factorize(series)
+    flat, lengths = _split_distinct([str(value) for value in uniques])
 
-    # Substitui ', and' ou 'and ,' por vírgula
-    text = re.sub(r'\s*,\s*and\s*|and\s*,\s*', ',', text)
+    # Tamanho e posição inicial (em `flat`) de cada valor distinto; a sentinela final
+    # de tamanho zero atende os códigos -1 (valores ausentes)
+    lengths = np.append(lengths, 0)
+    offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
 
-    # Divide o texto pela vírgula
-    items = [item.strip() for item in text.split(',') if item.strip() != '']
-    return items
+    # Replica os nomes de cada valor distinto para as linhas correspondentes
+    row_lengths = lengths[codes]
+    row_offsets = offsets[codes]
+    output_offsets = np.cumsum(row_lengths) - row_lengths
+    positions = np.repeat(row_offsets - output_offsets, row_lengths) + np.arange(row_lengths.sum())
+    return pd.Series(flat[positions], index=series.index.repeat(row_lengths), dtype=object)
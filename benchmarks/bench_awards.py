@@ -0,0 +1,110 @@
+"""
+Benchmark dos motores de cálculo dos intervalos entre prêmios.
+
+Gera bancos SQLite sintéticos apenas com filmes vencedores e compara o motor
+em Python (`calculate_awards`) com o motor em SQL (`calculate_awards_sql`) e o
+motor vetorizado com NumPy (`calculate_awards_numpy`).
+
+Uso:
+    PYTHONPATH=app python -m benchmarks.bench_awards [linhas ...]
+
+Sem argumentos, executa com 10^3 a 10^6 linhas; 10^7 pode ser informado
+explicitamente (a geração do banco leva alguns minutos).
+"""
+import sys
+import numpy as np
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from models import Base
+from services import calculate_awards, calculate_awards_numpy, calculate_awards_sql
+from benchmarks.bench_utils import measure
+
+# Quantidades padrão de linhas vencedoras (filme/produtor)
+DEFAULT_SIZES = [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6]
+
+# Quantidade de linhas inseridas por executemany
+LOAD_CHUNK_SIZE = 100_000
+
+
+def synthetic_winners(rows, seed=42):
+    """
+    Gera produtores e anos de vitória sintéticos.
+
+    Cada linha é um filme vencedor com um único produtor; há, em média, quatro
+    vitórias por produtor, em anos entre 1900 e 2024.
+
+    Args:
+        rows (int): Quantidade de linhas vencedoras.
+        seed (int): Semente do gerador aleatório.
+
+    Returns:
+        tuple: Arrays com o id do produtor e o ano de cada linha.
+    """
+    generator = np.random.default_rng(seed)
+    producer_ids = generator.integers(1, max(rows // 4, 1) + 1, size=rows)
+    years = generator.integers(1900, 2025, size=rows)
+    return producer_ids, years
+
+
+def load_database(rows, seed=42):
+    """
+    Cria um banco em memória com as tabelas normalizadas populadas com vencedores sintéticos.
+
+    Returns:
+        Engine: Engine do banco gerado.
+    """
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    producer_ids, years = synthetic_winners(rows, seed)
+
+    with engine.begin() as connection:
+        connection.exec_driver_sql(
+            "INSERT INTO producers (id, name) VALUES (?, ?)",
+            [(int(producer_id), f"Producer {producer_id}") for producer_id in np.unique(producer_ids)],
+        )
+        for start in range(0, rows, LOAD_CHUNK_SIZE):
+            stop = min(start + LOAD_CHUNK_SIZE, rows)
+            connection.exec_driver_sql(
+                "INSERT INTO films (id, year, title, winner) VALUES (?, ?, ?, 'yes')",
+                [(index + 1, int(years[index]), f"Movie {index}") for index in range(start, stop)],
+            )
+            connection.exec_driver_sql(
+                "INSERT INTO film_producers (film_id, producer_id) VALUES (?, ?)",
+                [(index + 1, int(producer_ids[index])) for index in range(start, stop)],
+            )
+    return engine
+
+
+def run(rows):
+    """
+    Executa o benchmark e imprime as durações de cada motor.
+
+    Args:
+        rows (int): Quantidade de linhas vencedoras sintéticas.
+
+    Returns:
+        dict: Durações (em segundos) de cada motor.
+    """
+    engine = load_database(rows)
+    session = Session(bind=engine)
+    try:
+        python_result, python_seconds = measure(calculate_awards, session)
+        sql_result, sql_seconds = measure(calculate_awards_sql, session)
+        numpy_result, numpy_seconds = measure(calculate_awards_numpy, session)
+    finally:
+        session.close()
+        engine.dispose()
+
+    assert python_result == sql_result == numpy_result, "Os motores devem produzir o mesmo resultado."
+    print(
+        f"{rows} linhas vencedoras: python {python_seconds:.3f}s, "
+        f"sql {sql_seconds:.3f}s ({python_seconds / sql_seconds:.1f}x), "
+        f"numpy {numpy_seconds:.3f}s ({python_seconds / numpy_seconds:.1f}x)"
+    )
+    return {"python": python_seconds, "sql": sql_seconds, "numpy": numpy_seconds}
+
+
+if __name__ == "__main__":
+    sizes = [int(argument) for argument in sys.argv[1:]] or DEFAULT_SIZES
+    for size in sizes:
+        run(size)
@@ -0,0 +1,283 @@
+"""
+Suíte de benchmarks da aplicação com datasets sintéticos.
+
+Para cada tamanho, gera um movielist.csv sintético (`benchmarks.synthetic`),
+cria a aplicação com um banco em memória e mede:
+- a ingestão do CSV (`populate_data`) e a construção do índice de intervalos;
+- o aquecimento das rotas de IA;
+- `calculate_awards` e cada endpoint, pelo cliente de testes do Flask,
+  com latências p50/p99 e pico de memória alocada por chamada (tracemalloc).
+
+Por padrão, o cache de respostas é desabilitado para medir o processamento
+de cada requisição (`--cache` o habilita). Os resultados são gravados em JSON
+em `benchmarks/results/` e podem ser comparados com os de outro commit
+(`--compare`), listando as métricas que pioraram além da tolerância.
+
+Uso (a partir do diretório app/, como no contêiner):
+    PYTHONPATH=.. python -m benchmarks.bench_suite [linhas ...] [--repeat N] [--cache]
+        [--output DIR] [--compare resultado.json] [--tolerance 0.2]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import resource
+import tempfile
+import subprocess
+import tracemalloc
+from datetime import datetime, timezone
+from benchmarks.synthetic import generate_movielist, write_movielist
+
+# Quantidades padrão de filmes (linhas do CSV)
+DEFAULT_SIZES = [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6]
+
+# Quantidade de chamadas medidas por operação
+DEFAULT_REPEAT = 50
+
+# Diretório padrão dos resultados
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+# Piora relativa a partir da qual uma métrica é considerada regressão
+DEFAULT_TOLERANCE = 0.2
+
+# Métricas comparadas entre execuções (quanto menor, melhor)
+COMPARED_METRICS = ("seconds", "p50_ms", "p99_ms", "peak_memory_mb")
+
+# Requisições medidas: nome, método, caminho e corpo JSON
+ENDPOINTS = [
+    ("GET /app/awards", "GET", "/app/awards", None),
+    ("GET /app/awards?k=10", "GET", "/app/awards?k=10", None),
+    ("GET /app/details", "GET", "/app/details", None),
+    ("GET /app/movies", "GET", "/app/movies?limit=100", None),
+    ("GET /app/producers/<producer>", "GET", "/app/producers/Producer 0", None),
+    ("POST /app/winners", "POST", "/app/winners", {"year": 2000}),
+    ("GET /ai/recommendations", "GET", "/ai/recommendations?limit=100", None),
+    ("POST /ai/predict-bad-movie", "POST", "/ai/predict-bad-movie", {"producer": "Producer 0", "studio": "Studio 0"}),
+    (
+        "POST /ai/predict-bad-movie/batch",
+        "POST",
+        "/ai/predict-bad-movie/batch",
+        {"pairs": [{"producer": f"Producer {index}", "studio": f"Studio {index % 10}"} for index in range(100)]},
+    ),
+]
+
+
+def percentile(samples, fraction):
+    """Percentil (nearest-rank) de uma lista de amostras."""
+    ordered = sorted(samples)
+    return ordered[max(int(round(fraction * len(ordered))) - 1, 0)]
+
+
+def max_rss_mb():
+    """Pico de memória residente do processo, em MB."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def measure_once(function):
+    """Retorna o resultado e a duração, em segundos, de uma chamada."""
+    started = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - started
+
+
+def measure_latency(function, repeat):
+    """
+    Mede a latência de chamadas repetidas e o pico de memória alocada por chamada.
+
+    A primeira chamada (aquecimento) é descartada; o pico de memória é medido
+    em uma chamada adicional com tracemalloc, fora das amostras de latência.
+
+    Args:
+        function (callable): Função sem argumentos.
+        repeat (int): Quantidade de chamadas medidas.
+
+    Returns:
+        dict: Latências p50, p99 e média, em milissegundos, e pico de memória, em MB.
+    """
+    function()
+    samples = [measure_once(function)[1] * 1000 for _ in range(repeat)]
+
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "p50_ms": percentile(samples, 0.50),
+        "p99_ms": percentile(samples, 0.99),
+        "mean_ms": sum(samples) / len(samples),
+        "peak_memory_mb": peak / 1024 / 1024,
+    }
+
+
+def _request(client, method, path, payload):
+    """Cria a função que executa a requisição e valida o status da resposta."""
+    def call():
+        response = client.open(path, method=method, json=payload)
+        if response.status_code != 200:
+            raise RuntimeError(f"{method} {path} retornou {response.status_code}: {response.get_data(as_text=True)}")
+        return response
+
+    return call
+
+
+def _use_dataset(csv_path, model_path):
+    """Aponta a ingestão e as rotas de IA para o CSV sintético, descartando os dados carregados."""
+    import ai_routes
+
+    os.environ["CSV_PATH"] = csv_path
+    ai_routes.csv_path = csv_path
+    ai_routes.model_path = model_path
+    ai_routes._dataset_store = None
+    ai_routes._model_store = None
+
+
+def run(rows, repeat=DEFAULT_REPEAT, cache=False):
+    """
+    Executa a suíte para um tamanho de dataset e imprime os resultados.
+
+    Args:
+        rows (int): Quantidade de filmes do dataset sintético.
+        repeat (int): Quantidade de chamadas medidas por operação.
+        cache (bool): Mantém o cache de respostas habilitado.
+
+    Returns:
+        dict: Resultados de cada operação.
+    """
+    import routes
+    from app import create_app
+    from config import Config
+    from ai_routes import warm_up as warm_up_ai
+    from services import awards_index, calculate_awards
+    from ingestion import populate_data
+
+    config = type("BenchConfig", (Config,), {
+        "SQLALCHEMY_DATABASE_URI": "sqlite://",
+        "RESPONSE_CACHE_MAX_BYTES": Config.RESPONSE_CACHE_MAX_BYTES if cache else 0,
+        "DEFERRED_INIT": False,
+        "PROFILING_ENABLED": False,
+        "SLOW_QUERY_THRESHOLD_MS": 0,
+    })
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = os.path.join(directory, "movielist.csv")
+        _, seconds = measure_once(lambda: write_movielist(generate_movielist(rows), csv_path))
+        results["generate_dataset"] = {"seconds": seconds}
+
+        _use_dataset(csv_path, os.path.join(directory, "recommendation_model.joblib"))
+        app = create_app(config, start_warm_up=False)
+        client = app.test_client()
+        session = routes.Session()
+        try:
+            inserted, seconds = measure_once(lambda: populate_data(session))
+            results["populate_data"] = {
+                "seconds": seconds,
+                "rows_per_second": inserted / seconds if seconds > 0 else 0.0,
+                "max_rss_mb": max_rss_mb(),
+            }
+            _, seconds = measure_once(lambda: awards_index.rebuild(session))
+            results["awards_index.rebuild"] = {"seconds": seconds}
+            _, seconds = measure_once(warm_up_ai)
+            results["ai_warm_up"] = {"seconds": seconds, "max_rss_mb": max_rss_mb()}
+
+            results["calculate_awards"] = measure_latency(lambda: calculate_awards(session), repeat)
+            for name, method, path, payload in ENDPOINTS:
+                results[name] = measure_latency(_request(client, method, path, payload), repeat)
+        finally:
+            session.close()
+            routes.Session.remove()
+            routes.engine.dispose()
+
+    print(f"\n{rows} filmes:")
+    for name, metrics in results.items():
+        if "p50_ms" in metrics:
+            print(
+                f"  {name:<36} p50 {metrics['p50_ms']:9.3f} ms  p99 {metrics['p99_ms']:9.3f} ms"
+                f"  memória {metrics['peak_memory_mb']:8.2f} MB"
+            )
+        else:
+            print(f"  {name:<36} {metrics['seconds']:9.3f} s")
+    return results
+
+
+def _git_commit():
+    """Commit atual do repositório, quando disponível."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save_results(report, directory=RESULTS_DIR):
+    """
+    Grava o relatório em JSON, nomeado pela data e pelo commit.
+
+    Returns:
+        str: Caminho do arquivo gravado.
+    """
+    os.makedirs(directory, exist_ok=True)
+    created = datetime.fromisoformat(report["created"]).strftime("%Y%m%d-%H%M%S")
+    path = os.path.join(directory, f"{created}-{report['commit'] or 'unknown'}.json")
+    with open(path, "w") as file:
+        json.dump(report, file, indent=2)
+    return path
+
+
+def compare_results(baseline, report, tolerance=DEFAULT_TOLERANCE):
+    """
+    Compara dois relatórios e lista as métricas que pioraram além da tolerância.
+
+    Args:
+        baseline (dict): Relatório de referência.
+        report (dict): Relatório atual.
+        tolerance (float): Piora relativa tolerada (0.2 = 20%).
+
+    Returns:
+        list: Tuplas (tamanho, operação, métrica, valor de referência, valor atual).
+    """
+    regressions = []
+    for size, operations in report["results"].items():
+        for name, metrics in operations.items():
+            previous = baseline["results"].get(size, {}).get(name, {})
+            for metric in COMPARED_METRICS:
+                if metric in metrics and previous.get(metric):
+                    if metrics[metric] > previous[metric] * (1 + tolerance):
+                        regressions.append((size, name, metric, previous[metric], metrics[metric]))
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Suíte de benchmarks com datasets sintéticos.")
+    parser.add_argument("sizes", type=int, nargs="*", help="Quantidades de filmes (padrão: 10^3 a 10^6)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--cache", action="store_true", help="Mantém o cache de respostas habilitado")
+    parser.add_argument("--output", default=RESULTS_DIR, help="Diretório dos resultados")
+    parser.add_argument("--compare", help="Relatório de referência para a detecção de regressões")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    arguments = parser.parse_args()
+
+    report = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "repeat": arguments.repeat,
+        "cache": arguments.cache,
+        "results": {str(size): run(size, arguments.repeat, arguments.cache) for size in arguments.sizes or DEFAULT_SIZES},
+    }
+    print(f"\nResultados gravados em {save_results(report, arguments.output)}")
+
+    if arguments.compare:
+        with open(arguments.compare) as file:
+            regressions = compare_results(json.load(file), report, arguments.tolerance)
+        for size, name, metric, previous, current in regressions:
+            print(f"REGRESSÃO {size} filmes, {name}, {metric}: {previous:.3f} -> {current:.3f}")
+        if regressions:
+            sys.exit(1)
+        print("Nenhuma regressão encontrada.")
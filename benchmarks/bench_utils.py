@@ -0,0 +1,89 @@
+"""
+Micro-benchmark do separador de produtores/estúdios.
+
+Compara a implementação original de `split_by_comma_and_and` (padrões não
+compilados, chamada linha a linha) com a versão em lote `split_many`.
+
+Uso:
+    PYTHONPATH=app python -m benchmarks.bench_utils [linhas]
+"""
+import re
+import sys
+import time
+import random
+import pandas as pd
+from utils import split_many
+
+
+def split_by_comma_and_and_reference(text):
+    """Implementação original, mantida apenas como referência de desempenho."""
+    text = re.sub(r'(?<=\s)and(?=\s)', ',', text)
+    text = re.sub(r'\s*,\s*and\s*|and\s*,\s*', ',', text)
+    return [item.strip() for item in text.split(',') if item.strip() != '']
+
+
+def synthetic_producers(rows, distinct_texts=None, distinct_names=5000, seed=42):
+    """
+    Gera textos de produtores no formato do CSV ('A, B and C').
+
+    Args:
+        rows (int): Quantidade de textos.
+        distinct_texts (int | None): Quantidade de textos distintos sorteados para as
+            linhas; None gera um texto novo por linha.
+        distinct_names (int): Quantidade de nomes distintos sorteados.
+        seed (int): Semente do gerador aleatório.
+
+    Returns:
+        pd.Series: Textos de produtores.
+    """
+    generator = random.Random(seed)
+    names = [f"Producer {index}" for index in range(distinct_names)]
+
+    def text():
+        chosen = generator.sample(names, generator.randint(1, 4))
+        return chosen[0] if len(chosen) == 1 else ", ".join(chosen[:-1]) + " and " + chosen[-1]
+
+    if distinct_texts is None:
+        return pd.Series([text() for _ in range(rows)])
+    pool = [text() for _ in range(distinct_texts)]
+    return pd.Series([generator.choice(pool) for _ in range(rows)])
+
+
+def measure(function, *args):
+    """Retorna o resultado e a duração, em segundos, da chamada."""
+    started = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - started
+
+
+def run(rows, distinct_texts=None):
+    """
+    Executa o benchmark e imprime as durações e o ganho obtido.
+
+    Args:
+        rows (int): Quantidade de textos sintéticos.
+        distinct_texts (int | None): Quantidade de textos distintos (None: todos distintos).
+
+    Returns:
+        dict: Durações (em segundos) de cada implementação.
+    """
+    texts = synthetic_producers(rows, distinct_texts)
+
+    reference, reference_seconds = measure(
+        lambda values: [name for value in values for name in split_by_comma_and_and_reference(value)], texts
+    )
+    batch, batch_seconds = measure(split_many, texts)
+
+    assert batch.tolist() == reference, "As implementações devem produzir os mesmos nomes."
+    label = "todos distintos" if distinct_texts is None else f"{distinct_texts} distintos"
+    print(
+        f"{rows} linhas ({label}): referência {reference_seconds:.3f}s, "
+        f"split_many {batch_seconds:.3f}s ({reference_seconds / batch_seconds:.1f}x)"
+    )
+    return {"reference": reference_seconds, "split_many": batch_seconds}
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    run(rows)
+    run(rows, distinct_texts=max(rows // 20, 1))
@@ -0,0 +1,86 @@
+"""
+Gerador de datasets sintéticos no formato do movielist.csv (Golden Raspberry Awards).
+
+Uso:
+    python -m benchmarks.synthetic arquivo.csv [--films N] [--producers-per-film N]
+        [--win-rate TAXA] [--year-from ANO] [--year-to ANO] [--seed N]
+"""
+import argparse
+import numpy as np
+import pandas as pd
+
+
+def _join_names(names):
+    """Junta nomes no formato do CSV ('A, B and C')."""
+    return names[0] if len(names) == 1 else ", ".join(names[:-1]) + " and " + names[-1]
+
+
+def generate_movielist(films, producers_per_film=2, win_rate=0.2, year_span=(1980, 2024), seed=42):
+    """
+    Gera um dataset sintético de indicados no formato do movielist.csv.
+
+    Os produtores e estúdios são sorteados de conjuntos proporcionais à
+    quantidade de filmes (um produtor para cada quatro filmes e um estúdio para
+    cada vinte), de modo que os produtores acumulam várias indicações e vitórias.
+
+    Args:
+        films (int): Quantidade de filmes (linhas do CSV).
+        producers_per_film (int): Quantidade máxima de produtores por filme; cada
+            filme recebe de 1 a esse valor.
+        win_rate (float): Proporção de filmes vencedores.
+        year_span (tuple): Primeiro e último ano (inclusive).
+        seed (int): Semente do gerador aleatório.
+
+    Returns:
+        pd.DataFrame: Colunas year, title, studios, producers e winner ('yes' ou vazio).
+    """
+    generator = np.random.default_rng(seed)
+    producer_names = [f"Producer {index}" for index in range(max(films // 4, producers_per_film))]
+    studio_names = [f"Studio {index}" for index in range(max(films // 20, 2))]
+
+    producer_counts = generator.integers(1, producers_per_film + 1, size=films).tolist()
+    studio_counts = generator.integers(1, 3, size=films).tolist()
+    producers = generator.integers(0, len(producer_names), size=(films, producers_per_film)).tolist()
+    studios = generator.integers(0, len(studio_names), size=(films, 2)).tolist()
+
+    return pd.DataFrame({
+        "year": generator.integers(year_span[0], year_span[1] + 1, size=films),
+        "title": [f"Movie {index}" for index in range(films)],
+        "studios": [
+            _join_names([studio_names[index] for index in dict.fromkeys(row[:count])])
+            for row, count in zip(studios, studio_counts)
+        ],
+        "producers": [
+            _join_names([producer_names[index] for index in dict.fromkeys(row[:count])])
+            for row, count in zip(producers, producer_counts)
+        ],
+        "winner": np.where(generator.random(films) < win_rate, "yes", ""),
+    })
+
+
+def write_movielist(frame, path):
+    """Grava o dataset no formato do movielist.csv (separado por ';')."""
+    frame.to_csv(path, sep=";", index=False)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gera um movielist.csv sintético.")
+    parser.add_argument("path", help="Arquivo CSV de saída")
+    parser.add_argument("--films", type=int, default=10 ** 4)
+    parser.add_argument("--producers-per-film", type=int, default=2)
+    parser.add_argument("--win-rate", type=float, default=0.2)
+    parser.add_argument("--year-from", type=int, default=1980)
+    parser.add_argument("--year-to", type=int, default=2024)
+    parser.add_argument("--seed", type=int, default=42)
+    arguments = parser.parse_args()
+
+    write_movielist(
+        generate_movielist(
+            arguments.films,
+            producers_per_film=arguments.producers_per_film,
+            win_rate=arguments.win_rate,
+            year_span=(arguments.year_from, arguments.year_to),
+            seed=arguments.seed,
+        ),
+        arguments.path,
+    )
@@ -0,0 +1,139 @@
+import os
+import json
+import shutil
+import asyncio
+import tempfile
+import unittest
+import routes
+from asgi import create_asgi_app
+from cache import response_cache
+from config import TestConfig
+from metrics import registry
+from services import awards_index
+from snapshot import build_snapshot
+
+
+class TestAsgi(unittest.TestCase):
+    """
+    Testes de integração para o servidor ASGI (endpoints assíncronos e encaminhamento ao Flask).
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, cls.directory)
+        path = os.path.join(cls.directory, "snapshot.db")
+        build_snapshot(path)
+
+        cls.addClassCleanup(cls.restore_database, routes.engine, routes.Session)
+        cls.loop = asyncio.new_event_loop()
+        cls.addClassCleanup(cls.loop.close)
+        cls.application = create_asgi_app(
+            type("AsgiConfig", (TestConfig,), {"SNAPSHOT_PATH": path, "ASGI_WSGI_THREADS": 2}),
+            start_warm_up=False,
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.loop.run_until_complete(cls.application.engine.dispose())
+
+    @staticmethod
+    def restore_database(engine, session):
+        """Restaura o banco usado pelos demais testes."""
+        routes.engine.dispose()
+        routes.engine, routes.Session = engine, session
+        response_cache.clear()
+        awards_index.invalidate()
+
+    def setUp(self):
+        response_cache.clear()
+
+    def request(self, method, path, body=None, headers=None):
+        """Executa uma requisição na aplicação ASGI e retorna o status, os cabeçalhos e o corpo."""
+        path, _, query = path.partition("?")
+        headers = dict(headers or {})
+        content = b""
+        if body is not None:
+            content = json.dumps(body).encode()
+            headers["content-type"] = "application/json"
+
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "root_path": "",
+            "query_string": query.encode(),
+            "headers": [(name.lower().encode(), value.encode()) for name, value in headers.items()],
+            "server": ("localhost", 80),
+            "client": ("127.0.0.1", 12345),
+        }
+        messages = [{"type": "http.request", "body": content, "more_body": False}]
+        sent = []
+
+        async def receive():
+            if messages:
+                return messages.pop(0)
+            await asyncio.sleep(3600)
+
+        async def send(message):
+            sent.append(message)
+
+        self.loop.run_until_complete(self.application(scope, receive, send))
+        start = sent[0]
+        response_headers = {name.decode(): value.decode() for name, value in start["headers"]}
+        return start["status"], response_headers, b"".join(message.get("body", b"") for message in sent[1:])
+
+    def test_async_movies_with_cursor_and_etag(self):
+        """Testa o endpoint assíncrono /app/movies com paginação por cursor e ETag"""
+        self.assertIsNotNone(self.application.engine)
+        status, headers, body = self.request("GET", "/app/movies?limit=2")
+        self.assertEqual(status, 200)
+        self.assertEqual(len(json.loads(body)), 2)
+        self.assertIn("X-Next-Cursor", headers)
+
+        status, _, body = self.request("GET", "/app/movies?limit=2", headers={"If-None-Match": headers["etag"]})
+        self.assertEqual(status, 304)
+        self.assertEqual(body, b"")
+
+        status, _, _ = self.request("GET", "/app/movies?limit=0")
+        self.assertEqual(status, 400)
+
+    def test_async_producer_and_winners(self):
+        """Testa os endpoints assíncronos /app/producers/<producer> e /app/winners"""
+        status, _, body = self.request("GET", "/app/producers/Allan Carr")
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(body)["movies"][0]["title"], "Can't Stop the Music")
+
+        status, _, _ = self.request("GET", "/app/producers/Unknown Producer")
+        self.assertEqual(status, 404)
+
+        status, _, body = self.request("POST", "/app/winners", {"year": 1980})
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(body)["winners"], ["Can't Stop the Music"])
+
+        status, _, _ = self.request("POST", "/app/winners", {})
+        self.assertEqual(status, 400)
+
+    def test_async_queries_are_measured(self):
+        """Testa se as consultas do engine assíncrono são contabilizadas nas métricas do banco"""
+        def selects():
+            return registry.get_sample_value("db_queries_total", {"operation": "SELECT"}) or 0
+
+        before = selects()
+        status, _, _ = self.request("GET", "/app/producers/Allan Carr")
+        self.assertEqual(status, 200)
+        self.assertGreater(selects(), before)
+
+    def test_other_routes_are_served_by_flask(self):
+        """Testa se as demais rotas são encaminhadas à aplicação Flask"""
+        status, _, body = self.request("GET", "/app/health")
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(body)["status"], "healthy")
+
+
+if __name__ == "__main__":
+    unittest.main()
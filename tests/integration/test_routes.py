@@ -1,4 +1,7 @@
+import json
 import unittest
+from werkzeug.datastructures import MultiDict
+import routes
 from app import app
 from routes import Session, init_db
 from models import Movie
@@ -29,6 +32,41 @@ class TestRoutes(unittest.TestCase):
         self.session.commit()
         self.session.close()
 
+    def test_health_liveness_and_readiness(self):
+        """Testa os endpoints /app/health (liveness) e /app/health/ready (readiness)"""
+        response = self.app.get('/app/health')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['status'], 'healthy')
+
+        response = self.app.get('/app/health/ready')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.get_json()['ready'])
+
+    def test_metrics(self):
+        """Testa o endpoint /metrics no formato texto do Prometheus"""
+        self.app.get('/app/awards')
+
+        response = self.app.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content_type.startswith('text/plain'))
+        body = response.get_data(as_text=True)
+        self.assertIn('http_requests_total{endpoint="/app/awards",method="GET",status="200"}', body)
+        self.assertIn('db_queries_total{operation="SELECT"}', body)
+        self.assertIn('response_cache_hit_ratio', body)
+
+    def test_metrics_include_recommendation_model_timings(self):
+        """Testa se as durações de treinamento e carregamento do modelo são expostas em /metrics"""
+        self.app.get('/ai/recommendations')
+        info = self.app.get('/ai/model').get_json()
+
+        lines = self.app.get('/metrics').get_data(as_text=True).splitlines()
+        self.assertIn('# TYPE recommendation_model_train_seconds gauge', lines)
+        self.assertIn('# TYPE recommendation_model_load_seconds gauge', lines)
+        self.assertTrue(info['train_seconds'] is not None or info['load_seconds'] is not None)
+        for name in ('train_seconds', 'load_seconds'):
+            if info[name] is not None:
+                self.assertIn(f'recommendation_model_{name} {float(info[name])}', lines)
+
     def test_awards_empty_database(self):
         """
         Testa o comportamento do endpoint quando o banco de dados está vazio.
@@ -97,6 +135,36 @@ class TestRoutes(unittest.TestCase):
             all(interval['interval'] == 3 for interval in data['max'])
         )
 
+    def test_awards_top_k_and_filters(self):
+        """Testa os parâmetros k, year_from/year_to e producer do endpoint /app/awards"""
+        movies = [
+            Movie(title="Movie 1", producer="Producer 1", year=1990, winner="yes"),
+            Movie(title="Movie 2", producer="Producer 1", year=2000, winner="yes"),
+            Movie(title="Movie 3", producer="Producer 1", year=2001, winner="yes"),
+            Movie(title="Movie 4", producer="Another 2", year=2005, winner="yes"),
+            Movie(title="Movie 5", producer="Another 2", year=2008, winner="yes"),
+        ]
+        self.session.bulk_save_objects(movies)
+        self.session.commit()
+
+        data = self.app.get('/app/awards?k=2').get_json()
+        self.assertEqual([item['interval'] for item in data['min']], [1, 3])
+        self.assertEqual([item['interval'] for item in data['max']], [10, 3])
+
+        data = self.app.get('/app/awards?year_from=1995&year_to=2010').get_json()
+        self.assertEqual([item['interval'] for item in data['min']], [1])
+        self.assertEqual(data['max'][0]['producer'], "Another 2")
+
+        data = self.app.get('/app/awards?producer=Producer').get_json()
+        self.assertEqual(data['max'][0]['previousWin'], 1990)
+
+        self.assertEqual(self.app.get('/app/awards?k=0').status_code, 400)
+        self.assertEqual(self.app.get('/app/awards?year_from=2010&year_to=2000').status_code, 400)
+        for query in ('k=abc', 'year_from=x', 'year_to=2000.5'):
+            response = self.app.get(f'/app/awards?{query}')
+            self.assertEqual(response.status_code, 400)
+            self.assertIn('deve ser um número inteiro', response.get_json()['error'])
+
     def test_get_details(self):
         """Testa o endpoint /app/details"""
         response = self.app.get('/app/details')
@@ -121,6 +189,79 @@ class TestRoutes(unittest.TestCase):
         json_data = response.get_json()
         self.assertIsInstance(json_data, list)  # Espera-se que retorne uma lista de filmes
 
+    def test_movies_page_query_uses_indexes(self):
+        """Testa se as páginas de /app/movies percorrem índices, sem varrer nem ordenar o catálogo"""
+        cursor = routes._encode_cursor(2000, 10, 5)
+        for args in ({}, {'cursor': cursor}, {'year': '2000'}, {'year': '2000', 'cursor': cursor}):
+            _, limit, query = routes.movies_query(MultiDict(args))
+            statement = query.limit(limit + 1).compile(
+                dialect=routes.engine.dialect, compile_kwargs={'literal_binds': True}
+            )
+            with routes.engine.connect() as connection:
+                plan = [row[3] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}")]
+
+            self.assertIn('ix_films_year_id', plan[0])
+            for detail in plan:
+                self.assertNotIn('SCAN', detail)
+                self.assertNotIn('TEMP B-TREE', detail)
+
+    def test_list_movies_keyset_pagination(self):
+        """Testa a paginação por cursor e a projeção de campos do endpoint /app/movies"""
+        movies = [
+            Movie(title="Movie 1", producer="Producer 1", year=2001, winner="yes"),
+            Movie(title="Movie 2", producer="Producer 1", year=2000, winner="no"),
+            Movie(title="Movie 3", producer="Producer 2", year=2001, winner="no"),
+            Movie(title="Movie 1", producer="Producer 3", year=2001, winner="yes"),
+        ]
+        self.session.bulk_save_objects(movies)
+        self.session.commit()
+
+        response = self.app.get('/app/movies?fields=title,year&limit=2')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json(), [
+            {'title': 'Movie 2', 'year': 2000},
+            {'title': 'Movie 1', 'year': 2001},
+        ])
+        self.assertIn('X-Next-Cursor', response.headers)
+        next_url = response.headers['Link'].split(';')[0].strip('<>')
+
+        # O cursor pode parar entre os produtores de um mesmo filme
+        response = self.app.get(next_url)
+        self.assertEqual(response.get_json(), [{'title': 'Movie 1', 'year': 2001}, {'title': 'Movie 3', 'year': 2001}])
+        self.assertNotIn('X-Next-Cursor', response.headers)
+
+        # Campo inexistente
+        response = self.app.get('/app/movies?fields=budget')
+        self.assertEqual(response.status_code, 400)
+
+        for query, message in (('year=abc', "Parâmetro 'year' deve ser um número inteiro."),
+                               ('limit=abc', "Parâmetro 'limit' deve ser um número inteiro.")):
+            response = self.app.get(f'/app/movies?{query}')
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.get_json()['error'], message)
+
+    def test_list_movies_streaming_export(self):
+        """Testa a exportação em streaming (NDJSON e CSV) do endpoint /app/movies"""
+        movies = [
+            Movie(title="Movie 1", producer="Producer 1", year=2000, winner="yes"),
+            Movie(title="Movie 2", producer="Producer 2", year=2001, winner="no"),
+        ]
+        self.session.bulk_save_objects(movies)
+        self.session.commit()
+
+        response = self.app.get('/app/movies?fields=title,year&limit=1', headers={'Accept': 'application/x-ndjson'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        self.assertEqual(lines, [{'title': 'Movie 1', 'year': 2000}, {'title': 'Movie 2', 'year': 2001}])
+
+        response = self.app.get('/app/producers/Producer 2', headers={'Accept': 'text/csv'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_data(as_text=True).splitlines(), [
+            'title,year,studios,winner',
+            'Movie 2,2001,,no',
+        ])
+
     def test_get_winners(self):
         """Testa o endpoint /app/winners"""
         movie_2020 = Movie(title="Movie 2020", producer="Producer 1", year=2020, winner="yes")
@@ -141,6 +282,26 @@ class TestRoutes(unittest.TestCase):
         self.assertIn('message', json_data)
         self.assertEqual(json_data['message'], "Não há vencedores registrados para o ano 2021.")
 
+    def test_awards_etag_not_modified(self):
+        """Testa se o endpoint /app/awards responde 304 quando o ETag não mudou"""
+        response = self.app.get('/app/awards')
+        self.assertEqual(response.status_code, 200)
+        etag = response.headers.get('ETag')
+        self.assertIsNotNone(etag)
+
+        response = self.app.get('/app/awards', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+
+        # Uma alteração no dataset gera uma nova resposta
+        self.session.add(Movie(title="Movie 1", producer="Producer 1", year=2000, winner="yes"))
+        self.session.add(Movie(title="Movie 2", producer="Producer 1", year=2001, winner="yes"))
+        self.session.commit()
+
+        response = self.app.get('/app/awards', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers.get('ETag'), etag)
+        self.assertEqual(response.get_json()['min'][0]['interval'], 1)
+
     def test_recommend_movies(self):
         """Testa o endpoint /ai/recommendations"""
         response = self.app.get('/ai/recommendations')
@@ -148,6 +309,20 @@ class TestRoutes(unittest.TestCase):
         json_data = response.get_json()
         self.assertIn('movies_in_cluster', json_data)
         self.assertIsInstance(json_data['movies_in_cluster'], list)
+        self.assertEqual(len(json_data['movies_in_cluster']), json_data['total'])
+        self.assertNotIn('_links', json_data)
+
+    def test_recommend_movies_pagination(self):
+        """Testa a paginação do endpoint /ai/recommendations"""
+        first = self.app.get('/ai/recommendations?limit=2').get_json()
+        second = self.app.get('/ai/recommendations?limit=2&page=2').get_json()
+        self.assertEqual(len(first['movies_in_cluster']), 2)
+        self.assertEqual(first['_links']['next']['href'], '/ai/recommendations?page=2&limit=2')
+        self.assertNotEqual(first['movies_in_cluster'], second['movies_in_cluster'])
+
+        for query in ('page=0', 'page=2', 'limit=abc', 'limit=0'):
+            response = self.app.get(f'/ai/recommendations?{query}')
+            self.assertEqual(response.status_code, 400)
 
     def test_predict_bad_movie(self):
         """Testa o endpoint /ai/predict-bad-movie"""
@@ -159,6 +334,23 @@ class TestRoutes(unittest.TestCase):
         json_data = response.get_json()
         self.assertIn('prediction', json_data)
 
+    def test_predict_bad_movie_batch(self):
+        """Testa o endpoint /ai/predict-bad-movie/batch"""
+        pairs = [
+            {'producer': 'Adam Sandler', 'studio': 'Columbia Pictures'},
+            {'producer': 'Producer 1', 'studio': 'Studio 1'},
+        ]
+        response = self.app.post('/ai/predict-bad-movie/batch', json={'pairs': pairs})
+        self.assertEqual(response.status_code, 200)
+        predictions = response.get_json()['predictions']
+        self.assertEqual(len(predictions), 2)
+        self.assertEqual(predictions[0]['prediction'], "Probabilidade de ser ruim")
+        self.assertEqual(predictions[1]['prediction'], "Não é provável ser ruim")
+
+        # Combinação incompleta
+        response = self.app.post('/ai/predict-bad-movie/batch', json={'pairs': [{'producer': 'Producer 1'}]})
+        self.assertEqual(response.status_code, 400)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,135 @@
+import os
+import tempfile
+import unittest
+import pandas as pd
+from ai_services import CooccurrenceIndex, RecommendationModelStore
+
+
+class TestCooccurrenceIndex(unittest.TestCase):
+    """
+    Testes de unidade para o índice de coocorrência produtor-estúdio.
+    """
+
+    def setUp(self):
+        """
+        Dados normalizados de exemplo.
+        """
+        self.df = pd.DataFrame({
+            "producers": ["producer 1 and producer 2", "producer 1", "producer 3"],
+            "studios": ["studio 1, studio 2", "studio 1", "studio 3"],
+        })
+
+    def test_counts_combinations(self):
+        """
+        Testa a contagem das combinações produtor-estúdio.
+        Cenário positivo.
+        """
+        index = CooccurrenceIndex()
+        index.sync(self.df)
+
+        self.assertEqual(index.count("producer 1", "studio 1"), 2)
+        self.assertEqual(index.count("producer 2", "studio 2"), 1)
+        self.assertEqual(index.count("producer 3", "studio 1"), 0)
+        self.assertEqual(index.count("unknown", "studio 1"), 0)
+
+    def test_sync_appended_rows_incrementally(self):
+        """
+        Testa se novas linhas acrescentadas ao dataset são contabilizadas sem perder as anteriores.
+        Cenário positivo.
+        """
+        index = CooccurrenceIndex()
+        index.sync(self.df)
+        appended = pd.concat(
+            [self.df, pd.DataFrame({"producers": ["producer 3"], "studios": ["studio 3"]})],
+            ignore_index=True,
+        )
+        index.sync(appended)
+
+        self.assertEqual(index.count("producer 3", "studio 3"), 2)
+        self.assertEqual(index.count("producer 1", "studio 1"), 2)
+
+    def test_sync_rebuilds_when_rows_change(self):
+        """
+        Testa se o índice é reconstruído quando linhas existentes mudam.
+        Cenário positivo.
+        """
+        index = CooccurrenceIndex()
+        index.sync(self.df)
+        index.sync(pd.DataFrame({"producers": ["producer 9"], "studios": ["studio 9"]}))
+
+        self.assertEqual(index.count("producer 1", "studio 1"), 0)
+        self.assertEqual(index.count("producer 9", "studio 9"), 1)
+
+    def test_count_reads_previous_state_during_sync(self):
+        """
+        Testa se, durante uma reconstrução, as leituras enxergam o índice anterior completo.
+        Cenário positivo.
+        """
+        index = CooccurrenceIndex()
+        index.sync(self.df)
+        observed = []
+        add_rows = index._add_rows
+
+        def add_rows_and_read(state, df):
+            add_rows(state, df)
+            observed.append(index.count("producer 1", "studio 1"))
+
+        index._add_rows = add_rows_and_read
+        index.sync(pd.DataFrame({"producers": ["producer 9"], "studios": ["studio 9"]}))
+
+        self.assertEqual(observed, [2])
+        self.assertEqual(index.count("producer 1", "studio 1"), 0)
+
+
+class TestRecommendationModelStore(unittest.TestCase):
+    """
+    Testes de unidade para o armazenamento do modelo de recomendação.
+    """
+
+    def setUp(self):
+        """
+        Dados de treinamento e diretório temporário para o artefato.
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "model.joblib")
+        self.df = pd.DataFrame({"year": [1980, 1981, 2010, 2011], "winner": [1, 0, 1, 0]})
+
+    def tearDown(self):
+        """
+        Remove o diretório temporário.
+        """
+        self.directory.cleanup()
+
+    def test_reuses_persisted_model(self):
+        """
+        Testa se um novo processo carrega o artefato do disco em vez de treinar novamente.
+        Cenário positivo.
+        """
+        trained = RecommendationModelStore(self.path)
+        trained.get(self.df)
+        self.assertIsNotNone(trained.train_seconds)
+
+        loaded = RecommendationModelStore(self.path)
+        model = loaded.get(self.df.copy())
+        self.assertIsNone(loaded.train_seconds, "O modelo não deve ser treinado novamente.")
+        self.assertIsNotNone(loaded.load_seconds)
+        self.assertEqual(loaded.fingerprint, trained.fingerprint)
+        self.assertEqual(len(model.labels_), len(self.df))
+
+    def test_retrains_when_dataset_changes(self):
+        """
+        Testa se o modelo é treinado novamente quando o dataset muda.
+        Cenário positivo.
+        """
+        store = RecommendationModelStore(self.path)
+        store.get(self.df)
+        fingerprint = store.fingerprint
+
+        changed = pd.concat([self.df, pd.DataFrame({"year": [2020], "winner": [1]})], ignore_index=True)
+        model = store.get(changed)
+        self.assertNotEqual(store.fingerprint, fingerprint)
+        self.assertEqual(len(model.labels_), len(changed))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+from unittest.mock import patch
+from cache import CachedResponse, ResponseCache
+
+
+class TestResponseCache(unittest.TestCase):
+    """
+    Testes de unidade para o cache de respostas.
+    """
+
+    def test_evicts_least_recently_used_over_budget(self):
+        """
+        Testa se as entradas menos usadas são removidas ao exceder o orçamento de bytes.
+        Cenário positivo.
+        """
+        cache = ResponseCache(max_bytes=10)
+        cache.put("a", CachedResponse(b"12345", 200, "a", {}))
+        cache.put("b", CachedResponse(b"12345", 200, "b", {}))
+        cache.get("a")
+        cache.put("c", CachedResponse(b"12345", 200, "c", {}))
+
+        self.assertIsNotNone(cache.get("a"), "A entrada usada recentemente deve permanecer.")
+        self.assertIsNone(cache.get("b"), "A entrada menos usada deve ser removida.")
+        self.assertEqual(cache.size, 10)
+
+    def test_ignores_entries_larger_than_budget(self):
+        """
+        Testa se entradas maiores que o orçamento não são armazenadas.
+        Cenário negativo.
+        """
+        cache = ResponseCache(max_bytes=4)
+        cache.put("a", CachedResponse(b"12345", 200, "a", {}))
+
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.size, 0)
+
+    def test_ignores_entries_of_previous_dataset_version(self):
+        """
+        Testa se respostas calculadas para uma versão anterior do dataset não são armazenadas.
+        Cenário negativo.
+        """
+        cache = ResponseCache()
+        with patch("cache.dataset_tracker.version", 3):
+            cache.put(("a", 2), CachedResponse(b"12345", 200, "a", {}), version=2)
+            cache.put(("b", 3), CachedResponse(b"12345", 200, "b", {}), version=3)
+
+        self.assertIsNone(cache.get(("a", 2)))
+        self.assertIsNotNone(cache.get(("b", 3)))
+        self.assertEqual(cache.size, 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import os
+import shutil
+import tempfile
+import unittest
+from sqlalchemy import text
+from sqlalchemy.pool import QueuePool, StaticPool
+from database import create_db_engine, is_memory_database
+
+
+class TestDatabase(unittest.TestCase):
+    """
+    Testes de unidade para a criação do engine do banco de dados.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_file_database_uses_pool_and_wal(self):
+        """
+        Testa se bancos SQLite em arquivo usam um pool de conexões com WAL e os PRAGMAs configurados.
+        Cenário positivo.
+        """
+        engine = create_db_engine(f"sqlite:///{os.path.join(self.directory, 'database.db')}")
+        try:
+            self.assertIsInstance(engine.pool, QueuePool)
+            with engine.connect() as first, engine.connect() as second:
+                self.assertIsNot(first.connection.dbapi_connection, second.connection.dbapi_connection)
+                self.assertEqual(first.execute(text("PRAGMA journal_mode")).scalar(), "wal")
+                self.assertEqual(second.execute(text("PRAGMA synchronous")).scalar(), 1)  # NORMAL
+        finally:
+            engine.dispose()
+
+    def test_memory_database_uses_static_pool(self):
+        """
+        Testa se o banco em memória mantém uma única conexão compartilhada.
+        Cenário negativo.
+        """
+        engine = create_db_engine("sqlite:///:memory:?check_same_thread=False")
+        try:
+            self.assertIsInstance(engine.pool, StaticPool)
+            with engine.connect() as connection:
+                self.assertEqual(connection.execute(text("PRAGMA journal_mode")).scalar(), "memory")
+        finally:
+            engine.dispose()
+
+    def test_is_memory_database(self):
+        """
+        Testa a identificação de bancos SQLite em memória.
+        Cenário positivo.
+        """
+        self.assertTrue(is_memory_database("sqlite://"))
+        self.assertTrue(is_memory_database("sqlite:///:memory:"))
+        self.assertTrue(is_memory_database("sqlite:///file:shared?mode=memory&uri=true"))
+        self.assertFalse(is_memory_database("sqlite:///data/database.db"))
+        self.assertFalse(is_memory_database("postgresql://user@localhost/movies"))
+
+
+if __name__ == "__main__":
+    unittest.main()
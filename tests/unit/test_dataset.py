@@ -0,0 +1,77 @@
+import os
+import shutil
+import tempfile
+import unittest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+from database import create_db_engine
+from dataset import DatasetTracker
+from models import Base, Movie, migrate_schema
+
+
+class TestDatasetTracker(unittest.TestCase):
+    """
+    Testes de unidade para o acompanhamento das alterações do dataset.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.engine = create_db_engine(f"sqlite:///{os.path.join(self.directory, 'database.db')}")
+        Base.metadata.create_all(bind=self.engine)
+        migrate_schema(self.engine)
+
+    def tearDown(self):
+        self.engine.dispose()
+        shutil.rmtree(self.directory)
+
+    def add_movie(self):
+        """Insere um filme vencedor pela view 'movies'."""
+        with Session(bind=self.engine) as session:
+            session.add(Movie(title="Movie 1", year=2000, studios="Studio 1", producer="Producer 1", winner="yes"))
+            session.commit()
+
+    def test_listeners_run_after_commit_is_visible(self):
+        """
+        Testa se os ouvintes são notificados depois do commit no banco, com as linhas visíveis
+        a outras conexões, e se a versão só muda depois deles.
+        Cenário positivo.
+        """
+        tracker = DatasetTracker()
+        tracker.watch(self.engine)
+        observed = []
+
+        def listener(changes):
+            with self.engine.connect() as connection:
+                observed.append((tracker.version, connection.execute(text("SELECT COUNT(*) FROM movies")).scalar()))
+
+        tracker.subscribe(listener)
+        self.add_movie()
+
+        self.assertEqual(observed, [(0, 1)])
+        self.assertEqual(tracker.version, 1)
+
+    def test_failed_commit_discards_changes(self):
+        """
+        Testa se as alterações de um commit que falha no banco são descartadas.
+        Cenário negativo.
+        """
+        def failing_commit(dbapi_connection):
+            raise OperationalError("COMMIT", {}, Exception("disk I/O error"))
+
+        self.engine.dialect.do_commit = failing_commit
+        tracker = DatasetTracker()
+        tracker.watch(self.engine)
+        notifications = []
+        tracker.subscribe(notifications.append)
+
+        with self.assertRaises(OperationalError):
+            self.add_movie()
+
+        self.assertEqual(notifications, [])
+        self.assertEqual(tracker.version, 0)
+        self.assertEqual(tracker._committing, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+import subprocess
+import metrics
+from cache import CachedResponse, ResponseCache
+from metrics import http_request_duration, http_requests, register_cache_metrics, render
+
+# Diretório dos módulos da aplicação, usado pelos processos filhos
+APP_DIR = os.path.dirname(os.path.abspath(metrics.__file__))
+
+
+class TestMetrics(unittest.TestCase):
+    """
+    Testes de unidade para as métricas expostas no formato texto do Prometheus.
+    """
+
+    def test_counters_histograms_and_cache_ratio_render(self):
+        """
+        Testa se contadores, histogramas e as métricas do cache são exibidos com os valores acumulados.
+        Cenário positivo.
+        """
+        http_requests.labels("/test/render", "GET", "200").inc()
+        http_requests.labels("/test/render", "GET", "200").inc(2)
+        http_request_duration.labels("/test/render", "GET").observe(0.05)
+
+        cache = ResponseCache()
+        register_cache_metrics(cache)
+        cache.put("key", CachedResponse(b"body", 200, "etag", {}))
+        cache.get("key")
+        cache.get("missing")
+
+        lines = render().decode().splitlines()
+        self.assertIn('http_requests_total{endpoint="/test/render",method="GET",status="200"} 3.0', lines)
+        self.assertIn('http_request_duration_seconds_bucket{endpoint="/test/render",le="0.05",method="GET"} 1.0', lines)
+        self.assertIn("# TYPE response_cache_hits_total counter", lines)
+        self.assertIn("# TYPE response_cache_misses_total counter", lines)
+        self.assertIn("response_cache_size_bytes 4.0", lines)
+        self.assertTrue(any(line.startswith("response_cache_hit_ratio ") for line in lines))
+
+    def test_multiprocess_mode_aggregates_processes(self):
+        """
+        Testa se, com PROMETHEUS_MULTIPROC_DIR, a coleta soma os valores de todos os processos.
+        Cenário positivo.
+        """
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=directory)
+
+        def run(code):
+            return subprocess.run(
+                [sys.executable, "-c", code], cwd=APP_DIR, env=env, capture_output=True, text=True, check=True
+            ).stdout
+
+        increment = "import metrics; metrics.http_requests.labels('/app/awards', 'GET', '200').inc()"
+        run(increment)
+        run(increment)
+        output = run("import metrics; print(metrics.render().decode())")
+
+        self.assertIn('http_requests_total{endpoint="/app/awards",method="GET",status="200"} 2.0', output.splitlines())
+
+    def test_label_values_are_escaped(self):
+        """
+        Testa se aspas, barras invertidas e quebras de linha nos rótulos são escapadas.
+        Cenário negativo.
+        """
+        http_requests.labels('a"b\\c\nd', "GET", "200").inc()
+
+        self.assertIn(
+            'http_requests_total{endpoint="a\\"b\\\\c\\nd",method="GET",status="200"} 1.0',
+            render().decode().splitlines(),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,155 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from sqlalchemy import create_engine, insert, inspect, text
+from sqlalchemy.orm import Session
+from models import Base, Film, FilmStudio, Movie, Producer, Studio, migrate_schema, populate_data
+from utils import split_by_comma_and_and
+
+
+CSV_CONTENT = """year;title;studios;producers;winner
+2000;Movie 1;Studio 1;Producer 1 and Producer 2;yes
+2000;Movie 1;Studio 1;Producer 1 and Producer 2;yes
+2005;Movie 2;Studio 2;Producer 1, Producer 3;
+2010;Movie 3;;Producer 2;yes
+"""
+
+
+class TestModels(unittest.TestCase):
+    """
+    Testes de unidade para a ingestão de dados.
+    """
+
+    def setUp(self):
+        """
+        Cria um banco em memória e um arquivo CSV temporário.
+        """
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(bind=self.engine)
+        self.session = Session(bind=self.engine)
+
+        handle, self.csv_path = tempfile.mkstemp(suffix=".csv")
+        with os.fdopen(handle, "w") as csv_file:
+            csv_file.write(CSV_CONTENT)
+
+    def tearDown(self):
+        """
+        Remove o arquivo temporário e fecha a sessão.
+        """
+        self.session.close()
+        os.remove(self.csv_path)
+
+    def test_populate_data_explodes_producers(self):
+        """
+        Testa se cada produtor gera um registro e se linhas duplicadas são ignoradas.
+        Cenário positivo.
+        """
+        with patch.dict(os.environ, {"CSV_PATH": self.csv_path}):
+            inserted = populate_data(self.session)
+
+        self.assertEqual(inserted, 5, "Devem ser inseridos 5 registros (um por produtor).")
+        producers = sorted(movie.producer for movie in self.session.query(Movie).filter_by(title="Movie 1"))
+        self.assertEqual(producers, ["Producer 1", "Producer 2"])
+        self.assertEqual(self.session.query(Movie).filter_by(title="Movie 2", winner="no").count(), 2)
+        self.assertIsNone(self.session.query(Movie).filter_by(title="Movie 3").one().studios)
+
+    def test_populate_data_is_idempotent(self):
+        """
+        Testa se uma segunda ingestão do mesmo arquivo não insere registros.
+        Cenário positivo.
+        """
+        with patch.dict(os.environ, {"CSV_PATH": self.csv_path}):
+            populate_data(self.session)
+            inserted = populate_data(self.session)
+
+        self.assertEqual(inserted, 0, "A segunda ingestão não deve inserir registros.")
+        self.assertEqual(self.session.query(Movie).count(), 5)
+
+    def test_migrate_schema_converts_legacy_table(self):
+        """
+        Testa se a migração converte a antiga tabela 'movies' nas tabelas normalizadas, sem duplicados.
+        Cenário positivo.
+        """
+        engine = create_engine("sqlite://")
+        with engine.begin() as connection:
+            connection.execute(text(
+                "CREATE TABLE movies (id INTEGER PRIMARY KEY, year INTEGER NOT NULL, title VARCHAR NOT NULL, "
+                "studios TEXT, producer VARCHAR NOT NULL, winner VARCHAR)"
+            ))
+            connection.execute(text(
+                "INSERT INTO movies (year, title, studios, producer, winner) VALUES "
+                "(2000, 'Movie 1', 'Studio 1, Studio 2', 'Producer 1', 'yes'), "
+                "(2000, 'Movie 1', 'Studio 1, Studio 2', 'Producer 1', 'yes'), "
+                "(2000, 'Movie 1', 'Studio 1, Studio 2', 'Producer 2', 'yes')"
+            ))
+
+        migrate_schema(engine)
+        migrate_schema(engine)
+
+        inspector = inspect(engine)
+        self.assertIn("movies", inspector.get_view_names())
+        for table in Base.metadata.sorted_tables:
+            indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+            self.assertEqual(indexes, {index.name for index in table.indexes})
+
+        with engine.connect() as connection:
+            self.assertEqual(connection.execute(text("SELECT COUNT(*) FROM movies")).scalar(), 2)
+            self.assertEqual(connection.execute(text("SELECT COUNT(*) FROM films")).scalar(), 1)
+            self.assertEqual(connection.execute(text("SELECT COUNT(*) FROM film_studios")).scalar(), 2)
+
+    def test_movie_view_accepts_orm_writes(self):
+        """
+        Testa se inserções e remoções via ORM na view 'movies' são aplicadas às tabelas normalizadas,
+        inclusive aos estúdios.
+        Cenário positivo.
+        """
+        self.session.add_all([
+            Movie(title="Movie 1", studios="Studio 1 and Studio 2", producer="Producer 1", year=2000, winner="yes"),
+            Movie(title="Movie 1", studios="Studio 1 and Studio 2", producer="Producer 2", year=2000, winner="yes"),
+        ])
+        self.session.commit()
+
+        self.assertEqual(self.session.query(Film).count(), 1)
+        self.assertEqual(self.session.query(Producer).count(), 2)
+        self.assertEqual(sorted(studio.name for studio in self.session.query(Studio)), ["Studio 1", "Studio 2"])
+        self.assertEqual(self.session.query(FilmStudio).count(), 2)
+        self.assertEqual(self.session.query(Movie).filter_by(producer="Producer 2").one().title, "Movie 1")
+
+        # Remoções também descartam filmes e produtores sem associações
+        self.session.query(Movie).delete()
+        self.session.commit()
+        self.assertEqual(self.session.query(Film).count(), 0)
+        self.assertEqual(self.session.query(Producer).count(), 0)
+        self.assertEqual(self.session.query(FilmStudio).count(), 0)
+
+    def test_movie_view_core_and_sql_inserts_write_studios(self):
+        """
+        Testa se inserções na view via Core e SQL registram os estúdios separados como na ingestão.
+        Cenário positivo.
+        """
+        studios = ['Studio 1, Studio 2 and Studio 3', 'Studio "4"\tand Studio 5,and Studio 6']
+        with self.engine.begin() as connection:
+            connection.execute(insert(Movie), [
+                {"title": "Movie 1", "studios": studios[0], "producer": "Producer 1", "year": 2000, "winner": "yes"},
+                {"title": "Movie 1", "studios": studios[0], "producer": "Producer 2", "year": 2000, "winner": "yes"},
+            ])
+            connection.execute(
+                text(
+                    "INSERT INTO movies (title, studios, producer, year, winner) "
+                    "VALUES ('Movie 2', :studios, 'Producer 1', 2001, 'no')"
+                ),
+                {"studios": studios[1]},
+            )
+
+        links = self.session.execute(text(
+            "SELECT f.title, s.name FROM film_studios fs "
+            "JOIN films f ON f.id = fs.film_id JOIN studios s ON s.id = fs.studio_id ORDER BY s.id"
+        )).all()
+        self.assertEqual([name for title, name in links if title == "Movie 1"], split_by_comma_and_and(studios[0]))
+        self.assertEqual([name for title, name in links if title == "Movie 2"], split_by_comma_and_and(studios[1]))
+        self.assertEqual(self.session.query(Studio).count(), 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import os
+import time
+import unittest
+from offload import OverloadedError, ProcessOffloader
+
+
+class TestProcessOffloader(unittest.TestCase):
+    """
+    Testes de unidade para o pool de processos das computações de IA.
+    """
+
+    def setUp(self):
+        self.offloader = ProcessOffloader()
+        self.offloader.configure(workers=1, max_queue=1, timeout=5)
+
+    def tearDown(self):
+        self.offloader.shutdown()
+
+    def test_runs_in_worker_process_and_coalesces(self):
+        """
+        Testa se a função é executada em outro processo e se tarefas idênticas em andamento são compartilhadas.
+        Cenário positivo.
+        """
+        self.assertNotEqual(self.offloader.run("pid", os.getpid), os.getpid())
+
+        first = self.offloader._submit("sleep", time.sleep, (0.5,))
+        second = self.offloader._submit("sleep", time.sleep, (0.5,))
+        self.assertIs(first, second)
+        self.assertIsNone(self.offloader.run("sleep", time.sleep, 0.5))
+
+    def test_overload_and_timeout(self):
+        """
+        Testa se a fila cheia recusa novas tarefas e se a espera é limitada pelo timeout.
+        Cenário negativo.
+        """
+        self.offloader.timeout = 0.1
+        with self.assertRaises(TimeoutError):
+            self.offloader.run("slow", time.sleep, 2)
+        with self.assertRaises(OverloadedError):
+            self.offloader.run("other", time.sleep, 0)
+
+    def test_disabled_pool_runs_inline(self):
+        """
+        Testa se, sem processos configurados, a função é executada no próprio processo.
+        Cenário positivo.
+        """
+        self.offloader.configure(workers=0, max_queue=1, timeout=5)
+        self.assertEqual(self.offloader.run("pid", os.getpid), os.getpid())
+
+
+if __name__ == "__main__":
+    unittest.main()
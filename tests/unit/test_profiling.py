@@ -0,0 +1,91 @@
+import os
+import pstats
+import shutil
+import tempfile
+import unittest
+from flask import Flask
+from sqlalchemy import create_engine, text
+from profiling import PROFILE_FILE_HEADER, install_profiler, watch_slow_queries
+
+
+class TestProfiling(unittest.TestCase):
+    """
+    Testes de unidade para o profiling por requisição e o log de consultas lentas.
+    """
+
+    def setUp(self):
+        self.profile_dir = tempfile.mkdtemp()
+        self.app = Flask(__name__)
+        install_profiler(self.app, self.profile_dir)
+
+        @self.app.route("/details")
+        def details():
+            return {"total": sum(range(1000))}
+
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        shutil.rmtree(self.profile_dir)
+
+    def test_profile_text_returns_stats(self):
+        """
+        Testa se `profile=text` substitui a resposta pelas estatísticas do pstats.
+        Cenário positivo.
+        """
+        response = self.client.get("/details?profile=text")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content_type.startswith("text/plain"))
+        self.assertIn("function calls", response.get_data(as_text=True))
+
+    def test_profile_header_stores_file(self):
+        """
+        Testa se o cabeçalho X-Profile mantém a resposta e grava o profile em arquivo.
+        Cenário positivo.
+        """
+        response = self.client.get("/details", headers={"X-Profile": "1"})
+
+        self.assertEqual(response.get_json(), {"total": 499500})
+        path = response.headers[PROFILE_FILE_HEADER]
+        self.assertEqual(os.path.dirname(path), self.profile_dir)
+        self.assertGreater(pstats.Stats(path).total_calls, 0)
+
+    def test_request_without_flag_is_not_profiled(self):
+        """
+        Testa se requisições sem o parâmetro ou cabeçalho não são perfiladas.
+        Cenário negativo.
+        """
+        response = self.client.get("/details")
+
+        self.assertNotIn(PROFILE_FILE_HEADER, response.headers)
+        self.assertEqual(os.listdir(self.profile_dir), [])
+
+    def test_slow_queries_are_logged(self):
+        """
+        Testa se comandos acima do limite são registrados no log de consultas lentas.
+        Cenário positivo.
+        """
+        engine = create_engine("sqlite://")
+        watch_slow_queries(engine, threshold_ms=1e-6)
+
+        with self.assertLogs("slow_queries", level="WARNING") as logs:
+            with engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+
+        self.assertTrue(any("SELECT 1" in message for message in logs.output))
+
+    def test_slow_query_log_disabled(self):
+        """
+        Testa se o limite 0 desabilita o log de consultas lentas.
+        Cenário negativo.
+        """
+        engine = create_engine("sqlite://")
+        watch_slow_queries(engine, threshold_ms=0)
+
+        with self.assertNoLogs("slow_queries", level="WARNING"):
+            with engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+from readiness import Readiness
+
+
+class TestReadiness(unittest.TestCase):
+    """
+    Testes de unidade para o acompanhamento do aquecimento da aplicação.
+    """
+
+    def test_background_warm_up_sets_ready(self):
+        """
+        Testa se o aquecimento em segundo plano marca a aplicação como pronta ao terminar.
+        Cenário positivo.
+        """
+        readiness = Readiness()
+        calls = []
+        self.assertFalse(readiness.ready)
+
+        readiness.start(lambda: calls.append(True)).join(timeout=5)
+
+        self.assertTrue(readiness.ready)
+        self.assertEqual(calls, [True])
+        self.assertIsNotNone(readiness.status()["warmUpSeconds"])
+
+    def test_failed_warm_up_is_not_ready(self):
+        """
+        Testa se uma falha no aquecimento mantém a aplicação como não pronta e registra o erro.
+        Cenário negativo.
+        """
+        readiness = Readiness()
+
+        def warm_up():
+            raise RuntimeError("CSV indisponível")
+
+        self.assertFalse(readiness.run(warm_up))
+        self.assertEqual(readiness.status()["error"], "CSV indisponível")
+
+
+if __name__ == "__main__":
+    unittest.main()
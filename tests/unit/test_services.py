@@ -1,6 +1,19 @@
+import os
+import random
+import shutil
+import tempfile
+import threading
 import unittest
+from operator import itemgetter
 from unittest.mock import Mock
-from services import calculate_awards
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+from database import create_db_engine
+from dataset import DatasetTracker
+from models import Base, Movie, migrate_schema
+from services import (
+    AwardsIndex, SingleFlight, calculate_awards, calculate_awards_numpy, calculate_awards_sql, set_awards_engine,
+)
 
 
 class TestServices(unittest.TestCase):
@@ -31,10 +44,10 @@ class TestServices(unittest.TestCase):
         mock_session = Mock()
         # Dados de teste com dois produtores e seus anos de vitórias
         mock_session.execute.return_value.mappings.return_value = [
-            {"producer": "Producer 1", "year": 2000},
-            {"producer": "Producer 1", "year": 2005},
-            {"producer": "Producer 2", "year": 2010},
-            {"producer": "Producer 2", "year": 2012},
+            {"producer_id": 1, "producer": "Producer 1", "year": 2000},
+            {"producer_id": 1, "producer": "Producer 1", "year": 2005},
+            {"producer_id": 2, "producer": "Producer 2", "year": 2010},
+            {"producer_id": 2, "producer": "Producer 2", "year": 2012},
         ]
 
         result = calculate_awards(mock_session)
@@ -61,12 +74,12 @@ class TestServices(unittest.TestCase):
         mock_session = Mock()
         # Dados de teste com múltiplos intervalos iguais para diferentes produtores
         mock_session.execute.return_value.mappings.return_value = [
-            {"producer": "Producer 1", "year": 2000},
-            {"producer": "Producer 1", "year": 2003},
-            {"producer": "Producer 2", "year": 2005},
-            {"producer": "Producer 2", "year": 2008},
-            {"producer": "Producer 3", "year": 2010},
-            {"producer": "Producer 3", "year": 2013},
+            {"producer_id": 1, "producer": "Producer 1", "year": 2000},
+            {"producer_id": 1, "producer": "Producer 1", "year": 2003},
+            {"producer_id": 2, "producer": "Producer 2", "year": 2005},
+            {"producer_id": 2, "producer": "Producer 2", "year": 2008},
+            {"producer_id": 3, "producer": "Producer 3", "year": 2010},
+            {"producer_id": 3, "producer": "Producer 3", "year": 2013},
         ]
 
         result = calculate_awards(mock_session)
@@ -93,9 +106,9 @@ class TestServices(unittest.TestCase):
         mock_session = Mock()
         # Dados de teste com um único produtor
         mock_session.execute.return_value.mappings.return_value = [
-            {"producer": "Producer 1", "year": 2000},
-            {"producer": "Producer 1", "year": 2010},
-            {"producer": "Producer 1", "year": 2015},
+            {"producer_id": 1, "producer": "Producer 1", "year": 2000},
+            {"producer_id": 1, "producer": "Producer 1", "year": 2010},
+            {"producer_id": 1, "producer": "Producer 1", "year": 2015},
         ]
 
         result = calculate_awards(mock_session)
@@ -116,9 +129,9 @@ class TestServices(unittest.TestCase):
         mock_session = Mock()
         # Dados de teste onde não há vitórias consecutivas
         mock_session.execute.return_value.mappings.return_value = [
-            {"producer": "Producer 1", "year": 2000},
-            {"producer": "Producer 2", "year": 2005},
-            {"producer": "Producer 3", "year": 2010},
+            {"producer_id": 1, "producer": "Producer 1", "year": 2000},
+            {"producer_id": 2, "producer": "Producer 2", "year": 2005},
+            {"producer_id": 3, "producer": "Producer 3", "year": 2010},
         ]
 
         result = calculate_awards(mock_session)
@@ -127,6 +140,252 @@ class TestServices(unittest.TestCase):
         self.assertEqual(result['min'], [], "O campo 'min' deve ser vazio quando não há vitórias consecutivas.")
         self.assertEqual(result['max'], [], "O campo 'max' deve ser vazio quando não há vitórias consecutivas.")
 
+    def test_awards_index_incremental_matches_full_calculation(self):
+        """
+        Testa se o índice atualizado incrementalmente produz o mesmo resultado de calculate_awards.
+        Cenário positivo.
+        """
+        rows = [
+            {"producer_id": 1, "producer": "Producer 1", "year": 2000},
+            {"producer_id": 1, "producer": "Producer 1", "year": 2005},
+            {"producer_id": 1, "producer": "Producer 1", "year": 2006},
+            {"producer_id": 2, "producer": "Producer 2", "year": 1990},
+            {"producer_id": 2, "producer": "Producer 2", "year": 2010},
+            {"producer_id": 3, "producer": "Producer 3", "year": 2001},
+            {"producer_id": 3, "producer": "Producer 3", "year": 2002},
+        ]
+        mock_session = Mock()
+        mock_session.execute.return_value.mappings.return_value = []
+
+        index = AwardsIndex()
+        index.rebuild(mock_session)
+        # Inserção fora de ordem para exercitar a divisão de intervalos existentes
+        index.apply([dict(row, winner="yes") for row in reversed(rows)])
+        index.apply([{"producer": "Producer 4", "year": 2000, "winner": "no"}])
+
+        mock_session.execute.return_value.mappings.return_value = rows
+        self.assertEqual(index.snapshot(mock_session), calculate_awards(mock_session))
+
+    def test_awards_index_rebuilds_after_invalidation(self):
+        """
+        Testa se o índice é reconstruído a partir do banco após uma alteração não incremental.
+        Cenário positivo.
+        """
+        mock_session = Mock()
+        mock_session.execute.return_value.mappings.return_value = [
+            {"producer_id": 1, "producer": "Producer 1", "year": 2000},
+            {"producer_id": 1, "producer": "Producer 1", "year": 2003},
+        ]
+
+        index = AwardsIndex()
+        self.assertEqual(index.snapshot(mock_session)["min"][0]["interval"], 3)
+
+        mock_session.execute.return_value.mappings.return_value = []
+        index.apply(None)
+        self.assertEqual(index.snapshot(mock_session), {"min": [], "max": []})
+
+    def test_awards_index_query_matches_brute_force(self):
+        """
+        Testa se as consultas filtradas e top-k do índice coincidem com uma busca exaustiva.
+        Cenário positivo.
+        """
+        generator = random.Random(11)
+        rows = sorted(
+            {(f"Producer {generator.randint(1, 40)}", generator.randint(1960, 2020)) for _ in range(400)}
+        )
+        mock_session = Mock()
+        mock_session.execute.return_value.mappings.return_value = [
+            {"producer_id": int(producer.split()[1]), "producer": producer, "year": year} for producer, year in rows
+        ]
+        index = AwardsIndex()
+        index.rebuild(mock_session)
+        # Vitórias adicionadas após a construção também devem ser consideradas
+        index.apply([{"producer": "Producer 1", "year": 2021, "winner": "yes"}])
+        rows = sorted(set(rows) | {("Producer 1", 2021)})
+
+        intervals = []
+        for producer in {producer for producer, _ in rows}:
+            years = [year for name, year in rows if name == producer]
+            intervals += [
+                {"producer": producer, "interval": curr - prev, "previousWin": prev, "followingWin": curr}
+                for prev, curr in zip(years, years[1:])
+            ]
+
+        def expected(k, year_from, year_to, producer):
+            selected = [
+                i for i in intervals
+                if (year_from is None or i["previousWin"] >= year_from)
+                and (year_to is None or i["followingWin"] <= year_to)
+                and (producer is None or i["producer"].startswith(producer))
+            ]
+            ascending = sorted(selected, key=itemgetter("interval", "producer", "previousWin"))
+            descending = sorted(selected, key=lambda i: (-i["interval"], i["producer"], i["previousWin"]))
+            if k is not None:
+                return {"min": ascending[:k], "max": descending[:k]}
+            if not selected:
+                return {"min": [], "max": []}
+            return {
+                "min": [i for i in ascending if i["interval"] == ascending[0]["interval"]],
+                "max": [i for i in ascending if i["interval"] == descending[0]["interval"]],
+            }
+
+        for k, year_from, year_to, producer in [
+            (10, None, None, None),
+            (1, None, None, None),
+            (5000, None, None, None),
+            (None, 1990, 2010, None),
+            (7, 1990, 2010, None),
+            (None, None, 1980, None),
+            (3, None, None, "Producer 1"),
+            (None, 1970, None, "Producer 2"),
+            (None, None, None, "Nobody"),
+        ]:
+            self.assertEqual(
+                index.query(mock_session, k=k, year_from=year_from, year_to=year_to, producer=producer),
+                expected(k, year_from, year_to, producer),
+                f"Consulta k={k}, year_from={year_from}, year_to={year_to}, producer={producer}",
+            )
+
+    def test_calculate_awards_sql_and_numpy_match_python_engine(self):
+        """
+        Testa se os motores SQL (funções de janela) e NumPy produzem o mesmo resultado do motor em Python.
+        Cenário positivo.
+        """
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(bind=engine)
+        session = Session(bind=engine)
+
+        # Sem vencedores
+        self.assertEqual(calculate_awards_sql(session), calculate_awards(session))
+        self.assertEqual(calculate_awards_numpy(session), calculate_awards(session))
+
+        # Dados aleatórios, com empates e vitórias repetidas no mesmo ano
+        generator = random.Random(7)
+        session.add_all(
+            Movie(
+                title=f"Movie {index}",
+                producer=f"Producer {generator.randint(1, 30)}",
+                year=generator.randint(1980, 2020),
+                winner=generator.choice(["yes", "yes", "no"]),
+            )
+            for index in range(300)
+        )
+        session.commit()
+
+        expected = calculate_awards(session)
+        self.assertEqual(calculate_awards_sql(session), expected)
+        self.assertEqual(calculate_awards_numpy(session), expected)
+        session.close()
+
+    def test_set_awards_engine_invalid(self):
+        """
+        Testa se um motor de cálculo inexistente é rejeitado.
+        Cenário negativo.
+        """
+        with self.assertRaises(ValueError):
+            set_awards_engine("spreadsheet")
+
+    def test_single_flight_coalesces_and_serves_stale_while_revalidating(self):
+        """
+        Testa se chamadas concorrentes compartilham uma única computação por versão e se,
+        durante o recálculo de uma nova versão, recebem o resultado anterior.
+        Cenário positivo.
+        """
+        flight = SingleFlight()
+        started, release = threading.Event(), threading.Event()
+        calls = []
+
+        def compute(value):
+            calls.append(value)
+            started.set()
+            release.wait(5)
+            return value
+
+        results = []
+        leader = threading.Thread(target=lambda: results.append(flight.run(1, lambda: compute("v1"))))
+        leader.start()
+        started.wait(5)
+        follower = threading.Thread(target=lambda: results.append(flight.run(1, lambda: compute("other"))))
+        follower.start()
+        release.set()
+        leader.join(5)
+        follower.join(5)
+
+        self.assertEqual(calls, ["v1"])
+        self.assertEqual(results, [("v1", True), ("v1", True)])
+
+        started.clear()
+        release.clear()
+        leader = threading.Thread(target=lambda: flight.run(2, lambda: compute("v2")))
+        leader.start()
+        started.wait(5)
+        self.assertEqual(flight.run(2, lambda: compute("other")), ("v1", False))
+        release.set()
+        leader.join(5)
+        self.assertEqual(flight.run(2, lambda: compute("other")), ("v2", True))
+        self.assertEqual(calls, ["v1", "v2"])
+
+    def test_single_flight_recomputes_after_commit_during_computation(self):
+        """
+        Testa se um commit durante a computação de uma versão faz a próxima chamada
+        recalcular o resultado com os dados confirmados, inclusive quando uma requisição
+        é atendida durante a notificação do commit.
+        Cenário positivo.
+        """
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        engine = create_db_engine(f"sqlite:///{os.path.join(directory, 'database.db')}")
+        self.addCleanup(engine.dispose)
+        Base.metadata.create_all(bind=engine)
+        migrate_schema(engine)
+        tracker = DatasetTracker()
+        tracker.watch(engine)
+
+        flight = SingleFlight()
+        started, release = threading.Event(), threading.Event()
+
+        def count_movies():
+            with engine.connect() as connection:
+                count = connection.execute(text("SELECT COUNT(*) FROM movies")).scalar()
+            if not started.is_set():
+                started.set()
+                release.wait(5)
+            return count
+
+        # Requisição atendida durante a notificação do commit
+        def request_during_notification(changes):
+            release.set()
+            results.append(flight.run(tracker.version, count_movies))
+
+        tracker.subscribe(request_during_notification)
+        results = []
+        leader = threading.Thread(target=lambda: results.append(flight.run(tracker.version, count_movies)))
+        leader.start()
+        started.wait(5)
+        with Session(bind=engine) as session:
+            session.add(Movie(title="Movie 1", year=2000, studios="Studio 1", producer="Producer 1", winner="yes"))
+            session.commit()
+        release.set()
+        leader.join(5)
+
+        self.assertEqual(results, [(0, True), (0, True)])
+        self.assertEqual(tracker.version, 1)
+        self.assertEqual(flight.run(tracker.version, count_movies), (1, True))
+
+    def test_single_flight_propagates_errors(self):
+        """
+        Testa se o erro da computação é propagado e se a próxima chamada tenta novamente.
+        Cenário negativo.
+        """
+        flight = SingleFlight()
+
+        def fail():
+            raise RuntimeError("falha")
+
+        with self.assertRaises(RuntimeError):
+            flight.run(1, fail)
+        self.assertEqual(flight.run(1, lambda: "ok"), ("ok", True))
+
 
 if __name__ == "__main__":
     unittest.main()
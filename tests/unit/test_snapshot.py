@@ -0,0 +1,55 @@
+import os
+import shutil
+import tempfile
+import unittest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+from database import create_db_engine
+from services import AwardsIndex, calculate_awards
+from snapshot import build_snapshot, read_info, read_intervals, snapshot_uri
+
+
+class TestSnapshot(unittest.TestCase):
+    """
+    Testes de unidade para o snapshot somente leitura.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp()
+        cls.path = os.path.join(cls.directory, "snapshot.db")
+        cls.info = build_snapshot(cls.path)
+        cls.engine = create_db_engine(snapshot_uri(cls.path))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.engine.dispose()
+        shutil.rmtree(cls.directory)
+
+    def test_precomputed_intervals_match_calculate_awards(self):
+        """
+        Testa se o índice carregado dos intervalos pré-computados produz o mesmo resultado de calculate_awards.
+        Cenário positivo.
+        """
+        with Session(bind=self.engine) as session:
+            index = AwardsIndex()
+            index.load(read_intervals(session))
+
+            self.assertEqual(index.snapshot(session), calculate_awards(session))
+            self.assertEqual(read_info(session), self.info)
+            self.assertGreater(int(self.info["movies"]), 0)
+
+    def test_snapshot_is_read_only(self):
+        """
+        Testa se o snapshot aberto pela URI somente leitura recusa escritas.
+        Cenário negativo.
+        """
+        with self.engine.connect() as connection:
+            with self.assertRaises(OperationalError):
+                connection.execute(text("DELETE FROM films"))
+        self.assertFalse(os.path.exists(f"{self.path}.tmp"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import os
+import tempfile
+import unittest
+from store import DatasetStore
+
+
+CSV_CONTENT = """year;title;studios;producers;winner
+2000;Movie 1; Studio 1 ;Producer 1;yes
+2005;Movie 2;Studio 2;PRODUCER 2;
+"""
+
+
+class TestDatasetStore(unittest.TestCase):
+    """
+    Testes de unidade para o armazenamento em memória do dataset.
+    """
+
+    def setUp(self):
+        """
+        Cria um arquivo CSV temporário.
+        """
+        handle, self.csv_path = tempfile.mkstemp(suffix=".csv")
+        with os.fdopen(handle, "w") as csv_file:
+            csv_file.write(CSV_CONTENT)
+        self.store = DatasetStore(self.csv_path)
+
+    def tearDown(self):
+        """
+        Remove o arquivo temporário.
+        """
+        os.remove(self.csv_path)
+
+    def test_loads_once_and_normalizes(self):
+        """
+        Testa se o CSV é lido uma única vez e se as colunas são normalizadas.
+        Cenário positivo.
+        """
+        df = self.store.get()
+
+        self.assertIs(self.store.get(), df, "O DataFrame deve ser reutilizado enquanto o arquivo não muda.")
+        self.assertEqual(df['winner'].tolist(), [1, 0])
+        self.assertEqual(df['studios'].tolist(), ["studio 1", "studio 2"])
+        self.assertEqual(df['producers'].tolist(), ["producer 1", "producer 2"])
+        self.assertEqual(str(df['producers'].dtype), "category")
+
+    def test_reloads_when_file_changes(self):
+        """
+        Testa se o DataFrame é recarregado quando o arquivo é alterado.
+        Cenário positivo.
+        """
+        self.store.get()
+        with open(self.csv_path, "a") as csv_file:
+            csv_file.write("2010;Movie 3;Studio 3;Producer 3;yes\n")
+
+        self.assertEqual(len(self.store.get()), 3)
+        self.assertEqual(self.store.version, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
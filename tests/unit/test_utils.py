@@ -0,0 +1,45 @@
+import unittest
+import pandas as pd
+from utils import split_by_comma_and_and, split_many
+
+
+class TestUtils(unittest.TestCase):
+    """
+    Testes de unidade para o separador de produtores e estúdios.
+    """
+
+    def test_split_by_comma_and_and(self):
+        """
+        Testa a separação por vírgulas e 'and', preservando nomes que contêm 'and'.
+        Cenário positivo.
+        """
+        self.assertEqual(split_by_comma_and_and("Producer 1 and Producer 2"), ["Producer 1", "Producer 2"])
+        self.assertEqual(split_by_comma_and_and("A, B, and C"), ["A", "B", "C"])
+        self.assertEqual(split_by_comma_and_and("A and, B"), ["A", "B"])
+        self.assertEqual(split_by_comma_and_and("Sandy Andrews"), ["Sandy Andrews"])
+        self.assertEqual(split_by_comma_and_and(""), [])
+
+    def test_split_many_matches_single_split(self):
+        """
+        Testa se a versão em lote produz os mesmos nomes que a separação texto a texto.
+        Cenário positivo.
+        """
+        texts = ["A, B, and C", "Sandy Andrews and Rand", "A, B, and C", " , and ,", "X and, Y", ""]
+        expected = [name for text in texts for name in split_by_comma_and_and(text)]
+
+        self.assertEqual(split_many(texts).tolist(), expected)
+
+    def test_split_many_keeps_row_index(self):
+        """
+        Testa se a versão em lote mantém o índice da linha de origem e ignora valores ausentes.
+        Cenário positivo.
+        """
+        series = pd.Series(["A and B", None, "C"], index=[10, 11, 12])
+        result = split_many(series)
+
+        self.assertEqual(result.index.tolist(), [10, 10, 12])
+        self.assertEqual(result.tolist(), ["A", "B", "C"])
+
+
+if __name__ == "__main__":
+    unittest.main()